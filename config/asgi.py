@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# ASGI rejimida katalog o‘qish so‘rovlari async yo‘ldan o‘tadi (jigar_bookstore/async_views.py)
+os.environ.setdefault('ASYNC_CATALOG_READS', 'True')
 
 application = get_asgi_application()
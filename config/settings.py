@@ -1,5 +1,5 @@
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 # --- Bazaviy yo‘l ---
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -36,6 +36,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'jigar_bookstore.db_routing.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -58,18 +59,64 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# ASGI ostida katalog list/retrieve async ORM bilan ishlaydi (config/asgi.py yoqadi)
+ASYNC_CATALOG_READS = config("ASYNC_CATALOG_READS", default=False, cast=bool)
 
 # --- Ma’lumotlar bazasi ---
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': config('DB_NAME', default='jigar_bookstore'),
-        'USER': config('DB_USER', default='postgres'),
-        'PASSWORD': config('DB_PASSWORD', default='7'),
-        'HOST': config('DB_HOST', default='localhost'),
-        'PORT': config('DB_PORT', default='5432'),
+# DB_PROFILE=postgres — production: doimiy ulanishlar (yoki psycopg pool) + health check
+# DB_PROFILE=sqlite   — lokal benchmark va tezkor sinov uchun yengil profil
+DB_PROFILE = config('DB_PROFILE', default='postgres')
+
+if DB_PROFILE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+        }
     }
-}
+    if config('DB_SQLITE_REPLICA', default=False, cast=bool):
+        # Replika yo‘naltirishni lokal sinash: o‘sha faylga ikkinchi alias
+        DATABASES['replica1'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+else:
+    DB_POOL = config('DB_POOL', default=False, cast=bool)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='jigar_bookstore'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default='7'),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            # Ulanish so‘rovlar orasida qayta ishlatiladi; har so‘rov boshida tekshiriladi
+            'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int)},
+        }
+    }
+    if DB_POOL:
+        # Django 5.1+ va psycopg[pool] — har bir worker jarayonida ulanishlar hovuzi
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+    # DB_REPLICA_HOSTS=replica-a,replica-b — faqat o‘qish uchun replikalar
+    for index, host in enumerate(config('DB_REPLICA_HOSTS', default='', cast=Csv()), start=1):
+        DATABASES[f'replica{index}'] = {
+            **DATABASES['default'],
+            'HOST': host,
+            'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+            'TEST': {'MIRROR': 'default'},
+        }
+
+# --- O‘qish replikalari (jigar_bookstore/db_routing.py) ---
+DATABASE_ROUTERS = ['jigar_bookstore.db_routing.PrimaryReplicaRouter']
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)  # read-your-writes oynasi
+REPLICA_MAX_LAG = config('REPLICA_MAX_LAG', default=2, cast=float)
+REPLICA_LAG_CHECK_INTERVAL = 5
 
 # --- Parol validatori ---
 AUTH_PASSWORD_VALIDATORS = [
@@ -91,10 +138,30 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Yuklanayotgan fayl xotirada to‘planmaydi — darhol vaqtinchalik faylga oqib yoziladi
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+
+# --- Muqova eskizlari (jigar_bookstore/covers.py) ---
+COVER_THUMBNAIL_SIZES = (160, 320, 640)
+COVER_PROCESSING_WORKERS = config("COVER_PROCESSING_WORKERS", default=2, cast=int)
+COVER_PROCESSING_ASYNC = config("COVER_PROCESSING_ASYNC", default=True, cast=bool)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # --- DRF sozlamalari ---
+# JSON: orjson asosidagi renderer/parser (jigar_bookstore/renderers.py) yoki DRF’ning oddiysi
+FAST_JSON = config('FAST_JSON', default=True, cast=bool)
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'jigar_bookstore.renderers.FastJSONRenderer' if FAST_JSON else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'jigar_bookstore.parsers.FastJSONParser' if FAST_JSON else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
@@ -116,7 +183,57 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Katalog fasetlari keshi (soniya); Book/Review yozilganda versiya bilan eskiradi
+FACETS_CACHE_TIMEOUT = config('FACETS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Xabarnoma qabul qiluvchilari keshi (soniya); User o‘zgarganda versiya bilan eskiradi
+NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT = config('NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Avtoto‘ldirish indeksi (worker xotirasida): versiyani tekshirish oralig‘i (soniya)
+AUTOCOMPLETE_VERSION_CHECK = config('AUTOCOMPLETE_VERSION_CHECK', default=1.0, cast=float)
+
+# Fuzzy qidiruv (`/books/fuzzy/`, jigar_bookstore/fuzzy.py): standart o‘xshashlik chegarasi (0..1)
+FUZZY_SEARCH_THRESHOLD = config('FUZZY_SEARCH_THRESHOLD', default=0.3, cast=float)
+
+# Buyurtma jadvallarining oylik bo‘laklari (PostgreSQL, `manage.py manage_partitions`):
+# oldindan yaratiladigan oylar va saqlanadigan oylar (0 — eski bo‘laklar ajratilmaydi)
+PARTITION_MONTHS_AHEAD = config('PARTITION_MONTHS_AHEAD', default=3, cast=int)
+PARTITION_RETAIN_MONTHS = config('PARTITION_RETAIN_MONTHS', default=0, cast=int)
+
+# Eski buyurtmalar arxivi (`manage.py archive_orders`, jigar_bookstore/archive.py)
+ORDER_ARCHIVE_DIR = config('ORDER_ARCHIVE_DIR', default=str(BASE_DIR / 'var' / 'archive' / 'orders'))
+ORDER_ARCHIVE_AFTER_DAYS = config('ORDER_ARCHIVE_AFTER_DAYS', default=730, cast=int)
+ORDER_ARCHIVE_ZSTD_LEVEL = config('ORDER_ARCHIVE_ZSTD_LEVEL', default=10, cast=int)
+# Bitta siqilgan kadrdagi buyurtmalar soni: arxivdan bitta buyurtmani o‘qish shu kadrni ochadi
+ORDER_ARCHIVE_FRAME_RECORDS = config('ORDER_ARCHIVE_FRAME_RECORDS', default=100, cast=int)
+
+# Ombor jurnali (jigar_bookstore/inventory.py): `manage.py snapshot_stock` nuqtasi
+# hozirgi vaqtdan shuncha soniya orqada olinadi (commit bo‘lmagan harakatlar uchun zaxira)
+STOCK_SNAPSHOT_LAG = config('STOCK_SNAPSHOT_LAG', default=300, cast=int)
+
+# Savat (`/cart/`, jigar_bookstore/cart.py): bitta savatdagi eng ko‘p turli kitob soni
+CART_MAX_LINES = config('CART_MAX_LINES', default=100, cast=int)
+# Savat ko‘rsatilmagan takroriy `checkout` shuncha soniya ichida yopilgan savat buyurtmasini qaytaradi
+CART_CHECKOUT_RETRY_SECONDS = config('CART_CHECKOUT_RETRY_SECONDS', default=300, cast=int)
+
 # --- Swagger ---
+# Oflayn tavsiyalar (jigar_bookstore/recommendations.py): holat fayllari va har kitob uchun qo‘shnilar soni
+RECOMMENDATIONS_DIR = config('RECOMMENDATIONS_DIR', default=str(BASE_DIR / 'var' / 'recommendations'))
+ALSO_BOUGHT_TOP_K = config('ALSO_BOUGHT_TOP_K', default=20, cast=int)
+# Inkremental yangilashda `updated_at` belgisi shuncha soniya orqaga olinadi (kech commit’lar uchun zaxira)
+ALSO_BOUGHT_OVERLAP = config('ALSO_BOUGHT_OVERLAP', default=300, cast=int)
+# Mazmunga ko‘ra o‘xshash kitoblar (`manage.py build_similar_books`, jigar_bookstore/similarity.py):
+# vektor o‘lchami (float32) — 256 → bir kitobga 1 KB
+SIMILAR_BOOKS_DIMENSIONS = config('SIMILAR_BOOKS_DIMENSIONS', default=256, cast=int)
+SIMILAR_BOOKS_LIMIT = config('SIMILAR_BOOKS_LIMIT', default=50, cast=int)
+# `--incremental`: oxirgi qurilishdan shuncha soniya oldingi `updated_at` dan boshlab qayta o‘qiladi
+SIMILAR_BOOKS_OVERLAP = config('SIMILAR_BOOKS_OVERLAP', default=300, cast=int)
+
+# Oldindan qurilgan OpenAPI sxemasi (`manage.py build_openapi_schema`, jigar_bookstore/schema.py).
+# CODE_VERSION bo‘sh bo‘lsa — versiya manba fayllaridan hisoblanadi
+CODE_VERSION = config('CODE_VERSION', default='')
+OPENAPI_SCHEMA_DIR = config('OPENAPI_SCHEMA_DIR', default=str(BASE_DIR / 'var' / 'openapi'))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': '📚 Jigar Bookstore API',
     'DESCRIPTION': 'Kitob do‘koni uchun REST API — foydalanuvchi, kitob, izoh, baholash va email bildirishnomalari bilan.',
@@ -129,10 +246,19 @@ SPECTACULAR_SETTINGS = {
 AUTH_USER_MODEL = 'jigar_bookstore.User'
 
 # --- Email sozlamalari (.env orqali) ---
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='jigar_bookstore.mail.PooledSMTPBackend')
 EMAIL_HOST = config("EMAIL_HOST", default='smtp.gmail.com')
 EMAIL_PORT = config("EMAIL_PORT", default=587, cast=int)
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# Hovuzli SMTP backend (jigar_bookstore/mail.py)
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
+EMAIL_POOL_SIZE = config('EMAIL_POOL_SIZE', default=4, cast=int)              # ochiq ulanishlar / parallel yuborish
+EMAIL_BATCH_SIZE = config('EMAIL_BATCH_SIZE', default=50, cast=int)
+EMAIL_MAX_RETRIES = config('EMAIL_MAX_RETRIES', default=3, cast=int)
+EMAIL_RETRY_BACKOFF = config('EMAIL_RETRY_BACKOFF', default=0.5, cast=float)  # soniya, har urinishda 2x
+EMAIL_SPLIT_RECIPIENTS = config('EMAIL_SPLIT_RECIPIENTS', default=True, cast=bool)
+EMAIL_POOL_IDLE_CHECK = config('EMAIL_POOL_IDLE_CHECK', default=30, cast=int)  # shundan uzoq turgan ulanish NOOP bilan tekshiriladi
@@ -1,5 +1,52 @@
 from django.contrib import admin
-from .models import User, Category, Author, Book, Review, Order, OrderItem, Payment
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from .models import User, Category, Author, Book, Review, Order, OrderItem, Payment, StockMovement
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Katta jadvallar uchun paginator.
+    Filtrsiz ro‘yxatda PostgreSQL statistikasi (`pg_class.reltuples`, bo‘laklangan
+    jadvalda — bo‘laklar yig‘indisi) dan taxminiy son olinadi, kichik jadval yoki filtr bo‘lsa — oddiy COUNT(*).
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = self._estimated_count()
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+    def _estimated_count(self):
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+        table = connection.ops.quote_name(self.object_list.model._meta.db_table)
+        with connection.cursor() as cursor:
+            # `to_regclass` — joriy sxemadagi jadval; bo‘laklangan jadvalning (partitioning.py)
+            # o‘z statistikasi yo‘q — bo‘laklari bo‘yicha yig‘iladi
+            cursor.execute(
+                """
+                SELECT SUM(GREATEST(c.reltuples, 0))::bigint FROM pg_class c
+                WHERE (c.oid = to_regclass(%s) AND c.relkind <> 'p')
+                   OR c.oid IN (SELECT i.inhrelid FROM pg_inherits i WHERE i.inhparent = to_regclass(%s))
+                """,
+                [table, table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] else None
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Ko‘p qatorli jadvallar: taxminiy son va ikkinchi COUNT(*) so‘rovisiz."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    replica_reads = True
 
 
 @admin.register(User)
@@ -11,7 +58,9 @@ class UserAdmin(admin.ModelAdmin):
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'created_at')
+    list_display = ('name', 'parent', 'books_count', 'created_at')
+    list_select_related = ('parent',)
+    autocomplete_fields = ('parent',)
     search_fields = ('name',)
     ordering = ('name',)
 
@@ -24,41 +73,77 @@ class AuthorAdmin(admin.ModelAdmin):
 
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
+    replica_reads = True
     list_display = ('title', 'author', 'category', 'price', 'isbn', 'stock')
-    list_filter = ('category', 'author')
-    search_fields = ('title', 'isbn')
+    list_select_related = ('author', 'category')
+    list_filter = ('category',)
+    autocomplete_fields = ('author', 'category')
+    search_fields = ('title', 'isbn', 'author__full_name')
     ordering = ('title',)
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdmin):
     list_display = ('book', 'user', 'rating', 'created_at')
+    list_select_related = ('book', 'user')
     list_filter = ('rating',)
+    autocomplete_fields = ('book', 'user')
+    # Reaksiyalar faqat Review.set_reaction() orqali: to‘g‘ridan-to‘g‘ri M2M tahriri
+    # likes_count/dislikes_count hisoblagichlarini jadvaldan ajratib qo‘yardi
+    exclude = ('likes', 'dislikes')
+    readonly_fields = ('likes_count', 'dislikes_count')
     search_fields = ('comment',)
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'status', 'is_paid', 'total_amount', 'created_at')
-    list_filter = ('status', 'is_paid')
+class OrderAdmin(LargeTableAdmin):
+    list_display = ('id', 'user', 'status', 'is_paid', 'stock_shortage', 'total_amount', 'created_at')
+    list_select_related = ('user',)
+    list_filter = ('status', 'is_paid', 'stock_shortage')
+    autocomplete_fields = ('user',)
     search_fields = ('user__username',)
     ordering = ('-created_at',)
 
 
 @admin.register(OrderItem)
-class OrderItemAdmin(admin.ModelAdmin):
+class OrderItemAdmin(LargeTableAdmin):
     list_display = ('order', 'book', 'quantity', 'price')
+    list_select_related = ('order__user', 'book')
+    # 🔹 Buyurtma bo‘yicha filtr — dropdown o‘rniga `?order=<id>` va autocomplete
+    list_filter = ('order__status',)
+    autocomplete_fields = ('order', 'book')
     search_fields = ('book__title',)
-    list_filter = ('order',)
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(LargeTableAdmin):
     list_display = ('order', 'get_amount', 'payment_method', 'status', 'paid_at')
+    list_select_related = ('order__user',)
     list_filter = ('status', 'payment_method')
+    autocomplete_fields = ('order',)
     ordering = ('-paid_at',)
 
+    @admin.display(description="To‘lov summasi", ordering='order__total_amount')
     def get_amount(self, obj):
         """Buyurtmaning umumiy summasini ko‘rsatadi"""
         return obj.order.total_amount
-    get_amount.short_description = "To‘lov summasi"
+
+
+@admin.register(StockMovement)
+class StockMovementAdmin(LargeTableAdmin):
+    """Ombor jurnali — faqat ko‘rish: yozuvlar inventory.py orqali qo‘shiladi"""
+    list_display = ('created_at', 'book', 'kind', 'quantity', 'order_id', 'note')
+    list_select_related = ('book',)
+    list_filter = ('kind',)
+    autocomplete_fields = ('book',)
+    search_fields = ('book__title', 'book__isbn')
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,348 @@
+"""
+🧊 Eski buyurtmalarni sovuq arxivga chiqarish
+--------------------------------------------
+Yakunlangan (`paid`, `cancelled`) va `ORDER_ARCHIVE_AFTER_DAYS` dan eski
+buyurtmalar oyma-oy `ORDER_ARCHIVE_DIR` ga yoziladi: har qatorda bitta
+buyurtma — uning mahsulotlari (`items`) va to‘lovi (`payment`) bilan JSON.
+Fayl zstd (`zstandard` o‘rnatilgan bo‘lsa) yoki gzip bilan siqiladi — har
+`ORDER_ARCHIVE_FRAME_RECORDS` qator alohida siqilgan kadr (zstd frame / gzip
+member): fayl butunligicha oddiy `.zst`/`.gz` sifatida o‘qiladi, bitta
+buyurtmani o‘qish uchun esa faqat uning kadri ochiladi.
+
+Har fayl yonida manifest: buyurtma/mahsulot/to‘lov soni, siqilmagan
+mazmunning SHA-256 yig‘indisi va `id → [kadr boshi, kadr uzunligi, kadrdagi
+qator]` xaritasi. Bazadan o‘chirishdan oldin fayl qayta o‘qilib, sonlar va
+yig‘indi tekshiriladi; o‘chirish bo‘laklarda, har bo‘lak alohida tranzaksiyada.
+
+Qidiruv uchun manifestlar `index.sqlite3` ga yig‘iladi (`id` — PRIMARY KEY):
+`get_archived_order` bitta indeksli so‘rov, bitta `seek` va bitta kadrni
+ochish — arxiv hajmiga bog‘liq emas, xotirada barcha ID’lar saqlanmaydi.
+Indeks yo‘qolsa — manifestlardan qayta tiklanadi.
+
+O‘chirish signallarsiz bajariladi: `UserOrderSummary` (umrbod jamlar)
+arxivlangan buyurtmalarni hisobda saqlaydi. Ish to‘xtab qolsa — keyingi
+ishga tushirishda manifestda bor buyurtmalar qayta yozilmay o‘chiriladi.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .partitioning import add_months, month_start
+
+FINISHED_STATUSES = ('paid', 'cancelled')
+CHUNK_SIZE = 1000
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# ==========================
+# 🔹 Fayllar
+# ==========================
+def archive_dir():
+    return Path(settings.ORDER_ARCHIVE_DIR)
+
+
+def _compressor(path):
+    """Bitta mustaqil kadr siquvchi: bytes → zstd frame / gzip member"""
+    if path.name.endswith('.zst'):
+        return zstandard.ZstdCompressor(level=settings.ORDER_ARCHIVE_ZSTD_LEVEL).compress
+    return lambda data: gzip.compress(data, mtime=0)
+
+
+def _require_zstandard(path):
+    if path.name.endswith('.zst') and zstandard is None:
+        raise RuntimeError(f"{path.name} ni o‘qish uchun zstandard o‘rnatilishi kerak")
+
+
+def _decompress(path, frame):
+    _require_zstandard(path)
+    if path.name.endswith('.zst'):
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+
+def _open_reader(path):
+    """Butun fayl — barcha kadrlar ketma-ket"""
+    _require_zstandard(path)
+    if path.name.endswith('.zst'):
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(
+            open(path, 'rb'), read_across_frames=True, closefd=True
+        ))
+    return gzip.open(path, 'rb')
+
+
+def _next_path(month):
+    """`orders-2024-03-001.jsonl.zst` — shu oy uchun navbatdagi qism"""
+    suffix = '.jsonl.zst' if zstandard is not None else '.jsonl.gz'
+    part = len(list(archive_dir().glob(f'orders-{month:%Y-%m}-*.manifest.json'))) + 1
+    return archive_dir() / f'orders-{month:%Y-%m}-{part:03d}{suffix}'
+
+
+def _manifest_path(path):
+    return path.with_name(path.name.split('.')[0] + '.manifest.json')
+
+
+def _fields(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def read_file(path):
+    """Arxiv faylini to‘liq o‘qib, sonlar va SHA-256 yig‘indisini qaytaradi (tekshiruv uchun)"""
+    digest, orders, items, payments = hashlib.sha256(), 0, 0, 0
+    with _open_reader(path) as stream:
+        for line in stream:
+            digest.update(line)
+            record = json.loads(line)
+            orders += 1
+            items += len(record['items'])
+            payments += record['payment'] is not None
+    return {'orders': orders, 'items': items, 'payments': payments, 'sha256': digest.hexdigest()}
+
+
+# ==========================
+# 🔹 Arxivlash
+# ==========================
+def _records(order_ids, using):
+    """Buyurtmalar bo‘lagi → JSON yozuvlari (3 ta so‘rov)"""
+    from .models import Order, OrderItem, Payment
+
+    orders = Order.objects.using(using).filter(pk__in=order_ids).order_by('created_at', 'id').values(*_fields(Order))
+    items, payments = {}, {}
+    for item in OrderItem.objects.using(using).filter(order_id__in=order_ids).order_by('created_at', 'id') \
+            .values(*_fields(OrderItem)):
+        items.setdefault(item['order_id'], []).append(item)
+    for payment in Payment.objects.using(using).filter(order_id__in=order_ids).values(*_fields(Payment)):
+        payments[payment['order_id']] = payment
+    for order in orders:
+        yield {**order, 'items': items.get(order['id'], []), 'payment': payments.get(order['id'])}
+
+
+def _db_counts(order_ids, using):
+    """Bazadagi (buyurtma, mahsulot, to‘lov) soni — arxiv fayli bilan solishtirish uchun"""
+    from .models import Order, OrderItem, Payment
+
+    counts = [0, 0, 0]
+    for start in range(0, len(order_ids), CHUNK_SIZE):
+        chunk = order_ids[start:start + CHUNK_SIZE]
+        counts[0] += Order.objects.using(using).filter(pk__in=chunk).count()
+        counts[1] += OrderItem.objects.using(using).filter(order_id__in=chunk).count()
+        counts[2] += Payment.objects.using(using).filter(order_id__in=chunk).count()
+    return tuple(counts)
+
+
+def _delete(order_ids, using):
+    """Signallarsiz o‘chirish (umrbod xulosalar o‘zgarmaydi), bo‘laklarda"""
+    from .models import Order, OrderItem, Payment
+
+    for start in range(0, len(order_ids), CHUNK_SIZE):
+        chunk = order_ids[start:start + CHUNK_SIZE]
+        with transaction.atomic(using=using):
+            for model, lookup in ((Payment, 'order_id__in'), (OrderItem, 'order_id__in'), (Order, 'pk__in')):
+                # _raw_delete — kaskad va post_delete signallarisiz bitta DELETE
+                model.objects.using(using).filter(**{lookup: chunk})._raw_delete(using)
+
+
+def archive_month(month, before, using='default', dry_run=False):
+    """
+    Bir oy (UTC) ichidagi `before` dan eski yakunlangan buyurtmalarni arxivlaydi.
+    Natija: {'orders', 'items', 'payments', 'file'}.
+    """
+    from .models import Order
+
+    end = min(add_months(month, 1), before)
+    queryset = Order.objects.using(using).filter(
+        status__in=FINISHED_STATUSES, created_at__gte=month, created_at__lt=end
+    )
+    order_ids = list(queryset.order_by('created_at', 'id').values_list('id', flat=True))
+    sync_index()
+    already = _archived_ids([str(order_id) for order_id in order_ids])
+    leftover = [order_id for order_id in order_ids if str(order_id) in already]
+    pending = [order_id for order_id in order_ids if str(order_id) not in already]
+    result = {'orders': 0, 'items': 0, 'payments': 0, 'file': None, 'resumed': len(leftover)}
+    if dry_run or not order_ids:
+        result['orders'] = len(pending)
+        return result
+    if leftover:
+        # Oldingi ishga tushirishda arxivlangan, lekin o‘chirilmay qolgan
+        _delete(leftover, using)
+    if not pending:
+        return result
+
+    archive_dir().mkdir(parents=True, exist_ok=True)
+    path = _next_path(month)
+    tmp = path.with_name(path.name.replace('.jsonl', '.tmp.jsonl'))
+    digest, positions = hashlib.sha256(), {}
+    compress, frame_records = _compressor(path), settings.ORDER_ARCHIVE_FRAME_RECORDS
+    with open(tmp, 'wb') as stream:
+        frame, frame_ids = [], []
+
+        def flush():
+            data = compress(b''.join(frame))
+            offset = stream.tell()
+            stream.write(data)
+            for line_no, order_id in enumerate(frame_ids):
+                positions[order_id] = [offset, len(data), line_no]
+            frame.clear()
+            frame_ids.clear()
+
+        for start in range(0, len(pending), CHUNK_SIZE):
+            for record in _records(pending[start:start + CHUNK_SIZE], using):
+                line = json.dumps(record, cls=DjangoJSONEncoder, sort_keys=True, ensure_ascii=False).encode() + b'\n'
+                frame.append(line)
+                frame_ids.append(str(record['id']))
+                digest.update(line)
+                result['items'] += len(record['items'])
+                result['payments'] += record['payment'] is not None
+                if len(frame) >= frame_records:
+                    flush()
+        if frame:
+            flush()
+    result['orders'] = len(positions)
+
+    # ✅ Tekshiruv: fayl qayta o‘qiladi va bazadagi sonlar bilan solishtiriladi
+    expected = {**{key: result[key] for key in ('orders', 'items', 'payments')}, 'sha256': digest.hexdigest()}
+    counts = (result['orders'], result['items'], result['payments'])
+    if read_file(tmp) != expected or result['orders'] != len(pending) or _db_counts(pending, using) != counts:
+        tmp.unlink()
+        raise RuntimeError(f"{path.name}: arxiv tekshiruvdan o‘tmadi — bazadan hech narsa o‘chirilmadi")
+    os.replace(tmp, path)
+    manifest = {
+        'file': path.name, 'month': f'{month:%Y-%m}', 'before': before.isoformat(),
+        'archived_at': datetime.now(timezone.utc).isoformat(), **expected, 'ids': positions,
+    }
+    manifest_tmp = _manifest_path(path).with_suffix('.tmp')
+    manifest_tmp.write_text(json.dumps(manifest))
+    os.replace(manifest_tmp, _manifest_path(path))
+    _index_manifest(manifest)
+
+    _delete(pending, using)
+    result['file'] = path.name
+    return result
+
+
+def archive_orders(before, after=None, using='default', dry_run=False):
+    """`after`..`before` oralig‘idagi oylar bo‘yicha arxivlash; har oy natijasi generator orqali"""
+    from .models import Order
+
+    if after is None:
+        first = Order.objects.using(using).filter(
+            status__in=FINISHED_STATUSES, created_at__lt=before
+        ).order_by('created_at').values_list('created_at', flat=True).first()
+        if first is None:
+            return
+        after = first
+    month = month_start(after)
+    while month < before:
+        yield month, archive_month(month, before, using=using, dry_run=dry_run)
+        month = add_months(month, 1)
+
+
+# ==========================
+# 🔹 Qidiruv indeksi (SQLite)
+# ==========================
+def _index_path():
+    return archive_dir() / 'index.sqlite3'
+
+
+def _connect():
+    connection = sqlite3.connect(_index_path())
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS orders (id TEXT PRIMARY KEY, file TEXT NOT NULL, "
+        "offset INTEGER NOT NULL, length INTEGER NOT NULL, line INTEGER NOT NULL)"
+    )
+    connection.execute("CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY)")
+    return connection
+
+
+def _index_manifest(manifest, connection=None):
+    """Manifest ID’larini indeksga yozadi (bitta tranzaksiyada, takrorlansa — o‘zgarmaydi)"""
+    own = connection is None
+    connection = connection or _connect()
+    size = None
+    rows = []
+    for order_id, location in manifest['ids'].items():
+        if isinstance(location, int):
+            # Eski manifest: faqat qator raqami — butun fayl bitta kadr
+            size = size or (archive_dir() / manifest['file']).stat().st_size
+            location = [0, size, location]
+        rows.append((order_id, manifest['file'], *location))
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO orders (id, file, offset, length, line) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            connection.execute("INSERT OR IGNORE INTO files (name) VALUES (?)", [manifest['file']])
+    finally:
+        if own:
+            connection.close()
+
+
+def sync_index():
+    """Indeksga hali kirmagan manifestlarni qo‘shadi (arxivlashda va indeks yo‘qolganda)"""
+    if not archive_dir().exists():
+        return
+    connection = _connect()
+    try:
+        indexed = {name for name, in connection.execute("SELECT name FROM files")}
+        for path in sorted(archive_dir().glob('orders-*.manifest.json')):
+            manifest = json.loads(path.read_text())
+            if manifest['file'] not in indexed:
+                _index_manifest(manifest, connection)
+    finally:
+        connection.close()
+
+
+def _archived_ids(order_ids):
+    """`order_ids` dan arxivda borlari (bo‘laklab, indeks orqali)"""
+    if not _index_path().exists():
+        return set()
+    found = set()
+    connection = _connect()
+    try:
+        for start in range(0, len(order_ids), 500):
+            chunk = order_ids[start:start + 500]
+            found.update(order_id for order_id, in connection.execute(
+                f"SELECT id FROM orders WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+    finally:
+        connection.close()
+    return found
+
+
+# ==========================
+# 🔹 Arxivdan o‘qish
+# ==========================
+def get_archived_order(order_id):
+    """Arxivlangan buyurtma (mahsulotlar va to‘lov bilan) yoki None — faqat uning kadri o‘qiladi"""
+    if not archive_dir().exists():
+        return None
+    if not _index_path().exists():
+        sync_index()
+    connection = _connect()
+    try:
+        location = connection.execute(
+            "SELECT file, offset, length, line FROM orders WHERE id = ?", [str(order_id)]
+        ).fetchone()
+    finally:
+        connection.close()
+    if location is None:
+        return None
+    name, offset, length, line = location
+    path = archive_dir() / name
+    with open(path, 'rb') as stream:
+        stream.seek(offset)
+        frame = stream.read(length)
+    return json.loads(_decompress(path, frame).splitlines()[line])
@@ -0,0 +1,176 @@
+"""
+⚡ Katalog uchun asinxron o‘qish yo‘li (ASGI)
+---------------------------------------------
+ASGI rejimida `BookViewSet`, `AuthorViewSet` va `CategoryViewSet` ning
+`list` va `retrieve` so‘rovlari shu yerda — Django async ORM (`acount`,
+`aiterator`, `aget`) bilan bajariladi.
+
+Viewset’ning o‘zi qayta ishlatiladi: queryset, filter backendlar (Search,
+Ordering, DjangoFilter), permission, throttle va serializer bir xil.
+Filter backendlar bazaga murojaat qilmaydi deb faraz qilinmaydi — ular
+`sync_to_async` orqali sinxron oqimda ishlaydi (so‘rov uchun bitta o‘tish);
+hosil bo‘lgan lazy queryset keyin async ORM bilan o‘qiladi.
+
+Yozish so‘rovlari (POST/PUT/PATCH/DELETE), brauzer uchun API sahifasi
+va format suffikslari mavjud sinxron viewset’ga uzatiladi.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.authentication import get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+async def _filtered_queryset(view):
+    """Filter backendlar ichida sinxron so‘rov bo‘lishi mumkin — event loop’dan tashqarida"""
+    return await sync_to_async(lambda: view.filter_queryset(view.get_queryset()))()
+
+
+class _CountOnly:
+    """Paginator sahifa raqamini tekshirishi uchun — faqat oldindan olingan son"""
+
+    def __init__(self, count):
+        self._count = count
+
+    def count(self):
+        return self._count
+
+
+async def _authenticate(request):
+    """`Authorization: Token <key>` sarlavhasini async ORM bilan tekshiradi"""
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != b'token':
+        return None, None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed('Invalid token header.')
+    try:
+        token = await Token.objects.select_related('user').aget(key=auth[1].decode())
+    except (Token.DoesNotExist, UnicodeError):
+        raise exceptions.AuthenticationFailed('Invalid token.')
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed('User inactive or deleted.')
+    return token.user, token
+
+
+class AsyncCatalogReader:
+    """Bitta viewset uchun list/retrieve ni async bajaradi"""
+
+    def __init__(self, viewset_class):
+        self.viewset_class = viewset_class
+        # Sinxron yo‘l bilan bir xil JSON renderer (FAST_JSON bo‘lsa — orjson)
+        self.renderer = next(
+            (renderer() for renderer in viewset_class.renderer_classes
+             if issubclass(renderer, JSONRenderer)),
+            JSONRenderer(),
+        )
+
+    def _make_view(self, request, action, kwargs):
+        view = self.viewset_class()
+        view.action_map = {'get': action}
+        view.action = action
+        view.request = request
+        view.args = ()
+        view.kwargs = kwargs
+        view.format_kwarg = None
+        view.headers = {}
+        return view
+
+    def _render(self, request, view, data, status_code=status.HTTP_200_OK):
+        content = self.renderer.render(data, renderer_context={'request': request, 'view': view})
+        response = HttpResponse(content, status=status_code, content_type='application/json')
+        response['Vary'] = 'Accept'
+        return response
+
+    async def list(self, request, view):
+        queryset = await _filtered_queryset(view)
+        paginator = view.paginator
+        page_size = paginator.get_page_size(request) if paginator else None
+
+        if not page_size:
+            rows = [obj async for obj in queryset.aiterator()]
+            return view.get_serializer(rows, many=True).data
+
+        count = await queryset.acount()
+        django_paginator = Paginator(_CountOnly(count), page_size)
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            number = django_paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise exceptions.NotFound(
+                paginator.invalid_page_message.format(page_number=page_number, message=str(exc))
+            )
+        bottom = (number - 1) * page_size
+        rows = [obj async for obj in queryset[bottom:bottom + page_size].aiterator()]
+
+        paginator.request = request
+        paginator.page = Page(rows, number, django_paginator)
+        serializer = view.get_serializer(rows, many=True)
+        return paginator.get_paginated_response(serializer.data).data
+
+    async def retrieve(self, request, view):
+        queryset = await _filtered_queryset(view)
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            obj = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, DjangoValidationError, TypeError, ValueError):
+            raise exceptions.NotFound()
+        return view.get_serializer(obj).data
+
+    async def handle(self, django_request, action, kwargs):
+        request = Request(django_request, parsers=[], authenticators=[])
+        view = self._make_view(request, action, kwargs)
+        try:
+            user, token = await _authenticate(django_request)
+            if user is not None:
+                request.user, request.auth = user, token
+            view.check_permissions(request)
+            view.check_throttles(request)
+            data = await getattr(self, action)(request, view)
+        except exceptions.APIException as exc:
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                exc.auth_header = 'Token'
+            response = api_settings.EXCEPTION_HANDLER(exc, {'request': request, 'view': view})
+            rendered = self._render(request, view, response.data, response.status_code)
+            for header, value in response.items():
+                rendered[header] = value
+            return rendered
+        return self._render(request, view, data)
+
+
+def _wants_json(request):
+    """Brauzer API sahifasi (text/html) va ?format= so‘rovlari sinxron yo‘lga o‘tadi"""
+    if request.GET.get(api_settings.URL_FORMAT_OVERRIDE):
+        return False
+    return 'text/html' not in request.headers.get('Accept', '')
+
+
+def async_catalog_view(viewset_class, detail=False):
+    """
+    Router’dagi `<prefix>/` yoki `<prefix>/<pk>/` manziliga mos async view.
+    O‘qish async bajariladi, qolgan metodlar mavjud sinxron viewset’ga uzatiladi.
+    """
+    if detail:
+        actions = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+    else:
+        actions = {'get': 'list', 'post': 'create'}
+    sync_view = sync_to_async(viewset_class.as_view(actions))
+    reader = AsyncCatalogReader(viewset_class)
+    read_action = actions['get']
+
+    async def view(request, *args, **kwargs):
+        if request.method in READ_METHODS and _wants_json(request):
+            return await reader.handle(request, read_action, kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    view.replica_reads = getattr(viewset_class, 'replica_reads', False)
+    view.__name__ = f'{viewset_class.__name__}_{read_action}_async'
+    return view
@@ -0,0 +1,133 @@
+"""
+🔎 Qidiruv maydoni uchun avtoto‘ldirish
+--------------------------------------
+Kitob nomlari, muallif ismlari va ISBN prefikslari bo‘yicha indeks har bir
+worker xotirasida saralangan kalitlar ro‘yxati sifatida saqlanadi: so‘rov —
+`bisect` bilan prefiks boshiga o‘tish va ketma-ket o‘qish, bazaga murojaatsiz.
+
+Kalitlar: to‘liq nom va uning har bir so‘zdan boshlanadigan qismi
+("uzuklar hukmdori", "hukmdori"), muallif ismi ham shunday, ISBN — raqamlar.
+
+Book/Author o‘zgarsa `book-autocomplete` versiyasi oshiriladi (signals.py);
+worker versiyani `AUTOCOMPLETE_VERSION_CHECK` soniyada bir marta tekshiradi
+va o‘zgargan bo‘lsa keyingi so‘rovda indeksni qayta quradi (ikki so‘rov).
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .caching import bump_version, get_version
+
+AUTOCOMPLETE_NAMESPACE = 'book-autocomplete'
+
+# Indeksga kiradigan maydonlar — faqat shular o‘zgarganda versiya oshiriladi
+BOOK_FIELDS = ('title', 'isbn')
+AUTHOR_FIELDS = ('full_name',)
+
+# Bitta so‘rovda ko‘rib chiqiladigan eng ko‘p kalit (juda qisqa prefikslar uchun chegara)
+SCAN_LIMIT = 200
+
+APOSTROPHES = str.maketrans({'‘': "'", '’': "'", 'ʻ': "'", 'ʼ': "'", '`': "'"})
+WORD_RE = re.compile(r"[^\W_][\w']*", re.UNICODE)
+
+
+def normalize(text):
+    """Kichik harf, apostrof turlari bitta, ortiqcha bo‘shliqlarsiz"""
+    return ' '.join((text or '').casefold().translate(APOSTROPHES).split())
+
+
+def _keys(label):
+    """(kalit, daraja): to‘liq nom — 0, keyingi so‘zdan boshlanadigan qismlar — 1"""
+    text = normalize(label)
+    if not text:
+        return []
+    tails = {text[match.start():] for match in WORD_RE.finditer(text)} - {text}
+    return [(text, 0)] + [(tail, 1) for tail in tails]
+
+
+class AutocompleteIndex:
+    """
+    `entries` — (uzunlik, nom) bo‘yicha saralangan yozuvlar; `keys` — saralangan
+    kalitlar, `scores` — har kalit uchun `daraja * len(entries) + yozuv o‘rni`:
+    kichik ball — yaxshiroq taklif, qidiruvda faqat butun sonlar saralanadi.
+    """
+
+    def __init__(self, version, books, authors):
+        self.version = version
+        items = [(title, {'id': str(book_id), 'label': title, 'type': 'book'}, isbn)
+                 for book_id, title, isbn in books]
+        items += [(full_name, {'id': str(author_id), 'label': full_name, 'type': 'author'}, None)
+                  for author_id, full_name in authors]
+        items.sort(key=lambda item: (len(item[0]), item[0]))
+        self.entries = [entry for _, entry, _ in items]
+
+        size = len(items)
+        pairs = []
+        for position, (label, _, isbn) in enumerate(items):
+            pairs.extend((key, rank * size + position) for key, rank in _keys(label))
+            if isbn:
+                pairs.append((isbn, position))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.scores = [score for _, score in pairs]
+        self.checked_at = time.monotonic()
+
+    def search(self, query, limit):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        keys, size = self.keys, len(self.entries)
+        start = bisect_left(keys, prefix)
+        end = min(bisect_left(keys, prefix + '\U0010ffff', start), start + SCAN_LIMIT)
+        results, seen = [], set()
+        # Nomning boshidan mos kelish (daraja 0) — so‘z o‘rtasidagidan yuqori
+        for score in sorted(self.scores[start:end]):
+            position = score % size
+            if position not in seen:
+                seen.add(position)
+                results.append(self.entries[position])
+                if len(results) == limit:
+                    break
+        return results
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def _build(version):
+    from .models import Author, Book
+
+    return AutocompleteIndex(
+        version,
+        Book.objects.values_list('id', 'title', 'isbn').iterator(),
+        Author.objects.values_list('id', 'full_name').iterator(),
+    )
+
+
+def get_index():
+    """Joriy worker indeksi; versiya o‘zgargan bo‘lsa — qayta quriladi"""
+    global _index
+    index = _index
+    if index is not None and time.monotonic() - index.checked_at < settings.AUTOCOMPLETE_VERSION_CHECK:
+        return index
+    version = get_version(AUTOCOMPLETE_NAMESPACE)
+    if index is not None and index.version == version:
+        index.checked_at = time.monotonic()
+        return index
+    with _lock:
+        if _index is None or _index.version != version:
+            _index = _build(version)
+        return _index
+
+
+def autocomplete(query, limit):
+    return get_index().search(query, limit)
+
+
+def invalidate_autocomplete():
+    bump_version(AUTOCOMPLETE_NAMESPACE)
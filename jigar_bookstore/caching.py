@@ -0,0 +1,48 @@
+"""
+🗃 Versiyalangan kesh kalitlari
+------------------------------
+Har bir "nom fazosi" (masalan, `book-facets`) uchun keshda versiya raqami
+saqlanadi. Kalitlar shu versiya bilan tuziladi, invalidatsiya esa bitta
+`bump_version()` — eski yozuvlar o‘z TTL’i bilan o‘chib ketadi.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+
+def _version_key(namespace):
+    return f'cache-version:{namespace}'
+
+
+def get_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), 1, timeout=None)
+        version = cache.get(_version_key(namespace), 1)
+    return version
+
+
+def bump_version(namespace):
+    """Nom fazosidagi barcha kalitlarni bir vaqtda eskirtiradi"""
+    try:
+        return cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), 2, timeout=None)
+        return 2
+
+
+def versioned_key(namespace, *parts):
+    """`<namespace>:v<versiya>:<qismlar xeshi>` ko‘rinishidagi kalit"""
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'{namespace}:v{get_version(namespace)}:{digest}'
+
+
+# Kitob ma’lumotlariga bog‘liq keshlar — signallarni chetlab o‘tadigan
+# ommaviy yangilashlar (bulk_update) ham shularni eskirtirishi kerak
+BOOK_CACHE_NAMESPACES = ['book-facets']
+
+
+def invalidate_book_caches():
+    for namespace in BOOK_CACHE_NAMESPACES:
+        bump_version(namespace)
@@ -0,0 +1,148 @@
+"""
+🛒 Server tomonidagi savat
+-------------------------
+Savat ixcham jadvalda: `Cart` (foydalanuvchida bitta ochiq) va `CartItem`
+(savat, kitob, miqdor). Qo‘shish — bitta `UPDATE quantity = quantity + n`,
+qator yo‘q bo‘lsa — bitta INSERT; olib tashlash — bitta DELETE. Narx savatda
+saqlanmaydi. O‘zgartirishlar ham `checkout` kabi savat qatorini qulflaydi:
+rasmiylashtirish bilan poygada mahsulot yopilgan savatda qolib ketmaydi.
+
+`checkout` savatni bitta tranzaksiyada `Order` + `OrderItem` larga aylantiradi:
+savat qatori qulflanadi, mahsulotlar kitoblarning narxi va qoldig‘i bilan bitta
+so‘rovda o‘qiladi, mahsulotlar bitta `bulk_create` bilan yoziladi, so‘ng savat
+buyurtmaga bog‘lanib yopiladi. Shu savat uchun takroriy (masalan, javob
+yo‘qolgandan keyingi) chaqiruv yangi buyurtma yaratmaydi — o‘sha buyurtmani qaytaradi.
+Savat ko‘rsatilmagan takroriy chaqiruv ham: ochiq savat yo‘q bo‘lsa, oxirgi
+`CART_CHECKOUT_RETRY_SECONDS` ichida yopilgan savatning buyurtmasi qaytadi.
+
+Qoldiq rasmiylashtirishda faqat tekshiriladi (band qilinmaydi): ombordan
+chiqim buyurtma `paid` bo‘lganda ombor jurnaliga yoziladi (inventory.py);
+shu orada qoldiq tugagan bo‘lsa — to‘lov rad etilmaydi, buyurtma
+`stock_shortage` bilan belgilanadi.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
+
+
+def current_cart(user):
+    """Ochiq savat mahsulotlari va kitoblari bilan (ikki so‘rov) yoki None"""
+    from .models import Cart, CartItem
+
+    return Cart.objects.filter(user=user, order__isnull=True).prefetch_related(
+        Prefetch('items', queryset=CartItem.objects.select_related('book').order_by('id'))
+    ).first()
+
+
+def open_cart(user):
+    """Ochiq savat; yo‘q bo‘lsa — yaratiladi (parallel so‘rov yaratib ulgurgan bo‘lsa — o‘shanisi)"""
+    from .models import Cart
+
+    cart = Cart.objects.filter(user=user, order__isnull=True).first()
+    if cart is not None:
+        return cart
+    try:
+        with transaction.atomic():
+            return Cart.objects.create(user=user)
+    except IntegrityError:
+        return Cart.objects.get(user=user, order__isnull=True)
+
+
+def _lock_open_cart(cart):
+    """
+    Savat qatori `checkout` dagi kabi qulflanadi va ochiqligi qulf ostida qayta
+    tekshiriladi: shu orada rasmiylashtirilgan savatga mahsulot qo‘shilmaydi —
+    yangi ochiq savat olinadi. Tranzaksiya ichida chaqiriladi.
+    """
+    from .models import Cart
+
+    for _ in range(2):
+        locked = Cart.objects.select_for_update().filter(pk=cart.pk, order__isnull=True).first()
+        if locked is not None:
+            return locked
+        cart = open_cart(cart.user)
+    raise ValidationError({'items': ["Savat hozir rasmiylashtirilmoqda — qayta urinib ko‘ring"]})
+
+
+def add_item(cart, book_id, quantity):
+    """Miqdorni `quantity` ga oshiradi; mahsulot qo‘shilgan savat qaytadi"""
+    from .models import CartItem
+
+    with transaction.atomic():
+        cart = _lock_open_cart(cart)
+        if CartItem.objects.filter(cart=cart, book_id=book_id).update(quantity=F('quantity') + quantity):
+            return cart
+        if CartItem.objects.filter(cart=cart).count() >= settings.CART_MAX_LINES:
+            raise ValidationError({'items': [f"Savatda {settings.CART_MAX_LINES} tadan ko‘p kitob bo‘lmaydi"]})
+        # Savat qulflangan — shu savatga parallel qo‘shish kutadi, takroriy INSERT bo‘lmaydi
+        CartItem.objects.create(cart=cart, book_id=book_id, quantity=quantity)
+    return cart
+
+
+def set_quantity(cart, book_id, quantity):
+    """Miqdorni o‘rnatadi; 0 — qatorni olib tashlaydi"""
+    from .models import CartItem
+
+    with transaction.atomic():
+        cart = _lock_open_cart(cart)
+        rows = CartItem.objects.filter(cart=cart, book_id=book_id)
+        if not quantity:
+            rows.delete()
+        elif not rows.update(quantity=quantity):
+            add_item(cart, book_id, quantity)
+    return cart
+
+
+def checkout(user, cart_id=None):
+    """
+    (buyurtma, yaratildimi). `cart_id` berilmasa — ochiq savat, u bo‘lmasa —
+    yaqinda yopilgan savat (takroriy so‘rov). Yopilgan savat uchun uning
+    buyurtmasi qaytadi (`False`), savat o‘zgarmaydi.
+    """
+    from .models import Cart, Order, OrderItem
+
+    with transaction.atomic():
+        carts = Cart.objects.select_for_update().filter(user=user)
+        if cart_id:
+            cart = carts.filter(pk=cart_id).first()
+        else:
+            cart = carts.filter(order__isnull=True).first() or carts.filter(
+                order__isnull=False,
+                updated_at__gte=timezone.now() - timedelta(seconds=settings.CART_CHECKOUT_RETRY_SECONDS),
+            ).order_by('-updated_at').first()
+        if cart is None:
+            raise NotFound("Savat topilmadi")
+        if cart.order_id:
+            order = Order.objects.filter(pk=cart.order_id).first()
+            if order is None:
+                raise NotFound("Savat buyurtmasi topilmadi (o‘chirilgan yoki arxivlangan)")
+            return order, False
+
+        items = list(
+            cart.items.select_related('book').only('book', 'quantity', 'book__price', 'book__stock').order_by('id')
+        )
+        if not items:
+            raise ValidationError({'items': ["Savat bo‘sh"]})
+        shortages = [
+            f"Omborda yetarli emas: kitob {item.book_id} — so‘ralgan {item.quantity}, mavjud {item.book.stock}"
+            for item in items if item.quantity > item.book.stock
+        ]
+        if shortages:
+            raise ValidationError({'stock': shortages})
+
+        total = sum((item.book.price * item.quantity for item in items), Decimal('0'))
+        order = Order.objects.create(user=user, total_amount=total)
+        # bulk_create signal yubormaydi — summa yuqorida hisoblangan, qayta hisoblash kerak emas
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, book_id=item.book_id, quantity=item.quantity, price=item.book.price)
+            for item in items
+        ])
+        cart.order = order
+        cart.save(update_fields=['order', 'updated_at'])
+    return order, True
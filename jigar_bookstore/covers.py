@@ -0,0 +1,152 @@
+"""
+🖼 Kitob muqovalari uchun fon rejimidagi qayta ishlash
+------------------------------------------------------
+Yuklangan `Book.cover_image` dan bir nechta o‘lchamdagi WebP eskizlar
+(thumbnail) yaratiladi. Og‘ir Pillow ishi alohida jarayonlar hovuzida
+(`ProcessPoolExecutor`) bajariladi — so‘rov faqat faylni diskka yozadi.
+
+Sozlamalar (`settings.py`):
+    COVER_THUMBNAIL_SIZES    — eskiz kengliklari, masalan (160, 320, 640)
+    COVER_PROCESSING_WORKERS — hovuzdagi jarayonlar soni
+    COVER_PROCESSING_ASYNC   — False bo‘lsa, ish shu jarayonda bajariladi (testlar uchun)
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def render_cover_variants(source_path, output_dir, stem, sizes, quality=80):
+    """
+    Worker jarayonida ishlaydi: Django’ga bog‘liq emas.
+    Har bir kenglik uchun WebP fayl yozadi va (kenglik, fayl nomi, w, h) ro‘yxatini qaytaradi.
+    """
+    from PIL import Image
+
+    os.makedirs(output_dir, exist_ok=True)
+    variants = []
+    with Image.open(source_path) as image:
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        for size in sorted(sizes):
+            thumb = image.copy()
+            thumb.thumbnail((size, size * 2))
+            filename = f"{stem}_{size}.webp"
+            thumb.save(os.path.join(output_dir, filename), 'WEBP', quality=quality, method=4)
+            variants.append((size, filename, thumb.width, thumb.height))
+    return variants
+
+
+def _get_executor():
+    global _executor
+    from django.conf import settings
+
+    with _executor_lock:
+        if _executor is None:
+            # `spawn`: workerlar ko‘p oqimli Django jarayonidan fork qilinmaydi
+            # (ochiq DB ulanishlari va boshqa oqimlarda ushlangan qulflar meros qolmaydi)
+            _executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'COVER_PROCESSING_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+            atexit.register(_shutdown_executor)
+        return _executor
+
+
+def _shutdown_executor():
+    """Jarayon tugashida: navbatdagilar bekor qilinadi, ishlayotganlari kutiladi"""
+    global _executor
+
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _store_variants(book_id, source_name, variants):
+    """Natijani kitobga yozadi (agar shu orada muqova almashtirilmagan bo‘lsa)"""
+    from .models import Book
+
+    thumbs_dir = os.path.join(os.path.dirname(source_name), 'thumbs')
+    payload = {
+        'source': source_name,
+        'sizes': {
+            str(size): {'name': f"{thumbs_dir}/{filename}", 'width': width, 'height': height}
+            for size, filename, width, height in variants
+        },
+    }
+    previous = Book.objects.filter(pk=book_id).values_list('cover_variants', flat=True).first() or {}
+    if Book.objects.filter(pk=book_id, cover_image=source_name).update(cover_variants=payload):
+        if previous.get('source') != source_name:
+            delete_cover_variants(previous, keep=payload)
+    else:
+        # Shu orada kitob o‘chirilgan yoki muqova almashtirilgan — yangi eskizlar hech kimga kerak emas
+        delete_cover_variants(payload)
+
+
+def delete_cover_variants(variants, keep=None):
+    """Almashtirilgan (yoki o‘chirilgan kitob) muqovasining `thumbs/` fayllarini o‘chiradi (`keep` nomlaridan tashqari)"""
+    from .models import Book
+
+    storage = Book._meta.get_field('cover_image').storage
+    kept = {item['name'] for item in ((keep or {}).get('sizes') or {}).values()}
+    for item in ((variants or {}).get('sizes') or {}).values():
+        if item['name'] not in kept:
+            storage.delete(item['name'])
+
+
+def _on_done(book_id, source_name):
+    def callback(future):
+        from django.db import connection
+
+        try:
+            _store_variants(book_id, source_name, future.result())
+        except Exception as e:
+            print(f"❌ Muqovani qayta ishlashda xatolik ({book_id}): {e}")
+        finally:
+            # Callback executor oqimida ishlaydi — ulanishni ochiq qoldirmaymiz
+            connection.close()
+    return callback
+
+
+def schedule_cover_processing(book):
+    """Kitob muqovasi uchun eskizlar yaratishni navbatga qo‘yadi"""
+    from django.conf import settings
+
+    source_name = book.cover_image.name
+    storage = book.cover_image.storage
+    source_path = storage.path(source_name)
+    output_dir = os.path.join(os.path.dirname(source_path), 'thumbs')
+    stem = os.path.splitext(os.path.basename(source_name))[0]
+    sizes = tuple(getattr(settings, 'COVER_THUMBNAIL_SIZES', (160, 320, 640)))
+    args = (source_path, output_dir, stem, sizes)
+
+    if not getattr(settings, 'COVER_PROCESSING_ASYNC', True):
+        _store_variants(book.pk, source_name, render_cover_variants(*args))
+        return
+    future = _get_executor().submit(render_cover_variants, *args)
+    future.add_done_callback(_on_done(book.pk, source_name))
+
+
+def cover_url_for(book, size=None, request=None):
+    """
+    So‘ralgan kenglikka mos (undan kichik bo‘lmagan) eng kichik eskiz URL’ini qaytaradi.
+    Eskizlar hali tayyor bo‘lmasa — asl rasm.
+    """
+    if not book.cover_image:
+        return None
+    variants = (book.cover_variants or {})
+    sizes = variants.get('sizes') if variants.get('source') == book.cover_image.name else None
+    url = book.cover_image.url
+    if sizes:
+        widths = sorted(int(width) for width in sizes)
+        if size is None:
+            chosen = widths[-1]
+        else:
+            chosen = next((width for width in widths if width >= size), widths[-1])
+        url = book.cover_image.storage.url(sizes[str(chosen)]['name'])
+    return request.build_absolute_uri(url) if request is not None else url
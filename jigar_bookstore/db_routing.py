@@ -0,0 +1,138 @@
+"""
+🔀 O‘qish replikalariga yo‘naltirish
+------------------------------------
+Xavfsiz (GET/HEAD/OPTIONS) so‘rovlar `replica_reads = True` belgilangan
+viewset yoki admin ro‘yxatlariga kelsa — o‘qish replikadan bajariladi.
+Qolgan hamma narsa (yozish, checkout, to‘lov) asosiy bazada (`default`).
+
+* read-your-writes: foydalanuvchi yozgandan keyin `REPLICA_PIN_SECONDS`
+  davomida uning o‘qishlari ham asosiy bazaga yo‘naltiriladi;
+* replika `REPLICA_MAX_LAG` soniyadan ko‘proq orqada qolsa yoki ulanib
+  bo‘lmasa — asosiy bazaga qaytiladi.
+
+Sozlamalar: DATABASE_REPLICAS (aliaslar ro‘yxati), REPLICA_PIN_SECONDS,
+REPLICA_MAX_LAG, REPLICA_LAG_CHECK_INTERVAL.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+PRIMARY = 'default'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# So‘rov boshida tanlangan replika (None — asosiy baza)
+_read_alias = ContextVar('read_alias', default=None)
+_lag_cache = {}
+_lag_lock = threading.Lock()
+
+
+def replica_lag(alias):
+    """Replikaning orqada qolishi (soniya). Ulanib bo‘lmasa — None"""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+            )
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        return None
+
+
+def healthy_replicas():
+    """Lag chegarasidan oshmagan replikalar (natija bir necha soniya keshlanadi)"""
+    interval = getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 5)
+    max_lag = getattr(settings, 'REPLICA_MAX_LAG', 2)
+    now = time.monotonic()
+    healthy = []
+    for alias in getattr(settings, 'DATABASE_REPLICAS', []):
+        with _lag_lock:
+            checked_at, lag = _lag_cache.get(alias, (None, None))
+        if checked_at is None or now - checked_at > interval:
+            lag = replica_lag(alias)
+            with _lag_lock:
+                _lag_cache[alias] = (now, lag)
+        if lag is not None and lag <= max_lag:
+            healthy.append(alias)
+    return healthy
+
+
+class PrimaryReplicaRouter:
+    """Yozish — doim `default`; o‘qish — middleware so‘rov uchun tanlagan replika yoki `default`"""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikalar asosiy bazaning nusxasi — obyektlar bir-biriga bog‘lana oladi
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def _client_key(request):
+    """Token, sessiya yoki foydalanuvchi bo‘yicha pin kaliti"""
+    identity = (
+        request.headers.get('Authorization')
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or (str(request.user.pk) if getattr(request, 'user', None) and request.user.is_authenticated else None)
+    )
+    if not identity:
+        return None
+    return 'db-pin:' + hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+
+def _view_allows_replica(view_func):
+    if hasattr(view_func, 'replica_reads'):
+        return view_func.replica_reads
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is not None:
+        return getattr(view_class, 'replica_reads', False)
+    model_admin = getattr(view_func, 'model_admin', None)
+    return getattr(model_admin, 'replica_reads', False)
+
+
+class ReplicaRoutingMiddleware:
+    """So‘rov uchun o‘qish manbasini tanlaydi, yozgan mijozni esa asosiy bazaga qadaydi"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            key = _client_key(request)
+            if key:
+                cache.set(key, True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in SAFE_METHODS or not getattr(settings, 'DATABASE_REPLICAS', None):
+            return None
+        if not _view_allows_replica(view_func):
+            return None
+        key = _client_key(request)
+        if key and cache.get(key):
+            return None
+        # Replika so‘rovga bir marta tanlanadi — barcha o‘qishlar bitta ulanishdan o‘tadi
+        replicas = healthy_replicas()
+        if replicas:
+            _read_alias.set(random.choice(replicas))
+        return None
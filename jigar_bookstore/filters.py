@@ -0,0 +1,82 @@
+import django_filters
+from django.db.models import Subquery
+
+from .models import Book, Category, Order, Payment
+
+
+class UUIDInFilter(django_filters.BaseInFilter, django_filters.UUIDFilter):
+    """`?category__in=<id1>,<id2>` — vergul bilan ajratilgan UUID’lar"""
+
+
+class BookFilterSet(django_filters.FilterSet):
+    """
+    Kitoblar filtri.
+    Muallif/kategoriya UUID bo‘yicha filtrlanadi — `ModelChoiceFilter` kabi
+    qiymatni tekshirish uchun bazaga alohida so‘rov yuborilmaydi.
+    Har bir filtrga mos indeks bor (Book.Meta.indexes, FK va unique indekslar).
+    """
+    category = django_filters.UUIDFilter(field_name='category_id')
+    category__in = UUIDInFilter(field_name='category_id', lookup_expr='in')
+    author = django_filters.UUIDFilter(field_name='author_id')
+    author__in = UUIDInFilter(field_name='author_id', lookup_expr='in')
+    category_tree = django_filters.UUIDFilter(
+        method='filter_category_tree', label="Kategoriya va uning barcha ichki kategoriyalari"
+    )
+    price_min = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
+    price_max = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
+    in_stock = django_filters.BooleanFilter(method='filter_in_stock', label="Omborda bormi")
+    published_after = django_filters.DateFilter(field_name='published_date', lookup_expr='gte')
+    published_before = django_filters.DateFilter(field_name='published_date', lookup_expr='lte')
+    isbn = django_filters.CharFilter(field_name='isbn', lookup_expr='exact')
+
+    class Meta:
+        model = Book
+        fields = [
+            'category', 'category__in', 'author', 'author__in', 'category_tree',
+            'price_min', 'price_max', 'in_stock', 'published_after', 'published_before', 'isbn',
+        ]
+
+    def filter_category_tree(self, queryset, name, value):
+        """
+        Daraxt osti: `category.path LIKE '<yo‘l>%'`. Yo‘l skalyar subquery’da — so‘rov
+        bitta (alohida sinxron so‘rov async o‘qish yo‘lini buzardi, async_views.py);
+        noma’lum `id` — NULL prefiks, natija bo‘sh.
+        """
+        path = Category.objects.filter(pk=value).values('path')[:1]
+        return queryset.filter(category__path__startswith=Subquery(path))
+
+    def filter_in_stock(self, queryset, name, value):
+        return queryset.filter(stock__gt=0) if value else queryset.filter(stock=0)
+
+
+class CategoryFilterSet(django_filters.FilterSet):
+    """`?parent=<id>` — bevosita bolalar, `?root=true` — faqat ildiz kategoriyalar"""
+    parent = django_filters.UUIDFilter(field_name='parent_id')
+    root = django_filters.BooleanFilter(field_name='parent', lookup_expr='isnull')
+
+    class Meta:
+        model = Category
+        fields = ['parent', 'depth', 'root']
+
+
+class OrderFilterSet(django_filters.FilterSet):
+    """
+    `?created_after=` / `?created_before=` — PostgreSQL’da `created_at` bo‘yicha
+    oylik bo‘laklardan faqat keraklilari o‘qiladi (partitioning.py).
+    """
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = Order
+        fields = ['status', 'is_paid', 'created_after', 'created_before']
+
+
+class PaymentFilterSet(django_filters.FilterSet):
+    """`?paid_after=` / `?paid_before=` — `paid_at` bo‘laklari bo‘yicha"""
+    paid_after = django_filters.IsoDateTimeFilter(field_name='paid_at', lookup_expr='gte')
+    paid_before = django_filters.IsoDateTimeFilter(field_name='paid_at', lookup_expr='lt')
+
+    class Meta:
+        model = Payment
+        fields = ['status', 'payment_method', 'paid_after', 'paid_before']
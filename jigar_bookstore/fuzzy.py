@@ -0,0 +1,147 @@
+"""
+🔤 Xatolarga chidamli (fuzzy) qidiruv
+------------------------------------
+`SearchFilter` faqat aniq qism-satrni topadi: "Qodiri", "Толкиен" yoki
+"Tolkein" kabi xato yozilgan so‘rovlar bo‘sh natija beradi. Bu yerda
+`Book.title` va `Author.full_name` trigrammalar (3 harfli bo‘laklar)
+o‘xshashligi bo‘yicha solishtiriladi.
+
+* PostgreSQL: `pg_trgm` kengaytmasi va GIN (`gin_trgm_ops`) indekslari
+  (migratsiya 0009). Filtr — `title %>> 'so‘rov'` operatori, u indeksdan
+  foydalanadi; chegara so‘rov tranzaksiyasi ichida
+  `pg_trgm.strict_word_similarity_threshold` orqali beriladi (`SET LOCAL`).
+* Boshqa bazalar (SQLite sinovlari): xuddi shu formula Python’da, har bir
+  qator ustida hisoblanadi — faqat kichik bazalar uchun.
+
+Ball — `strict_word_similarity(so‘rov, nom)`: so‘rov trigrammalari bilan nomdagi
+ketma-ket so‘zlarning eng mos bo‘lagi trigrammalari o‘xshashligi (0..1).
+Kitob balli — nom va muallif ismi ballarining kattasi.
+"""
+
+import math
+import re
+
+from django.conf import settings
+from django.contrib.postgres.lookups import TrigramStrictWordSimilar
+from django.contrib.postgres.search import TrigramStrictWordSimilarity
+from django.db import connections, transaction
+from django.db.models import Case, FloatField, Value, When
+
+WORD_RE = re.compile(r'[^\W_]+', re.UNICODE)
+
+
+# ==========================
+# 🔹 Python’dagi trigrammalar (pg_trgm bilan bir xil qoidalar)
+# ==========================
+def _word_trigrams(word):
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigrams(text):
+    """pg_trgm kabi: kichik harf, har bir so‘z oldidan 2 ta, keyin 1 ta bo‘shliq"""
+    result = set()
+    for word in WORD_RE.findall((text or '').lower()):
+        result |= _word_trigrams(word)
+    return result
+
+
+def strict_word_similarity(query, text):
+    """
+    pg_trgm’dagi `strict_word_similarity(query, text)`: matndagi ketma-ket so‘zlar
+    bo‘laklari ichida so‘rov trigrammalari bilan eng katta Jaccard o‘xshashligi.
+    """
+    query_trigrams = trigrams(query)
+    if not query_trigrams:
+        return 0.0
+    words = [_word_trigrams(word) for word in WORD_RE.findall((text or '').lower())]
+    best = 0.0
+    for start in range(len(words)):
+        extent = set()
+        for end in range(start, len(words)):
+            extent |= words[end]
+            common = len(query_trigrams & extent)
+            best = max(best, common / (len(query_trigrams) + len(extent) - common))
+    return best
+
+
+def clamp_threshold(value):
+    """
+    So‘rovdagi `?threshold=` → [0.1, 1.0]; bo‘sh bo‘lsa — `FUZZY_SEARCH_THRESHOLD`.
+    Son bo‘lmasa (`nan`, `inf` ham) — ValueError (API’da 400).
+    """
+    if value in (None, ''):
+        return settings.FUZZY_SEARCH_THRESHOLD
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"Chegara chekli son bo‘lishi kerak: {value}")
+    return min(max(value, 0.1), 1.0)
+
+
+# ==========================
+# 🔹 Qidiruv
+# ==========================
+def fuzzy_books(queryset, query, threshold, limit):
+    """[(Book, ball)] — nom yoki muallif ismi so‘rovga o‘xshash kitoblar, ball bo‘yicha kamayish tartibida"""
+    query = ' '.join(WORD_RE.findall(query or ''))
+    if not trigrams(query):
+        return []
+    if connections[queryset.db].vendor == 'postgresql':
+        return _postgres(queryset, query, threshold, limit)
+    return _in_process(queryset, query, threshold, limit)
+
+
+def _merge(by_title, by_author, limit):
+    scores = {}
+    for book, score in list(by_title) + list(by_author):
+        if book.pk not in scores or scores[book.pk][1] < score:
+            scores[book.pk] = (book, score)
+    ranked = sorted(scores.values(), key=lambda item: (-item[1], item[0].title, str(item[0].pk)))
+    return ranked[:limit]
+
+
+def _postgres(queryset, query, threshold, limit):
+    from .models import Author
+
+    using = queryset.db
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.strict_word_similarity_threshold', %s, true)", [str(threshold)]
+            )
+
+        # Ikkala filtr ham GIN indeksidan foydalanadi; tartiblash faqat topilganlar ustida
+        by_title = [
+            (book, book.fuzzy_score) for book in
+            queryset.filter(TrigramStrictWordSimilar('title', Value(query)))
+            .annotate(fuzzy_score=TrigramStrictWordSimilarity(Value(query), 'title'))
+            .order_by('-fuzzy_score')[:limit]
+        ]
+        authors = dict(
+            Author.objects.using(using)
+            .filter(TrigramStrictWordSimilar('full_name', Value(query)))
+            .annotate(fuzzy_score=TrigramStrictWordSimilarity(Value(query), 'full_name'))
+            .order_by('-fuzzy_score').values_list('id', 'fuzzy_score')[:limit]
+        )
+        # Mos mualliflarning kitoblari — muallif balli bo‘yicha (FK indeksi orqali)
+        author_score = Case(
+            *[When(author_id=author_id, then=Value(score)) for author_id, score in authors.items()],
+            output_field=FloatField(),
+        )
+        by_author = [
+            (book, book.fuzzy_score) for book in
+            queryset.filter(author_id__in=list(authors)).annotate(fuzzy_score=author_score)
+            .order_by('-fuzzy_score', 'title')[:limit]
+        ] if authors else []
+    return _merge(by_title, by_author, limit)
+
+
+def _in_process(queryset, query, threshold, limit):
+    books = list(queryset)
+    by_title = [(book, strict_word_similarity(query, book.title)) for book in books]
+    by_author = [(book, strict_word_similarity(query, book.author.full_name)) for book in books]
+    return _merge(
+        [item for item in by_title if item[1] >= threshold],
+        [item for item in by_author if item[1] >= threshold],
+        limit,
+    )
@@ -0,0 +1,257 @@
+"""
+📦 Ombor jurnali (inventory ledger)
+----------------------------------
+`Book.stock` — hosila qiymat. Har bir o‘zgarish avval `StockMovement`
+jurnaliga yoziladi (faqat qo‘shiladi) va shu tranzaksiyada `stock` ga F()
+orqali qo‘shiladi: parallel yozuvchilar bir-birining qiymatini ustidan
+yozmaydi, `Book.stock == Sum(quantity)` doim saqlanadi.
+
+* `receipt` — kirim (kitob yaratilganda boshlang‘ich soni ham);
+* `sale` — buyurtma `paid` holatiga o‘tganda, har bir kitob uchun;
+* `cancellation` — to‘langan buyurtma bekor qilinganda qaytgan soni;
+* `adjustment` — qo‘lda tuzatish (inventarizatsiya, ommaviy yangilash).
+
+Qo‘lda chiqim qoldiqdan oshsa — `InsufficientStock` (`stock >= n` shartli
+UPDATE), butun tranzaksiya bekor bo‘ladi. Sotuv esa rad etilmaydi: mijoz
+to‘lovni allaqachon amalga oshirgan. Omborda bor qismi sotuv sifatida
+yoziladi, buyurtma `stock_shortage` bilan belgilanadi (admin ko‘rib chiqadi).
+Bekor qilishda jurnaldagi haqiqiy sotilgan soni qaytariladi.
+
+Vaqt bo‘yicha qoldiq (`stock_at`): `snapshot_stock` buyrug‘i vaqti-vaqti bilan
+`StockSnapshot` (kitob, vaqt, qoldiq) nuqtalarini yozadi. So‘rov — eng yaqin
+oldingi nuqta (`(book, -taken_at)` indeksi) va undan keyingi harakatlar
+yig‘indisi (`(book, created_at)` indeksi): tarix uzunligiga bog‘liq emas.
+Nuqta `STOCK_SNAPSHOT_LAG` soniya orqada olinadi — shu vaqtdan oldin
+boshlangan, lekin hali commit bo‘lmagan harakatlar nuqtadan chetda qolmasligi uchun.
+`reconcile_stock` buyrug‘i jurnal, nuqtalar va `Book.stock` mosligini tekshiradi.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .caching import invalidate_book_caches
+
+CHUNK_SIZE = 1000
+
+
+class InsufficientStock(ValidationError):
+    """Chiqim ombordagi sondan ko‘p — API’da 400 javobiga aylanadi"""
+
+    def __init__(self, book_id, requested, available):
+        self.book_id, self.requested, self.available = book_id, requested, available
+        super().__init__({'stock': [shortage_message(book_id, requested, available)]})
+
+
+def shortage_message(book_id, requested, available):
+    return f"Omborda yetarli emas: kitob {book_id} — so‘ralgan {requested}, mavjud {available}"
+
+
+# ==========================
+# 🔹 Harakatlarni yozish
+# ==========================
+def record_movements(kind, quantities, order_id=None, note=''):
+    """
+    `{book_id: miqdor}` harakatlarini yozadi: har kitobga bitta shartli UPDATE
+    (id tartibida — qulflar bir xil ketma-ketlikda) va bitta INSERT.
+    """
+    from .models import Book, StockMovement
+
+    quantities = {book_id: quantity for book_id, quantity in quantities.items() if quantity}
+    if not quantities:
+        return []
+    with transaction.atomic():
+        for book_id in sorted(quantities, key=str):
+            quantity = quantities[book_id]
+            rows = Book.objects.filter(pk=book_id)
+            if quantity < 0:
+                rows = rows.filter(stock__gte=-quantity)
+            if not rows.update(stock=F('stock') + quantity):
+                available = Book.objects.filter(pk=book_id).values_list('stock', flat=True).first()
+                if available is None:
+                    raise Book.DoesNotExist(f"Kitob {book_id} topilmadi")
+                raise InsufficientStock(book_id, -quantity, available)
+        movements = StockMovement.objects.bulk_create([
+            StockMovement(book_id=book_id, kind=kind, quantity=quantity, order_id=order_id, note=note)
+            for book_id, quantity in quantities.items()
+        ])
+        # "Omborda bor" fasetlari qoldiqqa bog‘liq
+        transaction.on_commit(invalidate_book_caches)
+    return movements
+
+
+def record_movement(book_id, kind, quantity, order_id=None, note=''):
+    movements = record_movements(kind, {book_id: quantity}, order_id=order_id, note=note)
+    return movements[0] if movements else None
+
+
+def set_stock_levels(levels, note=''):
+    """
+    Inventarizatsiya: `{book_id: yangi soni}`. Qatorlar qulflanadi, farq `adjustment`
+    sifatida yoziladi; `{book_id: farq}` qaytadi. Tranzaksiya ichida chaqiriladi,
+    `stock` ning o‘zini chaqiruvchi yozadi (masalan, `bulk_update` bilan).
+    """
+    from .models import Book, StockMovement
+
+    current = dict(
+        Book.objects.select_for_update().filter(pk__in=list(levels)).order_by('pk').values_list('pk', 'stock')
+    )
+    deltas = {book_id: levels[book_id] - stock for book_id, stock in current.items() if levels[book_id] != stock}
+    StockMovement.objects.bulk_create([
+        StockMovement(book_id=book_id, kind=StockMovement.ADJUSTMENT, quantity=delta, note=note)
+        for book_id, delta in deltas.items()
+    ])
+    return deltas
+
+
+def _record_sale(order):
+    """
+    Sotuv: kitob qatorlari qulflanadi, har kitobdan omborda borigacha chiqim yoziladi.
+    Yetmagan bo‘lsa — buyurtma `stock_shortage` bilan belgilanadi (to‘lov rad etilmaydi).
+    """
+    from .models import Book, Order, OrderItem, StockMovement
+
+    requested = dict(
+        OrderItem.objects.filter(order_id=order.pk, book__isnull=False)
+        .values('book_id').annotate(total=Sum('quantity')).values_list('book_id', 'total')
+    )
+    available = dict(
+        Book.objects.select_for_update().filter(pk__in=list(requested)).order_by('pk').values_list('pk', 'stock')
+    )
+    sold = {book_id: min(total, available.get(book_id, 0)) for book_id, total in requested.items()}
+    movements = record_movements(
+        StockMovement.SALE, {book_id: -quantity for book_id, quantity in sold.items()}, order_id=order.pk,
+        note=f"Buyurtma {order.pk}",
+    )
+    if sold != requested:
+        Order.objects.filter(pk=order.pk).update(stock_shortage=True)
+        order.stock_shortage = True
+    return movements
+
+
+def record_order_status(order, previous_status):
+    """Buyurtma `paid` ga o‘tdi — sotuv, `paid` dan chiqdi — jurnal bo‘yicha sotilganini qaytarish"""
+    from .models import StockMovement
+
+    if previous_status != 'paid' and order.status == 'paid':
+        return _record_sale(order)
+    if previous_status != 'paid' or order.status == 'paid':
+        return []
+    # Jurnaldagi sof sotuv (oversell bo‘lsa — so‘ralganidan kam) qaytariladi
+    sold = (
+        StockMovement.objects.filter(order_id=order.pk, kind__in=(StockMovement.SALE, StockMovement.CANCELLATION))
+        .values('book_id').annotate(total=Sum('quantity')).values_list('book_id', 'total')
+    )
+    return record_movements(
+        StockMovement.CANCELLATION, {book_id: -total for book_id, total in sold if total < 0},
+        order_id=order.pk, note=f"Buyurtma {order.pk}",
+    )
+
+
+# ==========================
+# 🔹 Vaqt bo‘yicha qoldiq
+# ==========================
+def stock_at(book_id, when):
+    """`when` paytidagi qoldiq: eng yaqin oldingi nuqta + undan keyingi harakatlar (ikki indeksli so‘rov)"""
+    from .models import StockMovement, StockSnapshot
+
+    snapshot = (
+        StockSnapshot.objects.filter(book_id=book_id, taken_at__lte=when)
+        .order_by('-taken_at').values_list('taken_at', 'stock').first()
+    )
+    movements = StockMovement.objects.filter(book_id=book_id, created_at__lte=when)
+    base = 0
+    if snapshot is not None:
+        taken_at, base = snapshot
+        movements = movements.filter(created_at__gte=taken_at)
+    return base + (movements.aggregate(total=Sum('quantity'))['total'] or 0)
+
+
+def _latest_snapshot(field):
+    from .models import StockSnapshot
+
+    return Subquery(
+        StockSnapshot.objects.filter(book=OuterRef('pk')).order_by('-taken_at').values(field)[:1]
+    )
+
+
+def take_snapshots(now=None):
+    """
+    Oxirgi nuqtadan beri harakati bo‘lgan kitoblar uchun yangi nuqta
+    (`now - STOCK_SNAPSHOT_LAG`). Yozilgan nuqtalar soni qaytadi.
+    """
+    from .models import Book, StockMovement, StockSnapshot
+
+    cutoff = (now or timezone.now()) - timedelta(seconds=settings.STOCK_SNAPSHOT_LAG)
+    last = StockSnapshot.objects.aggregate(last=Max('taken_at'))['last']
+    if last is not None and last >= cutoff:
+        return 0
+    movements = StockMovement.objects.filter(created_at__lt=cutoff)
+    if last is not None:
+        movements = movements.filter(created_at__gte=last)
+    deltas = dict(movements.values('book_id').annotate(total=Sum('quantity')).values_list('book_id', 'total'))
+
+    book_ids, created = list(deltas), 0
+    for start in range(0, len(book_ids), CHUNK_SIZE):
+        chunk = book_ids[start:start + CHUNK_SIZE]
+        previous = Book.objects.filter(pk__in=chunk).annotate(previous=_latest_snapshot('stock'))
+        snapshots = [
+            StockSnapshot(book_id=book_id, taken_at=cutoff, stock=(stock or 0) + deltas[book_id])
+            for book_id, stock in previous.values_list('pk', 'previous')
+        ]
+        created += len(StockSnapshot.objects.bulk_create(snapshots))
+    return created
+
+
+# ==========================
+# 🔹 Moslikni tekshirish
+# ==========================
+def _ledger_total(**filters):
+    from .models import StockMovement
+
+    return Coalesce(Subquery(
+        StockMovement.objects.filter(book=OuterRef('pk'), **filters)
+        .values('book').annotate(total=Sum('quantity')).values('total')
+    ), 0)
+
+
+def stock_mismatches():
+    """[(book_id, stock, jurnal yig‘indisi)] — `Book.stock` jurnalga mos kelmagan kitoblar"""
+    from .models import Book
+
+    return list(
+        Book.objects.annotate(ledger=_ledger_total()).exclude(stock=F('ledger'))
+        .order_by('pk').values_list('pk', 'stock', 'ledger')
+    )
+
+
+def snapshot_mismatches():
+    """[(book_id, taken_at, nuqta, jurnal)] — har kitobning oxirgi nuqtasi undan oldingi harakatlarga mos kelmasa"""
+    from .models import Book
+
+    return list(
+        Book.objects.annotate(taken_at=_latest_snapshot('taken_at'), snapshot=_latest_snapshot('stock'))
+        .filter(taken_at__isnull=False)
+        .annotate(ledger=_ledger_total(created_at__lt=OuterRef('taken_at')))
+        .exclude(snapshot=F('ledger'))
+        .order_by('pk').values_list('pk', 'taken_at', 'snapshot', 'ledger')
+    )
+
+
+def fix_mismatches(stock, snapshots):
+    """Jurnal — haqiqat manbai: `Book.stock` va noto‘g‘ri nuqtalar jurnal yig‘indisiga tenglashtiriladi"""
+    from .models import Book, StockSnapshot
+
+    with transaction.atomic():
+        if stock:
+            # Jurnal yig‘indisi UPDATE ichida qayta hisoblanadi — tekshiruvdan keyingi harakatlar ham kiradi
+            Book.objects.filter(pk__in=[book_id for book_id, _, _ in stock]).update(stock=_ledger_total())
+        for book_id, taken_at, _, ledger in snapshots:
+            StockSnapshot.objects.filter(book_id=book_id, taken_at=taken_at).update(stock=ledger)
+        if stock:
+            transaction.on_commit(invalidate_book_caches)
@@ -0,0 +1,276 @@
+"""
+✉️ Hovuzli (pooled) SMTP backend
+--------------------------------
+Stock `smtp.EmailBackend` har bir `send_mail` uchun yangi TLS ulanish ochadi,
+autentifikatsiyadan o‘tadi va barcha qabul qiluvchilarni bitta `To:` ga yozadi.
+Bu backend esa:
+
+* ochilgan SMTP ulanishlarni jarayon bo‘yicha hovuzda saqlab qayta ishlatadi;
+* ko‘p qabul qiluvchili xatni har bir manzil uchun alohida xatga ajratadi
+  va ularni partiyalab, cheklangan parallellik bilan yuboradi;
+* vaqtinchalik xatoliklarni (uzilish, 4xx javob) qayta urinadi;
+* yuborish kechikishini `metrics` orqali ko‘rsatadi.
+
+Sozlamalar: EMAIL_POOL_SIZE, EMAIL_BATCH_SIZE, EMAIL_MAX_RETRIES,
+EMAIL_RETRY_BACKOFF, EMAIL_SPLIT_RECIPIENTS, EMAIL_POOL_IDLE_CHECK.
+"""
+
+import atexit
+import copy
+import queue
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail.backends.smtp import EmailBackend
+from django.core.mail.message import sanitize_address
+from django.core.mail.utils import DNS_NAME
+
+
+class DeliveryMetrics:
+    """Yuborilgan/xato/qayta urinishlar soni va so‘nggi yuborishlar kechikishi"""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.sent = 0
+            self.failed = 0
+            self.retries = 0
+            self.connections_opened = 0
+            self._latencies.clear()
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self._latencies.append(seconds)
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            data = {
+                'sent': self.sent,
+                'failed': self.failed,
+                'retries': self.retries,
+                'connections_opened': self.connections_opened,
+            }
+        if latencies:
+            pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+            data['latency_ms'] = {
+                'p50': round(pick(0.50) * 1000, 2),
+                'p95': round(pick(0.95) * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2),
+            }
+        return data
+
+
+metrics = DeliveryMetrics()
+
+
+class _ConnectionPool:
+    """Bitta SMTP server uchun bo‘sh ulanishlar (LIFO) va ochiq ulanishlar chegarasi"""
+
+    def __init__(self, size):
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def acquire(self, connect, idle_check):
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    connection, returned_at = self._idle.get_nowait()
+                except queue.Empty:
+                    return connect()
+                if time.monotonic() - returned_at < idle_check or _is_alive(connection):
+                    return connection
+                _quit(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, broken=False):
+        if broken:
+            _quit(connection)
+        else:
+            self._idle.put((connection, time.monotonic()))
+        self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quit(connection)
+
+
+def _is_alive(connection):
+    try:
+        return connection.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _quit(connection):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        try:
+            connection.close()
+        except OSError:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def close_pools():
+    """Barcha hovuzlardagi bo‘sh ulanishlarni yopadi (jarayon tugashida ham chaqiriladi)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_pools)
+
+
+def _is_transient(error):
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+
+class PooledSMTPBackend(EmailBackend):
+    """Ulanishlarni qayta ishlatuvchi, partiyalab va parallel yuboruvchi SMTP backend"""
+
+    def __init__(self, pool_size=None, batch_size=None, max_retries=None, retry_backoff=None,
+                 split_recipients=None, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_size = pool_size or getattr(settings, 'EMAIL_POOL_SIZE', 4)
+        self.batch_size = batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', 50)
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, 'EMAIL_MAX_RETRIES', 3)
+        self.retry_backoff = (
+            retry_backoff if retry_backoff is not None else getattr(settings, 'EMAIL_RETRY_BACKOFF', 0.5)
+        )
+        self.split_recipients = (
+            split_recipients if split_recipients is not None
+            else getattr(settings, 'EMAIL_SPLIT_RECIPIENTS', True)
+        )
+        self.idle_check = getattr(settings, 'EMAIL_POOL_IDLE_CHECK', 30)
+
+    # 🔹 Ulanishlar hovuzdan olinadi — open()/close() ularni boshqarmaydi
+    def open(self):
+        return False
+
+    def close(self):
+        pass
+
+    @property
+    def pool(self):
+        key = (self.host, self.port, self.username, self.use_tls, self.use_ssl)
+        with _pools_lock:
+            if key not in _pools:
+                _pools[key] = _ConnectionPool(self.pool_size)
+            return _pools[key]
+
+    def _connect(self):
+        params = {'local_hostname': DNS_NAME.get_fqdn()}
+        if self.timeout is not None:
+            params['timeout'] = self.timeout
+        if self.use_ssl:
+            params['context'] = self.ssl_context
+        connection = self.connection_class(self.host, self.port, **params)
+        try:
+            if not self.use_ssl and self.use_tls:
+                connection.starttls(context=self.ssl_context)
+            if self.username and self.password:
+                connection.login(self.username, self.password)
+        except BaseException:
+            _quit(connection)
+            raise
+        metrics.record_connect()
+        return connection
+
+    def _split(self, email_messages):
+        """Faqat `To:` li xatni har bir qabul qiluvchi uchun alohida xatga ajratadi"""
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            if self.split_recipients and len(message.to) > 1 and not message.cc and not message.bcc:
+                for address in message.to:
+                    single = copy.copy(message)
+                    single.to = [address]
+                    yield single
+            else:
+                yield message
+
+    def _deliver(self, connection, message):
+        encoding = message.encoding or settings.DEFAULT_CHARSET
+        from_email = sanitize_address(message.from_email, encoding)
+        recipients = [sanitize_address(address, encoding) for address in message.recipients()]
+        connection.sendmail(from_email, recipients, message.message().as_bytes(linesep='\r\n'))
+
+    def _send_one(self, message):
+        """Bitta xatni yuboradi; muvaffaqiyatsiz bo‘lsa — istisnoni qaytaradi"""
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            connection = None
+            try:
+                connection = self.pool.acquire(self._connect, self.idle_check)
+                self._deliver(connection, message)
+            except Exception as error:
+                # Javob xatosidan keyin ulanish yaroqli; uzilish yoki tarmoq xatosidan keyin — yo‘q
+                if connection is not None:
+                    self.pool.release(connection, broken=not isinstance(error, smtplib.SMTPResponseException))
+                if attempt < self.max_retries and _is_transient(error):
+                    metrics.record_retry()
+                    time.sleep(self.retry_backoff * 2 ** attempt)
+                    continue
+                metrics.record(time.perf_counter() - started, ok=False)
+                return error
+            self.pool.release(connection)
+            metrics.record(time.perf_counter() - started, ok=True)
+            return None
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        messages = list(self._split(email_messages))
+        if not messages:
+            return 0
+
+        errors = []
+        if len(messages) == 1:
+            errors.append(self._send_one(messages[0]))
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, len(messages))) as executor:
+                for start in range(0, len(messages), self.batch_size):
+                    errors.extend(executor.map(self._send_one, messages[start:start + self.batch_size]))
+
+        failures = [error for error in errors if error is not None]
+        if failures and not self.fail_silently:
+            raise failures[0]
+        return len(messages) - len(failures)
@@ -0,0 +1,52 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jigar_bookstore import archive
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+
+
+class Command(BaseCommand):
+    help = (
+        "Yakunlangan eski buyurtmalarni (mahsulotlar va to‘lovlar bilan) oyma-oy siqilgan JSONL "
+        "fayllarga yozadi, sonlar va SHA-256 ni tekshiradi, so‘ng bazadan bo‘laklarda o‘chiradi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before', type=_date, default=None,
+            help="Shu sanadan (YYYY-MM-DD, UTC) oldingilar; standart — ORDER_ARCHIVE_AFTER_DAYS kun oldin",
+        )
+        parser.add_argument('--after', type=_date, default=None, help="Shu sanadan boshlab (YYYY-MM-DD)")
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--dry-run', action='store_true', help="Faqat nechta buyurtma arxivlanishini ko‘rsatish")
+
+    def handle(self, *args, **options):
+        before = options['before'] or datetime.now(timezone.utc) - timedelta(days=settings.ORDER_ARCHIVE_AFTER_DAYS)
+        if archive.zstandard is None:
+            self.stdout.write(self.style.WARNING("zstandard o‘rnatilmagan — gzip ishlatiladi"))
+        started = time.perf_counter()
+        total = 0
+        try:
+            for month, result in archive.archive_orders(
+                before, options['after'], using=options['database'], dry_run=options['dry_run']
+            ):
+                if not result['orders'] and not result['resumed']:
+                    continue
+                total += result['orders']
+                self.stdout.write(
+                    f"{month:%Y-%m}: {result['orders']} buyurtma, {result['items']} mahsulot, "
+                    f"{result['payments']} to‘lov → {result['file'] or '-'}"
+                    + (f" (oldingi ishdan {result['resumed']} ta o‘chirildi)" if result['resumed'] else "")
+                )
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        verb = "arxivlanadi" if options['dry_run'] else "arxivlandi"
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {total} ta buyurtma {verb} ({time.perf_counter() - started:.2f}s)"
+        ))
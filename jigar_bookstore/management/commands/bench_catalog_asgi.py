@@ -0,0 +1,90 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncRequestFactory, RequestFactory
+
+from jigar_bookstore.async_views import async_catalog_view
+from jigar_bookstore.views import BookViewSet, AuthorViewSet, CategoryViewSet
+
+VIEWSETS = {'books': BookViewSet, 'authors': AuthorViewSet, 'categories': CategoryViewSet}
+
+
+class Command(BaseCommand):
+    help = (
+        "Katalog ro‘yxatini sinxron (WSGI, oqimlar) va async (ASGI, korutinalar) yo‘l bilan "
+        "sekin mijozlar ostida o‘lchaydi: so‘rov/soniya va bitta CPU yadrosiga so‘rov/soniya."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resource', choices=sorted(VIEWSETS), default='books')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--clients', type=int, default=100, help="Bir vaqtdagi mijozlar soni")
+        parser.add_argument('--threads', type=int, default=8, help="WSGI worker oqimlari soni")
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help="Sekin mijoz javobni o‘qiydigan vaqt (soniya)")
+        parser.add_argument('--query', default='', help="Masalan: search=dunyo&ordering=-price")
+
+    def _report(self, label, n, wall, cpu):
+        self.stdout.write(
+            f"{label:<6} {n:>6} so‘rov  {wall:>7.2f}s  {n / wall:>9.1f} req/s  "
+            f"{n / cpu if cpu else 0:>9.1f} req/s/yadro"
+        )
+
+    def bench_wsgi(self, viewset, path, options):
+        """Har bir sekin mijoz javobni o‘qib bo‘lguncha worker oqimini band qiladi"""
+        view = viewset.as_view({'get': 'list'})
+        factory = RequestFactory()
+        delay = options['client_delay']
+
+        def handle(_):
+            response = view(factory.get(path))
+            response.render()
+            time.sleep(delay)
+            return response.status_code
+
+        with ThreadPoolExecutor(max_workers=options['threads'], initializer=connections.close_all) as pool:
+            start_wall, start_cpu = time.perf_counter(), time.process_time()
+            statuses = list(pool.map(handle, range(options['requests'])))
+            wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+        return statuses, wall, cpu
+
+    def bench_asgi(self, viewset, path, options):
+        """Sekin mijoz faqat korutinani kutadi — event loop boshqa so‘rovlarni bajaradi"""
+        view = async_catalog_view(viewset)
+        factory = AsyncRequestFactory()
+        delay = options['client_delay']
+
+        async def run():
+            semaphore = asyncio.Semaphore(options['clients'])
+
+            async def handle():
+                async with semaphore:
+                    response = await view(factory.get(path))
+                    await asyncio.sleep(delay)
+                    return response.status_code
+
+            return await asyncio.gather(*(handle() for _ in range(options['requests'])))
+
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        statuses = asyncio.run(run())
+        return statuses, time.perf_counter() - start_wall, time.process_time() - start_cpu
+
+    def handle(self, *args, **options):
+        # Throttle o‘lchovga xalaqit bermasligi uchun o‘chiriladi
+        base = VIEWSETS[options['resource']]
+        viewset = type(base.__name__, (base,), {'throttle_classes': []})
+        path = f"/api/v1/{options['resource']}/" + (f"?{options['query']}" if options['query'] else '')
+        self.stdout.write(
+            f"{path}  mijozlar={options['clients']}  oqimlar={options['threads']}  "
+            f"kechikish={options['client_delay']}s"
+        )
+
+        for label, bench in (('WSGI', self.bench_wsgi), ('ASGI', self.bench_asgi)):
+            statuses, wall, cpu = bench(viewset, path, options)
+            failed = sum(1 for code in statuses if code != 200)
+            self._report(label, len(statuses), wall, cpu)
+            if failed:
+                self.stdout.write(self.style.WARNING(f"       {failed} ta so‘rov 200 qaytarmadi"))
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jigar_bookstore.models import Book
+
+
+class Command(BaseCommand):
+    help = "Katalog sahifasida yuboriladigan muqova baytlarini o‘lchaydi (asl rasm va eskiz)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=5, help="Nechta katalog sahifasi o‘lchansin")
+        parser.add_argument('--size', type=int, default=None, help="Eskiz kengligi (standart: eng kichigi)")
+
+    def _file_size(self, storage, name):
+        try:
+            return storage.size(name)
+        except OSError:
+            return 0
+
+    def handle(self, *args, **options):
+        page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+        size = options['size'] or min(settings.COVER_THUMBNAIL_SIZES)
+        books = Book.objects.exclude(cover_image='').order_by('id')
+
+        self.stdout.write(f"{'sahifa':>6} {'asl (KB)':>12} {'eskiz (KB)':>12} {'tejam':>8}")
+        total_before = total_after = 0
+        for page in range(options['pages']):
+            rows = books[page * page_size:(page + 1) * page_size]
+            if not rows:
+                break
+            before = after = 0
+            for book in rows:
+                storage = book.cover_image.storage
+                original = self._file_size(storage, book.cover_image.name)
+                before += original
+                sizes = (book.cover_variants or {}).get('sizes') or {}
+                widths = sorted(int(width) for width in sizes)
+                chosen = next((width for width in widths if width >= size), widths[-1] if widths else None)
+                after += self._file_size(storage, sizes[str(chosen)]['name']) if chosen else original
+            total_before += before
+            total_after += after
+            saving = 1 - after / before if before else 0
+            self.stdout.write(f"{page + 1:>6} {before / 1024:>12.1f} {after / 1024:>12.1f} {saving:>8.1%}")
+
+        if total_before:
+            self.stdout.write(self.style.SUCCESS(
+                f"Jami: {total_before / 1024:.1f} KB → {total_after / 1024:.1f} KB "
+                f"({1 - total_after / total_before:.1%} kam)"
+            ))
+        else:
+            self.stdout.write("Muqovali kitoblar topilmadi.")
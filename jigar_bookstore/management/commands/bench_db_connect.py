@@ -0,0 +1,62 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from jigar_bookstore.models import Category
+
+
+class Command(BaseCommand):
+    help = (
+        "So‘rov siklini (request_started → arzon so‘rov → request_finished) takrorlab, "
+        "har so‘rovda yangi ulanish ochish va doimiy ulanish narxini solishtiradi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300)
+        parser.add_argument('--database', default='default')
+
+    def _cycle(self, alias, n, conn_max_age):
+        connection = connections[alias]
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+        timings = []
+        for _ in range(n):
+            start = time.perf_counter()
+            request_started.send(sender=self.__class__)
+            list(Category.objects.using(alias).values_list('id', 'name')[:20])
+            request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        return timings
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f"{label:<12} p50={statistics.median(timings):7.3f}ms  p95={p95:7.3f}ms  "
+            f"o‘rtacha={statistics.mean(timings):7.3f}ms"
+        )
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        alias, n = options['database'], options['requests']
+        settings_dict = connections[alias].settings_dict
+        configured = settings_dict.get('CONN_MAX_AGE', 0)
+        pooled = 'pool' in settings_dict.get('OPTIONS', {})
+        self.stdout.write(
+            f"{alias}: {settings_dict['ENGINE']}  CONN_MAX_AGE={configured}  pool={pooled}  "
+            f"health_checks={settings_dict.get('CONN_HEALTH_CHECKS', False)}"
+        )
+
+        try:
+            fresh = self._report('yangi ulanish', self._cycle(alias, n, 0))
+            persistent = self._report('doimiy', self._cycle(alias, n, 0 if pooled else max(configured or 0, 60)))
+        finally:
+            settings_dict['CONN_MAX_AGE'] = configured
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Ulanish narxi har so‘rovga ≈ {fresh - persistent:.3f}ms (p50 farqi)"
+        ))
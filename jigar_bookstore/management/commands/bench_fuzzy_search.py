@@ -0,0 +1,123 @@
+import json
+import random
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+TABLE = 'bench_fuzzy_titles'
+INDEX = 'bench_fuzzy_titles_trgm_idx'
+SYLLABLES = [
+    'ka', 'lo', 'mi', 'sar', 'tol', 'ki', 'en', 'qo', 'di', 'riy', 'uz', 'uk', 'hu', 'km', 'dor',
+    'va', 'ни', 'ко', 'ла', 'то', 'лс', 'той', 'ми', 'ра', 'bo', 'bur', 'na', 'vo', 'iy', 'ot',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "PostgreSQL’da vaqtinchalik jadvalga (standart 1 000 000) sintetik kitob nomlarini yozib, "
+        "pg_trgm GIN indeksi bilan xato yozilgan so‘rovlarni EXPLAIN ANALYZE orqali o‘lchaydi: "
+        "har bir so‘rov indeksdan (Bitmap Index Scan) xizmat qilinganini tekshiradi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--threshold', type=float, default=0.3)
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--keep', action='store_true', help="Jadvalni o‘chirmaslik (qayta ishga tushirish uchun)")
+
+    def _vocabulary(self, rng, size=20000):
+        words = set()
+        while len(words) < size:
+            words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+        return sorted(words)
+
+    def _typo(self, rng, title):
+        """Nomdan bitta so‘z — bitta harfi almashtirilgan (foydalanuvchi xatosi)"""
+        word = rng.choice(title.split())
+        position = rng.randrange(1, len(word)) if len(word) > 1 else 0
+        return word[:position] + rng.choice('aeiouy') + word[position + 1:]
+
+    def _prepare(self, cursor, rows):
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [TABLE])
+        if cursor.fetchone()[0]:
+            cursor.execute(f"SELECT count(*) FROM {TABLE}")
+            if cursor.fetchone()[0] == rows:
+                self.stdout.write(f"{TABLE}: {rows} qator allaqachon bor — qayta ishlatiladi")
+                return
+        self.stdout.write(f"{TABLE}: {rows} ta nom yozilmoqda...")
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cursor.execute(f"CREATE UNLOGGED TABLE {TABLE} (id bigserial PRIMARY KEY, title text NOT NULL)")
+        cursor.execute("SELECT setseed(0.42)")
+        cursor.execute(
+            f"""
+            INSERT INTO {TABLE} (title)
+            SELECT array_to_string(ARRAY(
+                SELECT (%s::text[])[1 + floor(random() * %s)::int]
+                FROM generate_series(1, 2 + g %% 3)
+            ), ' ')
+            FROM generate_series(1, %s) AS g
+            """,
+            [self.vocabulary, len(self.vocabulary), rows],
+        )
+        cursor.execute(f"CREATE INDEX {INDEX} ON {TABLE} USING gin (title gin_trgm_ops)")
+        cursor.execute(f"ANALYZE {TABLE}")
+
+    def _plan_nodes(self, node):
+        yield node
+        for child in node.get('Plans', []):
+            yield from self._plan_nodes(child)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'postgresql':
+            raise CommandError("Bu benchmark faqat PostgreSQL (pg_trgm) uchun")
+        rng = random.Random(42)
+        self.vocabulary = self._vocabulary(rng)
+
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            self._prepare(cursor, options['rows'])
+            cursor.execute(f"SELECT title FROM {TABLE} TABLESAMPLE SYSTEM (1) LIMIT %s", [options['queries']])
+            samples = [self._typo(rng, title) for title, in cursor.fetchall()]
+
+        timings, index_served, matches = [], 0, []
+        for query in samples:
+            with transaction.atomic(using=options['database']), connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('pg_trgm.strict_word_similarity_threshold', %s, true)",
+                    [str(options['threshold'])],
+                )
+                cursor.execute(
+                    f"""
+                    EXPLAIN (ANALYZE, FORMAT JSON)
+                    SELECT id, title, strict_word_similarity(%s, title) AS score
+                    FROM {TABLE} WHERE title %%>> %s ORDER BY score DESC LIMIT 20
+                    """,
+                    [query, query],
+                )
+                plan = cursor.fetchone()[0]
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            nodes = list(self._plan_nodes(plan[0]['Plan']))
+            if any(node.get('Index Name') == INDEX for node in nodes) and not any(
+                node['Node Type'] == 'Seq Scan' for node in nodes
+            ):
+                index_served += 1
+            timings.append(plan[0]['Execution Time'])
+            matches.append(plan[0]['Plan'].get('Actual Rows', 0))
+
+        timings.sort()
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"{len(samples)} ta so‘rov, chegara={options['threshold']}: "
+            f"indeksdan={index_served}/{len(samples)}  "
+            f"p50={statistics.median(timings):.2f}ms  p95={p95:.2f}ms  max={timings[-1]:.2f}ms  "
+            f"o‘rtacha natija={statistics.mean(matches):.1f}"
+        )
+        if index_served < len(samples):
+            self.stdout.write(self.style.WARNING("Ba’zi so‘rovlar indeksdan foydalanmadi — rejani tekshiring"))
+
+        if not options['keep']:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
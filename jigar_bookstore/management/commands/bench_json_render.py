@@ -0,0 +1,71 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from jigar_bookstore.models import User
+from jigar_bookstore.parsers import FastJSONParser
+from jigar_bookstore.renderers import FastJSONRenderer, orjson
+from jigar_bookstore.views import BookViewSet, ReviewViewSet, OrderViewSet
+
+VIEWSETS = {'books': BookViewSet, 'reviews': ReviewViewSet, 'orders': OrderViewSet}
+
+
+class Command(BaseCommand):
+    help = (
+        "Kitob, sharh va buyurtma sahifalarini DRF JSONRenderer va orjson asosidagi "
+        "FastJSONRenderer bilan kodlash/o‘qish vaqtini solishtiradi (natija baytlari ham tekshiriladi)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000)
+
+    def _page(self, viewset, user):
+        view = type(viewset.__name__, (viewset,), {'throttle_classes': []}).as_view({'get': 'list'})
+        request = APIRequestFactory().get('/')
+        if user is not None:
+            force_authenticate(request, user=user)
+        response = view(request)
+        return response.data if response.status_code == 200 else None
+
+    def _time(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson o‘rnatilmagan — FastJSONRenderer oddiy JSONRenderer’ga teng."))
+        user = User.objects.filter(is_staff=True).first() or User.objects.first()
+        iterations = options['iterations']
+        stock_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        stock_parser, fast_parser = JSONParser(), FastJSONParser()
+
+        self.stdout.write(
+            f"{'sahifa':<8} {'bayt':>7} {'render json':>12} {'render orjson':>14} "
+            f"{'parse json':>11} {'parse orjson':>13} {'tezlanish':>10}"
+        )
+        for name, viewset in VIEWSETS.items():
+            data = self._page(viewset, user)
+            if not data or not data.get('results'):
+                self.stdout.write(f"{name:<8} ma’lumot yo‘q — o‘tkazib yuborildi")
+                continue
+
+            stock_bytes = stock_renderer.render(data)
+            fast_bytes = fast_renderer.render(data)
+            if stock_bytes != fast_bytes:
+                self.stdout.write(self.style.ERROR(f"{name}: natija baytlari farq qiladi!"))
+                continue
+
+            render_stock = self._time(lambda: stock_renderer.render(data), iterations)
+            render_fast = self._time(lambda: fast_renderer.render(data), iterations)
+            parse_stock = self._time(lambda: stock_parser.parse(io.BytesIO(stock_bytes)), iterations)
+            parse_fast = self._time(lambda: fast_parser.parse(io.BytesIO(stock_bytes)), iterations)
+            self.stdout.write(
+                f"{name:<8} {len(stock_bytes):>7} {render_stock:>10.1f}µs {render_fast:>12.1f}µs "
+                f"{parse_stock:>9.1f}µs {parse_fast:>11.1f}µs {render_stock / render_fast:>9.1f}x"
+            )
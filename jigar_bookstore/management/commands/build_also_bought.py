@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jigar_bookstore import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "\"Buni ham sotib olishdi\" qo‘shnilarini to‘langan buyurtmalardan quradi. "
+        "Standart — faqat yangi to‘langan buyurtmalar qo‘shiladi; --full — to‘liq qayta qurish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Matritsani noldan qayta qurish")
+        parser.add_argument('--top-k', type=int, default=None, help="Har kitob uchun qo‘shnilar soni")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        build = recommendations.build_full if options['full'] else recommendations.update_incremental
+        try:
+            stored = build(options['top_k'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {stored} ta qo‘shni yozildi ({time.perf_counter() - started:.2f}s)"
+        ))
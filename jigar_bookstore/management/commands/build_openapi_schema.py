@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jigar_bookstore.schema import build_schema_files, code_version
+
+
+class Command(BaseCommand):
+    help = "OpenAPI sxemasini joriy kod versiyasi uchun oldindan quradi (deploy bosqichi)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--code-version', default=None,
+                            help="Kod versiyasi (standart: CODE_VERSION yoki manba fayllari izi)")
+
+    def handle(self, *args, **options):
+        version = options['code_version'] or code_version()
+        started = time.perf_counter()
+        written = build_schema_files(version)
+        for path in written:
+            self.stdout.write(f"  {path} ({path.stat().st_size / 1024:.1f} KB)")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Sxema versiya {version} uchun {time.perf_counter() - started:.2f}s da qurildi"
+        ))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jigar_bookstore import similarity
+
+
+class Command(BaseCommand):
+    help = (
+        "Mazmunga ko‘ra o‘xshash kitoblar indeksini (TF-IDF vektorlari) quradi. "
+        "Standart — to‘liq qurish; --incremental — faqat keyin qo‘shilgan yoki tahrirlangan kitoblar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help="Yangi va tahrirlangan kitoblarni saqlangan idf bilan qayta vektorlash",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        build = similarity.update_index if options['incremental'] else similarity.build_index
+        try:
+            count = build()
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {count} ta kitob indekslandi ({time.perf_counter() - started:.2f}s)"
+        ))
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jigar_bookstore.partitioning import (
+    PARTITIONED_TABLES, add_months, create_partition, detach_partition, is_partitioned,
+    list_partitions, month_start, partition_month, partition_name,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Buyurtma jadvallarining oylik bo‘laklarini boshqaradi: oldindagi oylar uchun bo‘laklar "
+        "yaratadi va `--retain-months` dan eski bo‘laklarni ajratadi (DETACH). Cron’da kuniga bir marta."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=None, help="Oldindan yaratiladigan oylar soni")
+        parser.add_argument(
+            '--retain-months', type=int, default=None,
+            help="Joriy oydan oldingi nechta oy biriktirilgan qoladi (0 — ajratilmaydi)",
+        )
+        parser.add_argument('--concurrently', action='store_true', help="DETACH ... CONCURRENTLY (PostgreSQL 14+)")
+        parser.add_argument('--dry-run', action='store_true')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'postgresql':
+            raise CommandError("Bo‘laklash faqat PostgreSQL’da")
+        ahead = settings.PARTITION_MONTHS_AHEAD if options['ahead'] is None else options['ahead']
+        retain = settings.PARTITION_RETAIN_MONTHS if options['retain_months'] is None else options['retain_months']
+        dry_run = options['dry_run']
+        quote = connection.ops.quote_name
+        current = month_start(datetime.now(timezone.utc))
+
+        with connection.cursor() as cursor:
+            for table in PARTITIONED_TABLES:
+                if not is_partitioned(cursor, table):
+                    raise CommandError(f"{table} bo‘laklanmagan — avval `migrate` bajaring")
+                existing = set(list_partitions(cursor, table))
+
+                for offset in range(ahead + 1):
+                    month = add_months(current, offset)
+                    name = partition_name(table, month)
+                    if name in existing:
+                        continue
+                    if not dry_run:
+                        create_partition(cursor, quote, table, month)
+                    self.stdout.write(f"➕ {name}")
+
+                if retain > 0:
+                    cutoff = add_months(current, -retain)
+                    for name in sorted(existing):
+                        month = partition_month(name)
+                        if month is not None and month < cutoff:
+                            if not dry_run:
+                                detach_partition(cursor, quote, table, name, concurrently=options['concurrently'])
+                            self.stdout.write(f"➖ {name} ajratildi")
+
+        self.stdout.write(self.style.SUCCESS("✅ Bo‘laklar yangilandi" + (" (dry-run)" if dry_run else "")))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jigar_bookstore.inventory import fix_mismatches, snapshot_mismatches, stock_mismatches
+
+
+class Command(BaseCommand):
+    help = (
+        "Ombor jurnalini tekshiradi: har kitob uchun `Book.stock` harakatlar yig‘indisiga, "
+        "oxirgi nuqta esa undan oldingi harakatlar yig‘indisiga teng bo‘lishi kerak. "
+        "Farq bo‘lsa — xato bilan tugaydi; `--fix` jurnal qiymatini yozadi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help="`Book.stock` va nuqtalarni jurnalga tenglashtirish")
+
+    def handle(self, *args, **options):
+        stock, snapshots = stock_mismatches(), snapshot_mismatches()
+        for book_id, current, ledger in stock:
+            self.stdout.write(f"{book_id}: stock={current}, jurnal={ledger} ({current - ledger:+d})")
+        for book_id, taken_at, snapshot, ledger in snapshots:
+            self.stdout.write(f"{book_id} @ {taken_at.isoformat()}: nuqta={snapshot}, jurnal={ledger}")
+        if not stock and not snapshots:
+            self.stdout.write(self.style.SUCCESS("✅ Jurnal va qoldiqlar mos"))
+            return
+        if not options['fix']:
+            raise CommandError(f"{len(stock)} ta qoldiq va {len(snapshots)} ta nuqta jurnalga mos emas")
+        fix_mismatches(stock, snapshots)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(stock)} ta qoldiq va {len(snapshots)} ta nuqta jurnalga tenglashtirildi"
+        ))
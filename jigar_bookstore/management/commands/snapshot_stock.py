@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jigar_bookstore.inventory import take_snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        "Ombor qoldig‘i nuqtalarini yozadi: oxirgi nuqtadan beri harakati bo‘lgan kitoblar uchun "
+        "(hozir − STOCK_SNAPSHOT_LAG) paytidagi qoldiq. Cron orqali muntazam (masalan, soatiga) ishga tushiriladi."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        created = take_snapshots()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {created} ta kitob uchun nuqta yozildi ({time.perf_counter() - started:.2f}s)"
+        ))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:59
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_reaction_counters(apps, schema_editor):
+    """Mavjud M2M layk/dislayklardan hisoblagichlarni to‘ldiradi"""
+    Review = apps.get_model('jigar_bookstore', 'Review')
+    reviews = Review.objects.annotate(
+        n_likes=Count('likes', distinct=True),
+        n_dislikes=Count('dislikes', distinct=True),
+    ).filter(Q(n_likes__gt=0) | Q(n_dislikes__gt=0))
+    for review in reviews.iterator():
+        Review.objects.filter(pk=review.pk).update(
+            likes_count=review.n_likes, dislikes_count=review.n_dislikes
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jigar_bookstore', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Dislayklar soni'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Layklar soni'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['book', '-likes_count'], name='review_book_likes_idx'),
+        ),
+        migrations.RunPython(backfill_reaction_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_histogram(apps, schema_editor):
+    """Mavjud sharhlardan kitob gistogrammasini to‘ldiradi"""
+    Book = apps.get_model('jigar_bookstore', 'Book')
+    Review = apps.get_model('jigar_bookstore', 'Review')
+    rows = Review.objects.values('book_id', 'rating').annotate(n=Count('id')).order_by()
+    for row in rows.iterator():
+        if 1 <= row['rating'] <= 5:
+            Book.objects.filter(pk=row['book_id']).update(**{f"rating_count_{row['rating']}": row['n']})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jigar_bookstore', '0002_review_reaction_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='rating_count_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='rating_count_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='rating_count_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='rating_count_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='rating_count_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rating_histogram, migrations.RunPython.noop),
+    ]
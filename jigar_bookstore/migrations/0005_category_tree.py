@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_category_paths(apps, schema_editor):
+    """Mavjud kategoriyalar ildiz sifatida: yo‘l va kitoblar sonini to‘ldiradi"""
+    Category = apps.get_model('jigar_bookstore', 'Category')
+    Book = apps.get_model('jigar_bookstore', 'Book')
+    counts = dict(
+        Book.objects.exclude(category=None).values('category_id')
+        .annotate(n=Count('id')).order_by().values_list('category_id', 'n')
+    )
+    for category in Category.objects.all().iterator():
+        Category.objects.filter(pk=category.pk).update(
+            path=category.id.hex + '/', depth=0, books_count=counts.get(category.pk, 0)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jigar_bookstore', '0004_book_cover_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='jigar_bookstore.category', verbose_name='Ota kategoriya'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Chuqurlik'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='books_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Kitoblar soni'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255, verbose_name='Daraxtdagi yo‘l'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(build_category_paths, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='category',
+            name='path',
+            field=models.CharField(editable=False, max_length=255, unique=True, verbose_name='Daraxtdagi yo‘l'),
+        ),
+    ]
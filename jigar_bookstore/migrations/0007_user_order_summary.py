@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_order_summaries(apps, schema_editor):
+    """Mavjud buyurtmalardan foydalanuvchi xulosalarini to‘ldiradi"""
+    Order = apps.get_model('jigar_bookstore', 'Order')
+    UserOrderSummary = apps.get_model('jigar_bookstore', 'UserOrderSummary')
+    rows = Order.objects.values('user_id').annotate(
+        orders_count=Count('id'),
+        pending_count=Count('id', filter=Q(status='pending')),
+        paid_count=Count('id', filter=Q(status='paid')),
+        cancelled_count=Count('id', filter=Q(status='cancelled')),
+        total_spent=Sum('total_amount', filter=Q(status='paid')),
+    ).order_by()
+    UserOrderSummary.objects.bulk_create(
+        [
+            UserOrderSummary(
+                user_id=row['user_id'],
+                orders_count=row['orders_count'],
+                pending_count=row['pending_count'],
+                paid_count=row['paid_count'],
+                cancelled_count=row['cancelled_count'],
+                total_spent=row['total_spent'] or 0,
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jigar_bookstore', '0006_book_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserOrderSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_summary', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Foydalanuvchi')),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Jami to‘langan')),
+                ('orders_count', models.PositiveIntegerField(default=0, verbose_name='Buyurtmalar soni')),
+                ('pending_count', models.PositiveIntegerField(default=0, verbose_name='Kutilayotganlar')),
+                ('paid_count', models.PositiveIntegerField(default=0, verbose_name='To‘langanlar')),
+                ('cancelled_count', models.PositiveIntegerField(default=0, verbose_name='Bekor qilinganlar')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Buyurtmalar xulosasi',
+                'verbose_name_plural': 'Buyurtmalar xulosalari',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', '-created_at'], name='order_user_recent_idx'),
+        ),
+        migrations.RunPython(backfill_order_summaries, migrations.RunPython.noop),
+    ]
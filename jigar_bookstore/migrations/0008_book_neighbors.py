@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jigar_bookstore', '0007_user_order_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='O‘xshashlik')),
+                ('co_purchases', models.PositiveIntegerField(default=0, verbose_name='Birga sotib olingan')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='jigar_bookstore.book', verbose_name='Kitob')),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jigar_bookstore.book', verbose_name='Qo‘shni kitob')),
+            ],
+            options={
+                'verbose_name': 'Qo‘shni kitob',
+                'verbose_name_plural': 'Qo‘shni kitoblar',
+                'indexes': [models.Index(fields=['book', '-score'], name='book_neighbor_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('book', 'neighbor'), name='unique_book_neighbor')],
+            },
+        ),
+    ]
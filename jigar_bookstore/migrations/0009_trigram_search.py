@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+class PostgresOnlySQL(migrations.RunSQL):
+    """pg_trgm faqat PostgreSQL’da — SQLite (sinov/benchmark) bazalarida o‘tkazib yuboriladi"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY tranzaksiya ichida ishlamaydi — katta jadval bloklanmaydi
+    atomic = False
+
+    dependencies = [
+        ('jigar_bookstore', '0008_book_neighbors'),
+    ]
+
+    operations = [
+        PostgresOnlySQL(
+            'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        PostgresOnlySQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS book_title_trgm_idx '
+            'ON jigar_bookstore_book USING gin (title gin_trgm_ops)',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS book_title_trgm_idx',
+        ),
+        PostgresOnlySQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS author_full_name_trgm_idx '
+            'ON jigar_bookstore_author USING gin (full_name gin_trgm_ops)',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS author_full_name_trgm_idx',
+        ),
+    ]
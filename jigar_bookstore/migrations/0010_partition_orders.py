@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from jigar_bookstore.partitioning import partition_tables, unpartition_tables
+
+
+def partition_order_tables(apps, schema_editor):
+    """Order, OrderItem va Payment — oylik bo‘laklarga (faqat PostgreSQL)"""
+    if schema_editor.connection.vendor == 'postgresql':
+        partition_tables(schema_editor.connection, ahead=settings.PARTITION_MONTHS_AHEAD)
+
+
+def unpartition_order_tables(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        unpartition_tables(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jigar_bookstore', '0009_trigram_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderitem',
+            name='order',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='jigar_bookstore.order', verbose_name='Buyurtma'),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='order',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='jigar_bookstore.order', verbose_name='Buyurtma'),
+        ),
+        migrations.RunPython(partition_order_tables, unpartition_order_tables),
+    ]
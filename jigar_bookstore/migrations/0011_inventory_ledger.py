@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def open_ledger(apps, schema_editor):
+    """Mavjud qoldiqlar — jurnalning birinchi yozuvi (`adjustment`), shunda Book.stock == Sum(quantity)"""
+    Book = apps.get_model('jigar_bookstore', 'Book')
+    StockMovement = apps.get_model('jigar_bookstore', 'StockMovement')
+    using = schema_editor.connection.alias
+    movements = [
+        StockMovement(book_id=book_id, kind='adjustment', quantity=stock, note="Jurnal ochilishidagi qoldiq")
+        for book_id, stock in Book.objects.using(using).exclude(stock=0).values_list('id', 'stock').iterator()
+    ]
+    StockMovement.objects.using(using).bulk_create(movements, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jigar_bookstore', '0010_partition_orders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('receipt', 'Kirim'), ('sale', 'Sotuv'), ('cancellation', 'Bekor qilingan sotuv'), ('adjustment', 'Tuzatish')], max_length=20, verbose_name='Turi')),
+                ('quantity', models.IntegerField(verbose_name='Miqdor (+ kirim, − chiqim)')),
+                ('note', models.CharField(blank=True, max_length=200, verbose_name='Izoh')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Vaqt')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='jigar_bookstore.book', verbose_name='Kitob')),
+                ('order', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='jigar_bookstore.order', verbose_name='Buyurtma')),
+            ],
+            options={
+                'verbose_name': 'Ombor harakati',
+                'verbose_name_plural': 'Ombor harakatlari',
+                'indexes': [models.Index(fields=['book', 'created_at'], name='stock_movement_book_time_idx'), models.Index(fields=['created_at'], name='stock_movement_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('taken_at', models.DateTimeField(verbose_name='Vaqt')),
+                ('stock', models.IntegerField(verbose_name='Qoldiq')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='jigar_bookstore.book', verbose_name='Kitob')),
+            ],
+            options={
+                'verbose_name': 'Ombor qoldig‘i nuqtasi',
+                'verbose_name_plural': 'Ombor qoldig‘i nuqtalari',
+                'indexes': [models.Index(fields=['book', '-taken_at'], name='stock_snapshot_book_time_idx'), models.Index(fields=['taken_at'], name='stock_snapshot_time_idx')],
+                'constraints': [models.UniqueConstraint(fields=('book', 'taken_at'), name='unique_stock_snapshot')],
+            },
+        ),
+        migrations.RunPython(open_ledger, migrations.RunPython.noop),
+    ]
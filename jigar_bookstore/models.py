@@ -1,11 +1,14 @@
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
 from django.contrib.auth.models import AbstractUser
-from django.db.models import Avg, Sum, F
+from django.core.exceptions import ValidationError
+from django.db.models import Exists, OuterRef, Sum, F, Value
+from django.db.models.functions import Concat, Substr
 from django.utils.text import slugify
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 import uuid
 from django.core.validators import RegexValidator,MaxValueValidator,MinValueValidator
+from .order_totals import discard_order_total, schedule_order_total
 
 
 
@@ -35,6 +38,15 @@ class User(AbstractUser, BaseModel):
     def __str__(self):
         return self.email
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Xabarnoma auditoriyalari uchun bazadagi holat (signals.py)
+        instance._audience_state = {
+            field: getattr(instance, field) for field in ('email', 'is_seller', 'is_staff') if field in field_names
+        }
+        return instance
+
     class Meta:
         verbose_name = "Foydalanuvchi"
         verbose_name_plural = "Foydalanuvchilar"
@@ -46,11 +58,63 @@ class User(AbstractUser, BaseModel):
 class Category(BaseModel):
     name = models.CharField(max_length=100, unique=True, verbose_name="Kategoriya nomi")
     slug = models.SlugField(unique=True, blank=True, verbose_name="Slug (URL)")
+    parent = models.ForeignKey(
+        'self', on_delete=models.PROTECT, null=True, blank=True,
+        related_name="children", verbose_name="Ota kategoriya"
+    )
+    # 🔹 Materiallashtirilgan yo‘l: "<ildiz id>/<bola id>/.../<o‘z id>/" — daraxt ostini
+    # bitta indeksli prefiks so‘rovi (`path__startswith`) bilan olish uchun
+    path = models.CharField(max_length=255, unique=True, editable=False, verbose_name="Daraxtdagi yo‘l")
+    depth = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name="Chuqurlik")
+    # Shu kategoriya va uning barcha ichki kategoriyalaridagi kitoblar soni
+    books_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Kitoblar soni")
+
+    MAX_DEPTH = 7  # 255 / len("<uuid hex>/")
+
+    @staticmethod
+    def ancestor_paths(path):
+        """Yo‘ldagi barcha ajdodlar (o‘zi ham) yo‘llari ro‘yxati"""
+        segments = path.strip('/').split('/')
+        return ['/'.join(segments[:i]) + '/' for i in range(1, len(segments) + 1)]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        old = None
+        if not self._state.adding:
+            old = Category.objects.filter(pk=self.pk).values('path', 'parent_id', 'depth', 'books_count').first()
+        if old is None or old['parent_id'] != self.parent_id or not self.path:
+            parent_path = self.parent.path if self.parent_id else ''
+            if old and old['path'] and parent_path.startswith(old['path']):
+                raise ValidationError({'parent': "Kategoriyani o‘zining ichki kategoriyasiga ko‘chirib bo‘lmaydi"})
+            self.path = parent_path + self.id.hex + '/'
+            self.depth = self.path.count('/') - 1
+            if self.depth >= self.MAX_DEPTH:
+                raise ValidationError({'parent': f"Daraxt chuqurligi {self.MAX_DEPTH} dan oshmasligi kerak"})
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old and old['path'] and old['path'] != self.path:
+                self._move_subtree(old)
+
+    def _move_subtree(self, old):
+        """Ota o‘zgarganda ichki kategoriyalar yo‘lini va ajdodlar hisobini ko‘chiradi"""
+        old_path = old['path']
+        Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+            path=Concat(Value(self.path), Substr('path', len(old_path) + 1)),
+            depth=F('depth') + (self.depth - old['depth']),
+        )
+        if old['books_count']:
+            Category.objects.filter(path__in=self.ancestor_paths(old_path)[:-1]).update(
+                books_count=F('books_count') - old['books_count']
+            )
+            Category.objects.filter(path__in=self.ancestor_paths(self.path)[:-1]).update(
+                books_count=F('books_count') + old['books_count']
+            )
+
+    def get_descendants(self, include_self=True):
+        """Daraxt osti — bitta prefiks so‘rovi"""
+        qs = Category.objects.filter(path__startswith=self.path)
+        return qs if include_self else qs.exclude(pk=self.pk)
 
     def __str__(self):
         return self.name
@@ -87,21 +151,114 @@ class Book(BaseModel):
     price = models.DecimalField(max_digits=8, decimal_places=2, verbose_name="Narx (so‘mda)")
     stock = models.PositiveIntegerField(default=0, verbose_name="Ombordagi soni")
     cover_image = models.ImageField(upload_to='book_covers/', blank=True, verbose_name="Muqova rasmi")
+    # 🔹 Fon jarayonida yaratilgan WebP eskizlar: {'source': ..., 'sizes': {'160': {...}}}
+    cover_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Muqova eskizlari")
     published_date = models.DateField(null=True, blank=True, verbose_name="Nashr sanasi")
     isbn = models.CharField(
         max_length=13, unique=True,
         validators=[RegexValidator(r'^\d{13}$', 'ISBN 13 xonali raqam bo‘lishi kerak')]
     )
 
+    # 🔹 Baholar gistogrammasi (1–5 yulduz) — Review signallari orqali yangilanadi
+    rating_count_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_count_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_count_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_count_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_count_5 = models.PositiveIntegerField(default=0, editable=False)
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Bazadan o‘qilgan qoldiq — save() farqni jurnalga yozadi (qarang: inventory.py)
+        if 'stock' in field_names:
+            instance._stock_state = instance.stock
+        # Muqova va eskizlar — fon jarayoni `cover_variants` ni update() bilan yozadi (covers.py)
+        if 'cover_image' in field_names:
+            instance._cover_state = instance.cover_image.name
+        if 'cover_variants' in field_names:
+            instance._cover_variants_state = instance.cover_variants
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        `stock` ustidan yozilmaydi: o‘qilgan qiymatdan farqi `adjustment` harakati
+        sifatida jurnalga yoziladi va F() bilan qo‘shiladi — parallel sotuvlar yo‘qolmaydi.
+        Kamaytirish qoldiqdan oshsa — Django `ValidationError` (admin, shell, buyruqlar).
+        O‘zgartirilmagan `cover_variants` ham yozilmaydi — o‘qilgandan keyin tayyor
+        bo‘lgan eskizlar eski `{}` bilan almashtirilmasligi uchun.
+        """
+        from .inventory import InsufficientStock, record_movement
+
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        skip, delta = set(), 0
+        loaded = getattr(self, '_stock_state', None)
+        if loaded is not None:
+            skip.add('stock')
+            if update_fields is None or 'stock' in update_fields:
+                delta = self.stock - loaded
+        if hasattr(self, '_cover_variants_state') and self.cover_variants == self._cover_variants_state:
+            skip.add('cover_variants')
+        if update_fields is None and skip:
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+            ]
+        if update_fields is not None:
+            kwargs['update_fields'] = [name for name in update_fields if name not in skip]
+        if not delta:
+            return super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Book, instance=self)):
+            super().save(*args, **kwargs)
+            try:
+                record_movement(self.pk, StockMovement.ADJUSTMENT, delta, note="Kitob tahrirlandi")
+            except InsufficientStock as exc:
+                raise ValidationError({'stock': [str(message) for message in exc.detail['stock']]})
+            self.stock = self._stock_state = Book.objects.filter(pk=self.pk).values_list('stock', flat=True).get()
+
+    def clean(self):
+        """Admin formasi: qoldiqni bazadagidan ko‘proq kamaytirib bo‘lmaydi (save’dagi tekshiruv — poyga uchun)"""
+        from .inventory import shortage_message
+
+        super().clean()
+        loaded = getattr(self, '_stock_state', None)
+        if self._state.adding or loaded is None or self.stock is None or self.stock >= loaded:
+            return
+        available = Book.objects.filter(pk=self.pk).values_list('stock', flat=True).first() or 0
+        if available + self.stock - loaded < 0:
+            raise ValidationError({'stock': shortage_message(self.pk, loaded - self.stock, available)})
+
+    @property
+    def rating_histogram(self):
+        """{yulduz: sharhlar soni} ko‘rinishidagi gistogramma"""
+        return {star: getattr(self, f'rating_count_{star}') for star in range(1, 6)}
+
+    @property
+    def reviews_count(self):
+        return sum(self.rating_histogram.values())
+
     def get_average_rating(self):
-        """Baholarning o‘rtacha qiymatini hisoblaydi (optimallashtirilgan)"""
-        avg = self.reviews.aggregate(avg=Avg('rating'))['avg']
-        return round(avg or 0, 1)
+        """Baholarning o‘rtacha qiymatini saqlangan gistogrammadan hisoblaydi (so‘rovsiz)"""
+        histogram = self.rating_histogram
+        total = sum(histogram.values())
+        if not total:
+            return 0
+        return round(sum(star * count for star, count in histogram.items()) / total, 1)
 
     class Meta:
+        indexes = [
+            # 🔹 BookFilterSet: narx oralig‘i, omborda borligi, nashr sanasi oralig‘i
+            models.Index(fields=['price'], name='book_price_idx'),
+            models.Index(fields=['stock'], name='book_stock_idx'),
+            models.Index(fields=['published_date'], name='book_published_idx'),
+            # 🔹 O‘xshash kitoblar indeksini inkremental yangilash (similarity.update_index)
+            models.Index(fields=['updated_at'], name='book_updated_idx'),
+        ]
         verbose_name = "Kitob"
         verbose_name_plural = "Kitoblar"
 
@@ -118,17 +275,56 @@ class Review(BaseModel):
     comment = models.TextField(blank=True, verbose_name="Izoh")
     likes = models.ManyToManyField(User, related_name="review_likes", blank=True, verbose_name="Layklar")
     dislikes = models.ManyToManyField(User, related_name="review_dislikes", blank=True, verbose_name="Dislayklar")
+    likes_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Layklar soni")
+    dislikes_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Dislayklar soni")
 
-
+    REACTIONS = ('like', 'dislike')
 
     class Meta:
         unique_together = ('user', 'book')
+        indexes = [
+            # 🔹 Kitob bo‘yicha "eng foydali" sharhlar
+            models.Index(fields=['book', '-likes_count'], name='review_book_likes_idx'),
+        ]
         verbose_name = "Sharh"
         verbose_name_plural = "Sharhlar"
 
     def __str__(self):
         return f"{self.user.email} → {self.book.title}"
 
+    @classmethod
+    def with_user_reactions(cls, queryset, user):
+        """`user_liked` / `user_disliked` — joriy foydalanuvchi reaksiyasi, sharhlar so‘rovining o‘zida (EXISTS)"""
+        if not user.is_authenticated:
+            return queryset
+        return queryset.annotate(**{
+            f'user_{name}': Exists(getattr(cls, field).through.objects.filter(review_id=OuterRef('pk'), user_id=user.pk))
+            for field, name in (('likes', 'liked'), ('dislikes', 'disliked'))
+        })
+
+    def set_reaction(self, user, reaction):
+        """
+        Foydalanuvchi reaksiyasini o‘rnatadi: 'like', 'dislike' yoki None (tozalash).
+        Layk va dislayk bir-birini istisno qiladi; takroriy chaqiruv hech narsani o‘zgartirmaydi.
+        Hisoblagichlar M2M qatori bilan bitta tranzaksiyada F() orqali yangilanadi.
+        """
+        with transaction.atomic():
+            # Bir sharhga parallel reaksiyalarni ketma-ket bajarish uchun qatorni qulflaymiz
+            Review.objects.select_for_update().filter(pk=self.pk).values_list('pk', flat=True).get()
+            counters = {}
+            for field, name in (('likes', 'like'), ('dislikes', 'dislike')):
+                through = getattr(Review, field).through
+                rows = through.objects.filter(review_id=self.pk, user_id=user.pk)
+                if reaction == name:
+                    if not rows.exists():
+                        through.objects.create(review_id=self.pk, user_id=user.pk)
+                        counters[f'{field}_count'] = F(f'{field}_count') + 1
+                elif rows.delete()[0]:
+                    counters[f'{field}_count'] = F(f'{field}_count') - 1
+            if counters:
+                Review.objects.filter(pk=self.pk).update(**counters)
+        self.refresh_from_db(fields=['likes_count', 'dislikes_count'])
+
 
 # ==========================
 # 🔹 Order
@@ -147,26 +343,78 @@ class Order(BaseModel):
         default='pending',
         verbose_name="Holati"
     )
+    # To‘langan, lekin omborda yetmagan (oversell) — admin ko‘rib chiqadi (inventory.py)
+    stock_shortage = models.BooleanField(default=False, verbose_name="Omborda yetmadi")
 
     def __str__(self):
         return f"Buyurtma #{self.id} - {self.user.email}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Foydalanuvchi xulosasi uchun bazadagi holat — qo‘shimcha so‘rovsiz
+        if 'status' in field_names and 'total_amount' in field_names:
+            instance._summary_state = (instance.status, instance.total_amount)
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        `paid` holatiga o‘tish (yoki undan chiqish) ombor jurnaliga sotuv/qaytarish
+        sifatida yoziladi — buyurtma bilan bitta tranzaksiyada (qarang: inventory.py).
+        Mahsulotlar keyin qo‘shiladigan bo‘lsa, buyurtma `pending` yaratilib, keyin
+        `paid` ga o‘tkaziladi (OrderSerializer.create).
+        """
+        from .inventory import record_order_status
+
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding:
+            if self.status != 'paid':
+                return super().save(*args, **kwargs)
+            # Darhol `paid` bilan yaratilgan buyurtma — sotuv ham shu tranzaksiyada
+            with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Order, instance=self)):
+                super().save(*args, **kwargs)
+                record_order_status(self, None)
+            return
+        if update_fields is not None and 'status' not in update_fields:
+            return super().save(*args, **kwargs)
+        previous = getattr(self, '_summary_state', (None,))[0]
+        if previous is not None and (previous == 'paid') == (self.status == 'paid'):
+            return super().save(*args, **kwargs)
+        if update_fields is not None and 'updated_at' not in update_fields:
+            # `paid` ga o‘tish/chiqish vaqti — tavsiyalar shu bo‘yicha inkremental yangilanadi (recommendations.py)
+            kwargs['update_fields'] = [*update_fields, 'updated_at']
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Order, instance=self)):
+            # Parallel to‘lovlar bitta buyurtmani ikki marta sotmasligi uchun — qulf ostidagi holat
+            previous = Order.objects.select_for_update().filter(pk=self.pk).values_list('status', flat=True).first()
+            super().save(*args, **kwargs)
+            record_order_status(self, previous)
+
     def calculate_total(self):
         """Buyurtma umumiy summasini hisoblaydi"""
         total = self.items.aggregate(total=Sum(F('price') * F('quantity')))['total'] or 0
         self.total_amount = total
         self.save(update_fields=['total_amount'])
+        discard_order_total(self.pk)
 
     class Meta:
         verbose_name = "Buyurtma"
         verbose_name_plural = "Buyurtmalar"
+        indexes = [
+            # Foydalanuvchining so‘nggi buyurtmalari (xulosa sahifasi)
+            models.Index(fields=['user', '-created_at'], name='order_user_recent_idx'),
+            # Oxirgi ishga tushirishdan keyin o‘zgarganlar (recommendations.update_incremental)
+            models.Index(fields=['updated_at'], name='order_updated_idx'),
+        ]
 
 
 # ==========================
 # 🔹 Order Item
 # ==========================
 class OrderItem(BaseModel):
-    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items", verbose_name="Buyurtma")
+    # Order jadvali PostgreSQL’da bo‘laklangan — unga tashqi kalit qo‘yib bo‘lmaydi (partitioning.py)
+    order = models.ForeignKey(
+        Order, on_delete=models.CASCADE, related_name="items", db_constraint=False, verbose_name="Buyurtma"
+    )
     book = models.ForeignKey(Book, on_delete=models.SET_NULL, null=True, verbose_name="Kitob")
     quantity = models.PositiveIntegerField(default=1, verbose_name="Miqdor")
     price = models.DecimalField(max_digits=8, decimal_places=2, verbose_name="Narx (so‘mda)")
@@ -187,7 +435,9 @@ class OrderItem(BaseModel):
 # 🔹 Payment
 # ==========================
 class Payment(BaseModel):
-    order = models.OneToOneField(Order, on_delete=models.CASCADE, related_name="payment", verbose_name="Buyurtma")
+    order = models.OneToOneField(
+        Order, on_delete=models.CASCADE, related_name="payment", db_constraint=False, verbose_name="Buyurtma"
+    )
     payment_method = models.CharField(max_length=50, verbose_name="To‘lov usuli")
     transaction_id = models.CharField(max_length=100, unique=True, verbose_name="Tranzaksiya ID")
     paid_at = models.DateTimeField(auto_now_add=True, verbose_name="To‘langan vaqt")
@@ -205,19 +455,358 @@ class Payment(BaseModel):
     def __str__(self):
         return f"To‘lov {self.transaction_id}"
 
+    def save(self, *args, **kwargs):
+        """
+        Bo‘laklangan jadvalda `UNIQUE(order_id)` emas, `(order_id, paid_at)` (partitioning.py):
+        yangi to‘lov buyurtma qatorini qulflab, shu buyurtmaga to‘lov yo‘qligini tekshiradi.
+        """
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Payment, instance=self)):
+            list(Order.objects.select_for_update().filter(pk=self.order_id).values_list('pk'))
+            if Payment.objects.filter(order_id=self.order_id).exists():
+                raise IntegrityError(f"Buyurtma {self.order_id} uchun to‘lov allaqachon mavjud")
+            return super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "To‘lov"
         verbose_name_plural = "To‘lovlar"
 
 
+# ==========================
+# 🔹 Cart (savat)
+# ==========================
+class Cart(BaseModel):
+    """
+    Server tomonidagi savat: foydalanuvchida bitta ochiq savat. Rasmiylashtirilgach
+    `order` bog‘lanadi va savat yopiladi — takroriy `checkout` shu buyurtmani qaytaradi (cart.py).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="carts", verbose_name="Foydalanuvchi")
+    # Order bo‘laklangan jadval (partitioning.py) — tashqi kalit cheklovisiz; buyurtma
+    # o‘chirilsa/arxivlansa ham savat yopiq qoladi (qayta ochilsa ikkinchi ochiq savat bo‘lardi)
+    order = models.OneToOneField(
+        Order, on_delete=models.DO_NOTHING, null=True, blank=True, related_name="cart",
+        db_constraint=False, verbose_name="Buyurtma"
+    )
+
+    def __str__(self):
+        return f"Savat {self.id} — {self.user}"
+
+    class Meta:
+        verbose_name = "Savat"
+        verbose_name_plural = "Savatlar"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user'], condition=models.Q(order__isnull=True), name='unique_open_cart'
+            ),
+        ]
+
+
+class CartItem(models.Model):
+    """Savatdagi qator — ixcham: narx saqlanmaydi, rasmiylashtirishda kitobdan olinadi"""
+    id = models.BigAutoField(primary_key=True)
+    cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name="items", verbose_name="Savat")
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="+", verbose_name="Kitob")
+    quantity = models.PositiveIntegerField(default=1, verbose_name="Miqdor")
+
+    def __str__(self):
+        return f"{self.book_id} x {self.quantity}"
+
+    class Meta:
+        verbose_name = "Savat mahsuloti"
+        verbose_name_plural = "Savat mahsulotlari"
+        constraints = [
+            models.UniqueConstraint(fields=['cart', 'book'], name='unique_cart_book'),
+        ]
+
+
+# ==========================
+# 🔹 Stock Movement (ombor jurnali)
+# ==========================
+class StockMovement(models.Model):
+    """
+    Ombordagi son o‘zgarishi — faqat qo‘shiladi, tahrirlanmaydi.
+    `Book.stock` har doim kitob harakatlari `quantity` yig‘indisiga teng (inventory.py).
+    """
+    RECEIPT, SALE, CANCELLATION, ADJUSTMENT = 'receipt', 'sale', 'cancellation', 'adjustment'
+    KINDS = [
+        (RECEIPT, 'Kirim'),
+        (SALE, 'Sotuv'),
+        (CANCELLATION, 'Bekor qilingan sotuv'),
+        (ADJUSTMENT, 'Tuzatish'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="stock_movements", verbose_name="Kitob")
+    kind = models.CharField(max_length=20, choices=KINDS, verbose_name="Turi")
+    quantity = models.IntegerField(verbose_name="Miqdor (+ kirim, − chiqim)")
+    # Order bo‘laklangan jadval (partitioning.py) — tashqi kalit cheklovisiz; arxivlangan buyurtma ham qoladi
+    order = models.ForeignKey(
+        Order, on_delete=models.DO_NOTHING, null=True, blank=True, related_name="+",
+        db_constraint=False, verbose_name="Buyurtma"
+    )
+    note = models.CharField(max_length=200, blank=True, verbose_name="Izoh")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Vaqt")
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.book_id} {self.quantity:+d}"
+
+    class Meta:
+        verbose_name = "Ombor harakati"
+        verbose_name_plural = "Ombor harakatlari"
+        indexes = [
+            # stock_at(): oxirgi nuqtadan keyingi harakatlar yig‘indisi
+            models.Index(fields=['book', 'created_at'], name='stock_movement_book_time_idx'),
+            models.Index(fields=['created_at'], name='stock_movement_time_idx'),
+        ]
+
+
+# ==========================
+# 🔹 Stock Snapshot
+# ==========================
+class StockSnapshot(models.Model):
+    """
+    `taken_at` dan oldingi (`<`) barcha harakatlar yig‘indisi — `snapshot_stock`
+    buyrug‘i faqat oxirgi nuqtadan beri harakati bo‘lgan kitoblar uchun yozadi.
+    """
+    id = models.BigAutoField(primary_key=True)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="stock_snapshots", verbose_name="Kitob")
+    taken_at = models.DateTimeField(verbose_name="Vaqt")
+    stock = models.IntegerField(verbose_name="Qoldiq")
+
+    def __str__(self):
+        return f"{self.book_id} @ {self.taken_at:%Y-%m-%d %H:%M}: {self.stock}"
+
+    class Meta:
+        verbose_name = "Ombor qoldig‘i nuqtasi"
+        verbose_name_plural = "Ombor qoldig‘i nuqtalari"
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'taken_at'], name='unique_stock_snapshot'),
+        ]
+        indexes = [
+            models.Index(fields=['book', '-taken_at'], name='stock_snapshot_book_time_idx'),
+            models.Index(fields=['taken_at'], name='stock_snapshot_time_idx'),
+        ]
+
+
+# ==========================
+# 🔹 Book Neighbors ("buni ham sotib olishdi")
+# ==========================
+class BookNeighbor(models.Model):
+    """
+    Oflayn hisoblangan qo‘shni kitoblar (qarang: recommendations.py).
+    Kitob sahifasi ularni `(book, -score)` indeksi bo‘yicha bitta so‘rov bilan o‘qiydi.
+    """
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="neighbors", verbose_name="Kitob")
+    neighbor = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="+", verbose_name="Qo‘shni kitob")
+    score = models.FloatField(verbose_name="O‘xshashlik")
+    co_purchases = models.PositiveIntegerField(default=0, verbose_name="Birga sotib olingan")
+
+    def __str__(self):
+        return f"{self.book} → {self.neighbor} ({self.score:.3f})"
+
+    class Meta:
+        verbose_name = "Qo‘shni kitob"
+        verbose_name_plural = "Qo‘shni kitoblar"
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'neighbor'], name='unique_book_neighbor'),
+        ]
+        indexes = [
+            models.Index(fields=['book', '-score'], name='book_neighbor_score_idx'),
+        ]
+
+
+# ==========================
+# 🔹 User Order Summary
+# ==========================
+class UserOrderSummary(models.Model):
+    """
+    Foydalanuvchi buyurtmalari xulosasi (hisob sahifasi uchun).
+    Order saqlanganda/o‘chirilganda F() orqali o‘zgarish (delta) qo‘shiladi —
+    buyurtmalar tarixi uzunligidan qat’i nazar bitta qatordan o‘qiladi.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="order_summary", verbose_name="Foydalanuvchi"
+    )
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Jami to‘langan")
+    orders_count = models.PositiveIntegerField(default=0, verbose_name="Buyurtmalar soni")
+    pending_count = models.PositiveIntegerField(default=0, verbose_name="Kutilayotganlar")
+    paid_count = models.PositiveIntegerField(default=0, verbose_name="To‘langanlar")
+    cancelled_count = models.PositiveIntegerField(default=0, verbose_name="Bekor qilinganlar")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    STATUS_FIELDS = {'pending': 'pending_count', 'paid': 'paid_count', 'cancelled': 'cancelled_count'}
+
+    def __str__(self):
+        return f"{self.user} — {self.orders_count} ta buyurtma"
+
+    @classmethod
+    def contribution(cls, status, total_amount):
+        """Bitta buyurtmaning xulosadagi ulushi"""
+        values = {'orders_count': 1, 'total_spent': total_amount if status == 'paid' else 0}
+        if status in cls.STATUS_FIELDS:
+            values[cls.STATUS_FIELDS[status]] = 1
+        return values
+
+    @classmethod
+    def apply_delta(cls, user_id, old=None, new=None, create=True):
+        """Eski ulushni ayirib, yangisini qo‘shadi (ikkalasi ham `(status, total)` yoki None)"""
+        delta = {}
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            for field, value in cls.contribution(*state).items():
+                delta[field] = delta.get(field, 0) + sign * value
+        delta = {field: value for field, value in delta.items() if value}
+        if not delta:
+            return
+        updates = {field: F(field) + value for field, value in delta.items()}
+        if not cls.objects.filter(user_id=user_id).update(**updates) and create:
+            cls.objects.get_or_create(user_id=user_id)
+            cls.objects.filter(user_id=user_id).update(**updates)
+
+    class Meta:
+        verbose_name = "Buyurtmalar xulosasi"
+        verbose_name_plural = "Buyurtmalar xulosalari"
+
+
 # ==========================
 # 🔹 SIGNALS
 # ==========================
 
 @receiver(post_save, sender=OrderItem)
 def update_order_total(sender, instance, **kwargs):
-    """Har safar buyurtma elementi o‘zgarsa — umumiy summani qayta hisoblaydi"""
-    instance.order.calculate_total()
+    """
+    Buyurtma elementi o‘zgarsa — summa commit paytida qayta hisoblanadi
+    (bir tranzaksiyadagi barcha elementlar uchun bir marta, qarang: order_totals.py)
+    """
+    schedule_order_total(instance.order_id)
+
+
+def _bump_rating_histogram(book_id, rating, delta):
+    """Kitob gistogrammasidagi bitta ustunni F() orqali o‘zgartiradi"""
+    if book_id and rating in range(1, 6):
+        field = f'rating_count_{rating}'
+        Book.objects.filter(pk=book_id).update(**{field: F(field) + delta})
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_rating(sender, instance, **kwargs):
+    """Sharh tahrirlanishidan oldingi kitob va bahoni eslab qoladi"""
+    instance._previous_rating = None
+    if not instance._state.adding:
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk).values_list('book_id', 'rating').first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_histogram_on_save(sender, instance, created, **kwargs):
+    """Sharh yaratilsa yoki bahosi o‘zgarsa — gistogrammani yangilaydi"""
+    previous = None if created else getattr(instance, '_previous_rating', None)
+    current = (instance.book_id, instance.rating)
+    if previous == current:
+        return
+    if previous:
+        _bump_rating_histogram(*previous, -1)
+    _bump_rating_histogram(*current, 1)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_histogram_on_delete(sender, instance, **kwargs):
+    """Sharh o‘chirilsa — gistogrammadan ayiradi"""
+    _bump_rating_histogram(instance.book_id, instance.rating, -1)
+
+
+def _bump_category_books(category_id, delta):
+    """Kategoriya va uning barcha ajdodlaridagi kitoblar sonini F() bilan o‘zgartiradi"""
+    if not category_id:
+        return
+    path = Category.objects.filter(pk=category_id).values_list('path', flat=True).first()
+    if path:
+        Category.objects.filter(path__in=Category.ancestor_paths(path)).update(
+            books_count=F('books_count') + delta
+        )
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_category(sender, instance, **kwargs):
+    """Kitob tahrirlanishidan oldingi kategoriyani eslab qoladi"""
+    instance._previous_category_id = None
+    if not instance._state.adding:
+        instance._previous_category_id = (
+            Book.objects.filter(pk=instance.pk).values_list('category_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Book)
+def update_category_books_count(sender, instance, created, **kwargs):
+    """Kitob yaratilsa yoki kategoriyasi o‘zgarsa — daraxtdagi hisoblagichlarni yangilaydi"""
+    previous = None if created else getattr(instance, '_previous_category_id', None)
+    if previous == instance.category_id:
+        return
+    _bump_category_books(previous, -1)
+    _bump_category_books(instance.category_id, 1)
+
+
+@receiver(post_save, sender=Book)
+def record_initial_stock(sender, instance, created, **kwargs):
+    """Yangi kitobning boshlang‘ich soni — jurnalda birinchi kirim"""
+    if created:
+        instance._stock_state = instance.stock
+        if instance.stock:
+            StockMovement.objects.create(
+                book=instance, kind=StockMovement.RECEIPT, quantity=instance.stock, note="Boshlang‘ich soni"
+            )
+
+
+@receiver(post_delete, sender=Book)
+def decrement_category_books_count(sender, instance, **kwargs):
+    _bump_category_books(instance.category_id, -1)
+
+
+@receiver(post_delete, sender=Category)
+def detach_category_books(sender, instance, **kwargs):
+    """O‘chirilgan kategoriyaning kitoblari (SET_NULL) ajdodlar hisobidan chiqariladi"""
+    if instance.books_count and instance.path:
+        Category.objects.filter(path__in=Category.ancestor_paths(instance.path)[:-1]).update(
+            books_count=F('books_count') - instance.books_count
+        )
+
+
+@receiver(post_save, sender=Order)
+def update_user_order_summary(sender, instance, created, **kwargs):
+    """Buyurtma holati yoki summasi o‘zgarsa — foydalanuvchi xulosasiga delta qo‘shadi"""
+    new = (instance.status, instance.total_amount)
+    if created:
+        old = None
+    elif hasattr(instance, '_summary_state'):
+        old = instance._summary_state
+    else:
+        # Holat noma’lum (masalan, .only() bilan yuklangan) — eski qiymatni hisoblab bo‘lmaydi,
+        # xulosani shu foydalanuvchi uchun qaytadan yig‘amiz
+        rebuild_user_order_summary(instance.user_id)
+        instance._summary_state = new
+        return
+    if old != new:
+        UserOrderSummary.apply_delta(instance.user_id, old, new)
+    instance._summary_state = new
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_from_summary(sender, instance, **kwargs):
+    state = getattr(instance, '_summary_state', (instance.status, instance.total_amount))
+    # Foydalanuvchi o‘chirilayotganda xulosa qatori allaqachon yo‘q bo‘lishi mumkin — yangisini yaratmaymiz
+    UserOrderSummary.apply_delta(instance.user_id, old=state, create=False)
+
+
+def rebuild_user_order_summary(user_id):
+    """Foydalanuvchi xulosasini buyurtmalardan to‘liq qayta hisoblaydi"""
+    values = {'total_spent': 0, 'orders_count': 0, 'pending_count': 0, 'paid_count': 0, 'cancelled_count': 0}
+    for status, total_amount in Order.objects.filter(user_id=user_id).values_list('status', 'total_amount'):
+        for field, value in UserOrderSummary.contribution(status, total_amount).items():
+            values[field] += value
+    UserOrderSummary.objects.update_or_create(user_id=user_id, defaults=values)
 
 
 @receiver(post_save, sender=Payment)
@@ -0,0 +1,45 @@
+"""
+📬 Xabarnoma qabul qiluvchilari
+-------------------------------
+Har bir "auditoriya" — foydalanuvchilar uchun filtr (`Q`). Qabul qiluvchilar
+email ro‘yxati keshlanadi: kesh bo‘sh bo‘lsa bitta so‘rov, keyin bazaga
+murojaat yo‘q. `User` ning auditoriyaga ta’sir qiluvchi maydonlari
+(`AUDIENCE_FIELDS`) o‘zgarsa yoki foydalanuvchi o‘chirilsa — barcha
+auditoriyalar versiya orqali eskiradi (qarang: signals.py).
+
+Yangi auditoriya qo‘shish uchun `AUDIENCES` ga yozuv qo‘shish kifoya
+(filtrdagi maydonlar `AUDIENCE_FIELDS` da ham bo‘lishi kerak).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .caching import bump_version, versioned_key
+
+RECIPIENTS_NAMESPACE = 'notification-recipients'
+
+AUDIENCES = {
+    # Yangi kitob haqida: sotuvchilar va adminlar
+    'catalog-staff': Q(is_seller=True) | Q(is_staff=True),
+}
+
+# Auditoriya tarkibini o‘zgartira oladigan User maydonlari
+AUDIENCE_FIELDS = ('email', 'is_seller', 'is_staff')
+
+
+def get_recipients(audience):
+    """Auditoriyadagi foydalanuvchilarning email manzillari (takrorlanmas, bo‘shlarsiz)"""
+    from .models import User
+
+    key = versioned_key(RECIPIENTS_NAMESPACE, audience)
+    recipients = cache.get(key)
+    if recipients is None:
+        emails = User.objects.filter(AUDIENCES[audience]).exclude(email='').values_list('email', flat=True)
+        recipients = sorted(set(emails))
+        cache.set(key, recipients, settings.NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT)
+    return recipients
+
+
+def invalidate_recipients():
+    bump_version(RECIPIENTS_NAMESPACE)
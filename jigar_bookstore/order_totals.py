@@ -0,0 +1,99 @@
+"""
+🧮 Buyurtma summalarini kechiktirib qayta hisoblash
+---------------------------------------------------
+`OrderItem` saqlanganda summa darhol hisoblanmaydi: buyurtma ID’si joriy
+tranzaksiyaning "navbati"ga qo‘shiladi va commit paytida barcha tegilgan
+buyurtmalar bitta guruhlangan UPDATE bilan qayta hisoblanadi.
+
+Tranzaksiyadan tashqarida (autocommit) esa avvalgidek darhol hisoblanadi.
+Natija `Order.calculate_total()` bilan bir xil; summasi o‘zgargan to‘langan
+buyurtmalar uchun `UserOrderSummary` ham yangilanadi.
+"""
+
+import weakref
+
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+# Ulanish -> joriy tranzaksiya navbatiga zaif havola (har bir oqim/ulanish uchun alohida)
+_pending = weakref.WeakKeyDictionary()
+
+
+class _PendingTotals:
+    """
+    Bitta tranzaksiyaning navbati — on_commit’dagi yagona callback ham shu.
+    Unga kuchli havola faqat on_commit ro‘yxatida: tranzaksiya (yoki callback
+    qo‘yilgan savepoint) bekor qilinsa, navbat ham yo‘qoladi va keyingi
+    tranzaksiya yangisini ochadi.
+    """
+
+    def __init__(self, connection, using):
+        self.connection, self.using = connection, using
+        self.order_ids = set()
+
+    def __call__(self):
+        if _current(self.connection) is self:
+            del _pending[self.connection]
+        recompute_order_totals(self.order_ids, using=self.using)
+
+
+def _current(connection):
+    ref = _pending.get(connection)
+    return ref() if ref is not None else None
+
+
+def _item_totals_expression():
+    from .models import OrderItem
+
+    totals = (
+        OrderItem.objects.filter(order=OuterRef('pk')).order_by().values('order')
+        .annotate(total=Sum(F('price') * F('quantity'))).values('total')
+    )
+    return Coalesce(Subquery(totals), Value(0), output_field=DecimalField(max_digits=10, decimal_places=2))
+
+
+def recompute_order_totals(order_ids, using=None):
+    """
+    Berilgan buyurtmalar summasini bitta SELECT va bitta UPDATE bilan qayta hisoblaydi.
+    Summasi o‘zgarmaganlar yozilmaydi.
+    """
+    from .models import Order, UserOrderSummary
+
+    order_ids = list(order_ids)
+    if not order_ids:
+        return
+    with transaction.atomic(using=using):
+        orders = Order.objects.using(using) if using else Order.objects
+        rows = list(
+            orders.select_for_update().filter(pk__in=order_ids).annotate(new_total=_item_totals_expression())
+            .values_list('pk', 'user_id', 'status', 'total_amount', 'new_total')
+        )
+        changed = [row for row in rows if row[3] != row[4]]
+        if not changed:
+            return
+        orders.filter(pk__in=[row[0] for row in changed]).update(total_amount=_item_totals_expression())
+        for _, user_id, order_status, old_total, new_total in changed:
+            if order_status == 'paid':
+                UserOrderSummary.apply_delta(user_id, (order_status, old_total), (order_status, new_total))
+
+
+def schedule_order_total(order_id, using=None):
+    """Buyurtma summasini commit paytida qayta hisoblash uchun navbatga qo‘yadi"""
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        recompute_order_totals([order_id], using=using)
+        return
+    pending = _current(connection)
+    if pending is None:
+        pending = _PendingTotals(connection, using)
+        transaction.on_commit(pending, using=using)
+        _pending[connection] = weakref.ref(pending)
+    pending.order_ids.add(order_id)
+
+
+def discard_order_total(order_id, using=None):
+    """Summa hozirgina hisoblangan bo‘lsa — navbatdan olib tashlaydi"""
+    pending = _current(transaction.get_connection(using))
+    if pending is not None:
+        pending.order_ids.discard(order_id)
@@ -0,0 +1,37 @@
+"""
+⚡ Tezkor JSON parser (orjson)
+-----------------------------
+`JSONParser` bilan bir xil natija: NaN/Infinity rad etiladi, xatolik
+`ParseError('JSON parse error - ...')`. orjson o‘qiy olmagan hujjat (masalan,
+64-bitdan katta son) oddiy `json` bilan qayta o‘qiladi.
+"""
+
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+from rest_framework.utils import json as drf_json
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = get_encoding(parser_context)
+        raw = stream.read() if stream is not None else b''
+        try:
+            content = raw if encoding.lower().replace('_', '-') in ('utf-8', 'utf8') else raw.decode(encoding)
+            return orjson.loads(content)
+        except (orjson.JSONDecodeError, UnicodeDecodeError, LookupError):
+            pass
+        try:
+            text = raw.decode(encoding) if isinstance(raw, bytes) else raw
+            parse_constant = drf_json.strict_constant if self.strict else None
+            return json.loads(text, parse_constant=parse_constant)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,255 @@
+"""
+🗂 Buyurtma jadvallarini oylik bo‘laklash (PostgreSQL)
+----------------------------------------------------
+`Order`, `OrderItem` (`created_at` bo‘yicha) va `Payment` (`paid_at` bo‘yicha)
+jadvallari oylik `RANGE` bo‘laklarga ajratiladi: `<jadval>_p2026_10` —
+`[2026-10-01, 2026-11-01)` UTC. Oraliqdan tashqaridagi qatorlar
+`<jadval>_default` bo‘lagiga tushadi — yangi oy bo‘lagi yaratilganda ular
+o‘sha bo‘lakka ko‘chiriladi.
+
+* Sana bo‘yicha filtrlangan so‘rovlar (`?created_after=`) faqat kerakli
+  bo‘laklarni o‘qiydi (partition pruning), indeks va VACUUM bo‘lak kattaligida.
+* `manage.py manage_partitions` — oldindagi oylar uchun bo‘laklar yaratadi
+  va eski bo‘laklarni ajratadi (DETACH) — ajratilgan jadval arxivlash yoki
+  o‘chirish uchun alohida qoladi.
+
+PostgreSQL cheklovlari: bo‘laklangan jadvaldagi PRIMARY KEY va UNIQUE kalitlar
+bo‘lak ustunini o‘z ichiga olishi kerak — `(id, created_at)`,
+`(transaction_id, paid_at)`, `(order_id, paid_at)`. Ya’ni `id` va
+`transaction_id` yagonaligi butun jadval bo‘yicha baza emas, Django (UUID va
+model validatsiyasi) darajasida ta’minlanadi; bitta buyurtmaga bitta to‘lov —
+`Payment.save` buyurtma qatorini qulflab tekshiradi. Bo‘laklangan `Order` ga tashqi
+kalit (FOREIGN KEY) qo‘yib bo‘lmaydi — `OrderItem.order` va `Payment.order`
+`db_constraint=False`; kaskad o‘chirish Django tomonidan bajariladi.
+"""
+
+import re
+from datetime import datetime, timezone
+
+from django.db import transaction
+
+# Jadval → bo‘lak ustuni. Tartib muhim emas: tashqi kalitlar ular orasida yo‘q
+PARTITIONED_TABLES = {
+    'jigar_bookstore_order': 'created_at',
+    'jigar_bookstore_orderitem': 'created_at',
+    'jigar_bookstore_payment': 'paid_at',
+}
+
+PARTITION_RE = re.compile(r'_p(\d{4})_(\d{2})$')
+
+
+# ==========================
+# 🔹 Oylar
+# ==========================
+def month_start(value):
+    """Sana/vaqt → shu oyning boshi (UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def partition_month(name):
+    """`<jadval>_p2026_10` → 2026-10-01 UTC; oylik bo‘lak bo‘lmasa — None"""
+    match = PARTITION_RE.search(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+def _literal(month):
+    return f"'{month:%Y-%m-%d} 00:00:00+00'"
+
+
+# ==========================
+# 🔹 Bo‘laklar
+# ==========================
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+    row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def _exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    return cursor.fetchone()[0]
+
+
+def list_partitions(cursor, table):
+    """Jadvalga biriktirilgan bo‘laklar nomlari (default bilan)"""
+    cursor.execute(
+        """
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname
+        """,
+        [table],
+    )
+    return [name for name, in cursor.fetchall()]
+
+
+def create_partition(cursor, quote, table, month):
+    """
+    Oy bo‘lagini yaratadi; mavjud bo‘lsa — False. Default bo‘lakda shu oyga
+    tegishli qatorlar bo‘lsa, ular yangi bo‘lakka ko‘chiriladi. Hammasi bitta
+    tranzaksiyada: xato bo‘lsa default bo‘lak ajratilgan holda qolmaydi.
+    """
+    with transaction.atomic(using=cursor.db.alias):
+        return _create_partition(cursor, quote, table, month)
+
+
+def _create_partition(cursor, quote, table, month):
+    name = partition_name(table, month)
+    if _exists(cursor, name):
+        return False
+    column = PARTITIONED_TABLES[table]
+    start, end = _literal(month), _literal(add_months(month, 1))
+    default = f'{table}_default'
+    bounds = f'FOR VALUES FROM ({start}) TO ({end})'
+    in_range = f'{quote(column)} >= {start} AND {quote(column)} < {end}'
+
+    cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {quote(default)} WHERE {in_range})')
+    if not cursor.fetchone()[0]:
+        cursor.execute(f'CREATE TABLE {quote(name)} PARTITION OF {quote(table)} {bounds}')
+        return True
+    cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(default)}')
+    cursor.execute(f'CREATE TABLE {quote(name)} PARTITION OF {quote(table)} {bounds}')
+    cursor.execute(f'INSERT INTO {quote(name)} SELECT * FROM {quote(default)} WHERE {in_range}')
+    cursor.execute(f'DELETE FROM {quote(default)} WHERE {in_range}')
+    cursor.execute(f'ALTER TABLE {quote(table)} ATTACH PARTITION {quote(default)} DEFAULT')
+    return True
+
+
+def detach_partition(cursor, quote, table, name, concurrently=False):
+    """
+    Bo‘lakni ajratadi — u oddiy jadval sifatida qoladi (arxivlash/o‘chirish uchun).
+    `concurrently` — faqat tranzaksiyadan tashqarida (PostgreSQL talabi).
+    """
+    if concurrently and cursor.db.in_atomic_block:
+        raise RuntimeError("DETACH ... CONCURRENTLY tranzaksiya ichida bajarilmaydi")
+    suffix = ' CONCURRENTLY' if concurrently else ''
+    cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}{suffix}')
+
+
+def ensure_partitions(cursor, quote, table, first, last):
+    """`first`..`last` oylari uchun bo‘laklar; yaratilganlar nomlari"""
+    created = []
+    month = month_start(first)
+    while month <= month_start(last):
+        if create_partition(cursor, quote, table, month):
+            created.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return created
+
+
+# ==========================
+# 🔹 Migratsiya: oddiy jadval ⇄ bo‘laklangan jadval
+# ==========================
+def _with_column(definition, column):
+    """`PRIMARY KEY (id)` / `UNIQUE (x)` → bo‘lak ustuni qo‘shilgan ro‘yxat"""
+    head, columns = re.match(r'^(.*?)\((.*)\)\s*$', definition).groups()
+    names = [name.strip() for name in columns.split(',')]
+    if column not in names:
+        names.append(column)
+    return f'{head}({", ".join(names)})'
+
+
+def _without_column(definition, column):
+    head, columns = re.match(r'^(.*?)\((.*)\)\s*$', definition).groups()
+    names = [name.strip() for name in columns.split(',') if name.strip() != column]
+    return f'{head}({", ".join(names)})'
+
+
+def _rebuild(cursor, quote, table, partition_months=None):
+    """
+    Jadvalni qayta yaratadi: `partition_months` berilsa — bo‘laklangan (shu oylar
+    va default bo‘lak bilan), aks holda oddiy jadval. Ma’lumotlar, indekslar,
+    CHECK va tashqi kalitlar nomlari bilan saqlanadi.
+    """
+    column = PARTITIONED_TABLES[table]
+    cursor.execute(
+        "SELECT conrelid::regclass::text FROM pg_constraint WHERE confrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    referencing = [name for name, in cursor.fetchall()]
+    if referencing:
+        raise RuntimeError(f"{table} ga tashqi kalitlar bor ({', '.join(referencing)}) — avval db_constraint=False")
+
+    cursor.execute(
+        """
+        SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f')
+        ORDER BY contype DESC, conname
+        """,
+        [table],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT i.indexname, i.indexdef FROM pg_indexes i
+        WHERE i.schemaname = current_schema() AND i.tablename = %s
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname AND c.conrelid = to_regclass(%s))
+        ORDER BY i.indexname
+        """,
+        [table, table],
+    )
+    indexes = cursor.fetchall()
+
+    old = f'{table}__old'
+    cursor.execute(f'ALTER TABLE {quote(table)} RENAME TO {quote(old)}')
+    partition_by = f' PARTITION BY RANGE ({quote(column)})' if partition_months is not None else ''
+    cursor.execute(
+        f'CREATE TABLE {quote(table)} (LIKE {quote(old)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS){partition_by}'
+    )
+    if partition_months is not None:
+        cursor.execute(f'CREATE TABLE {quote(table + "_default")} PARTITION OF {quote(table)} DEFAULT')
+        for month in partition_months:
+            create_partition(cursor, quote, table, month)
+    cursor.execute(f'INSERT INTO {quote(table)} SELECT * FROM {quote(old)}')
+    cursor.execute(f'DROP TABLE {quote(old)}')
+
+    for name, kind, definition in constraints:
+        if kind in ('p', 'u'):
+            rewrite = _with_column if partition_months is not None else _without_column
+            definition = rewrite(definition, column)
+        cursor.execute(f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}')
+    for name, definition in indexes:
+        cursor.execute(definition)
+
+
+def _data_months(cursor, quote, table, ahead):
+    column = PARTITIONED_TABLES[table]
+    cursor.execute(f'SELECT min({quote(column)}), max({quote(column)}) FROM {quote(table)}')
+    first, last = cursor.fetchone()
+    now = month_start(datetime.now(timezone.utc))
+    first = month_start(first) if first else now
+    last = max(month_start(last) if last else now, add_months(now, ahead))
+    months, month = [], first
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_tables(connection, ahead):
+    """Barcha `PARTITIONED_TABLES` ni bo‘laklangan jadvalga aylantiradi (mavjud ma’lumotlar oylari + `ahead` oy)"""
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(cursor, table):
+                _rebuild(cursor, quote, table, _data_months(cursor, quote, table, ahead))
+
+
+def unpartition_tables(connection):
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            if is_partitioned(cursor, table):
+                _rebuild(cursor, quote, table)
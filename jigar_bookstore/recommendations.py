@@ -0,0 +1,249 @@
+"""
+🛒 "Buni ham sotib olishdi" tavsiyalari
+--------------------------------------
+To‘langan buyurtmalardan kitob×kitob birga sotib olish matritsasi
+(SciPy sparse) quriladi: `X` — buyurtma×kitob 0/1 matritsa, `C = Xᵀ·X`.
+Diagonal — kitob necha buyurtmada bor, qolgani — birga sotib olishlar soni.
+Ball kosinus bilan normallanadi: `C[i, j] / sqrt(C[i, i] · C[j, j])`.
+
+Har bir kitob uchun eng yaxshi `ALSO_BOUGHT_TOP_K` qo‘shni `BookNeighbor`
+jadvaliga yoziladi. Matritsa, hisobga olingan buyurtmalar (saralangan massiv)
+va "suv belgisi" (`watermark`) `RECOMMENDATIONS_DIR/also_bought.npz` da
+saqlanadi. Keyingi ishga tushirishda faqat `updated_at >= watermark` bo‘lgan
+buyurtmalar o‘qiladi (`order_updated_idx`): `paid` ga o‘tganlari qo‘shiladi,
+`paid` dan chiqqanlari ayiriladi, faqat ular tegib o‘tgan kitoblar va
+ularning qo‘shnilari qayta hisoblanadi. Belgi ishga tushish vaqtidan
+`ALSO_BOUGHT_OVERLAP` soniya orqada qo‘yiladi — kech commit bo‘lgan
+o‘zgarishlar ham keyingi safar ko‘rinadi; qayta ko‘rilgan buyurtma ikki
+marta hisoblanmaydi (massivda bor-yo‘qligi tekshiriladi).
+
+O‘chirilgan buyurtmalar inkremental yo‘lda hisobga olinmaydi — ular to‘liq
+qayta qurishda (`--full`) tuzaladi.
+
+NumPy va SciPy faqat shu oflayn ish uchun kerak (`pip install numpy scipy`).
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+STATE_FILE = 'also_bought.npz'
+CHUNK_SIZE = 1000
+
+
+def _require_scipy():
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError as e:
+        raise RuntimeError("Tavsiyalarni qurish uchun numpy va scipy o‘rnatilishi kerak") from e
+    return np, sparse
+
+
+def _state_path():
+    return Path(settings.RECOMMENDATIONS_DIR) / STATE_FILE
+
+
+def _key(value):
+    """UUID → massivda saqlanadigan 32 baytli hex kalit (`S32`)"""
+    return value.hex.encode()
+
+
+def _uuid(key):
+    return uuid.UUID(hex=key.decode())
+
+
+def _fetch_pairs(np, order_ids=None, paid_only=True):
+    """(buyurtma, kitob) juftliklari — hex kalitlardan iborat ikki massiv"""
+    from .models import OrderItem
+
+    items = OrderItem.objects.filter(book__isnull=False)
+    if paid_only:
+        items = items.filter(order__status='paid')
+    if order_ids is None:
+        chunks = [items]
+    else:
+        order_ids = list(order_ids)
+        chunks = [items.filter(order_id__in=order_ids[i:i + CHUNK_SIZE]) for i in range(0, len(order_ids), CHUNK_SIZE)]
+    orders, books = [], []
+    for chunk in chunks:
+        for order_id, book_id in chunk.values_list('order_id', 'book_id').distinct().iterator():
+            orders.append(_key(order_id))
+            books.append(_key(book_id))
+    return np.array(orders, dtype='S32'), np.array(books, dtype='S32')
+
+
+def _incidence(np, sparse, order_idx, book_idx, shape):
+    """Buyurtma×kitob 0/1 matritsa (bir buyurtmada kitob necha marta bo‘lsa ham — 1)"""
+    matrix = sparse.csr_matrix(
+        (np.ones(len(order_idx), dtype=np.int32), (order_idx, book_idx)), shape=shape
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix
+
+
+def _top_neighbors(np, counts, rows, top_k):
+    """`rows` dagi har bir kitob uchun [(qo‘shni indeksi, ball, birga sotilganlar)]"""
+    counts = counts.tocsr()
+    counts.sort_indices()
+    norm = np.sqrt(np.maximum(counts.diagonal().astype(np.float64), 1))
+    row_of = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+    scores = counts.data / (norm[row_of] * norm[counts.indices])
+
+    result = {}
+    for row in rows:
+        start, end = counts.indptr[row], counts.indptr[row + 1]
+        columns, values, together = counts.indices[start:end], scores[start:end], counts.data[start:end]
+        keep = columns != row
+        columns, values, together = columns[keep], values[keep], together[keep]
+        if len(values) > top_k:
+            best = np.argpartition(-values, top_k)[:top_k]
+        else:
+            best = np.arange(len(values))
+        best = best[np.lexsort((columns[best], -values[best]))]
+        result[row] = [(int(columns[i]), float(values[i]), int(together[i])) for i in best]
+    return result
+
+
+def _store_neighbors(book_ids, neighbors, replace_all):
+    from .models import Book, BookNeighbor
+
+    rows = [_uuid(book_ids[row]) for row in neighbors]
+    needed = list(set(rows) | {_uuid(book_ids[column]) for row in neighbors for column, _, _ in neighbors[row]})
+    with transaction.atomic():
+        # Shu orada o‘chirilgan kitoblar yozilmaydi
+        existing = set()
+        for i in range(0, len(needed), CHUNK_SIZE):
+            existing.update(Book.objects.filter(pk__in=needed[i:i + CHUNK_SIZE]).values_list('pk', flat=True))
+        if replace_all:
+            BookNeighbor.objects.all().delete()
+        else:
+            for i in range(0, len(rows), CHUNK_SIZE):
+                BookNeighbor.objects.filter(book_id__in=rows[i:i + CHUNK_SIZE]).delete()
+        objects = [
+            BookNeighbor(book_id=book_id, neighbor_id=_uuid(book_ids[column]), score=score, co_purchases=together)
+            for book_id, row in zip(rows, neighbors)
+            if book_id in existing
+            for column, score, together in neighbors[row]
+            if _uuid(book_ids[column]) in existing
+        ]
+        BookNeighbor.objects.bulk_create(objects, batch_size=CHUNK_SIZE)
+    return len(objects)
+
+
+def _save_state(np, counts, book_ids, order_ids, watermark):
+    """`order_ids` — hisobga olingan buyurtmalar, saralangan (`np.isin` / `np.union1d` uchun)"""
+    path = _state_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.stem + '.tmp.npz')
+    np.savez_compressed(
+        tmp, data=counts.data, indices=counts.indices, indptr=counts.indptr, shape=np.array(counts.shape),
+        book_ids=book_ids, order_ids=order_ids, watermark=np.array(watermark.timestamp()),
+    )
+    os.replace(tmp, path)
+
+
+def _load_state(np, sparse):
+    """(matritsa, kitoblar, buyurtmalar, watermark); fayl yo‘q yoki eski formatda bo‘lsa — None"""
+    try:
+        with np.load(_state_path()) as state:
+            if 'watermark' not in state.files:
+                return None
+            counts = sparse.csr_matrix(
+                (state['data'], state['indices'], state['indptr']), shape=tuple(state['shape'])
+            )
+            watermark = datetime.fromtimestamp(float(state['watermark']), tz=dt_timezone.utc)
+            return counts, state['book_ids'], state['order_ids'], watermark
+    except FileNotFoundError:
+        return None
+
+
+def _next_watermark():
+    return timezone.now() - timedelta(seconds=settings.ALSO_BOUGHT_OVERLAP)
+
+
+def build_full(top_k=None):
+    """Barcha to‘langan buyurtmalardan matritsani qayta quradi; yozilgan qo‘shnilar sonini qaytaradi"""
+    np, sparse = _require_scipy()
+    top_k = top_k or settings.ALSO_BOUGHT_TOP_K
+    watermark = _next_watermark()
+    orders, books = _fetch_pairs(np)
+    order_ids, order_idx = np.unique(orders, return_inverse=True)
+    book_ids, book_idx = np.unique(books, return_inverse=True)
+
+    incidence = _incidence(np, sparse, order_idx, book_idx, (len(order_ids), len(book_ids)))
+    counts = (incidence.T @ incidence).tocsr()
+    neighbors = _top_neighbors(np, counts, range(len(book_ids)), top_k)
+    stored = _store_neighbors(book_ids, neighbors, replace_all=True)
+    _save_state(np, counts, book_ids, order_ids, watermark)
+    return stored
+
+
+def update_incremental(top_k=None):
+    """
+    Oxirgi ishga tushirishdan keyin `paid` ga o‘tgan buyurtmalarni matritsaga
+    qo‘shadi, `paid` dan chiqqanlarini ayiradi va faqat ta’sirlangan kitoblarning
+    qo‘shnilarini yangilaydi. Saqlangan holat bo‘lmasa — to‘liq quriladi.
+    """
+    from .models import Order
+
+    np, sparse = _require_scipy()
+    top_k = top_k or settings.ALSO_BOUGHT_TOP_K
+    state = _load_state(np, sparse)
+    if state is None:
+        return build_full(top_k)
+    counts, book_ids, order_ids, watermark = state
+    next_watermark = _next_watermark()
+
+    changed = list(Order.objects.filter(updated_at__gte=watermark).values_list('id', 'status').iterator())
+    keys = np.array([_key(order_id) for order_id, _ in changed], dtype='S32')
+    paid = np.array([status == 'paid' for _, status in changed], dtype=bool)
+    counted = np.isin(keys, order_ids)
+    added, removed = keys[paid & ~counted], keys[~paid & counted]
+    if not len(added) and not len(removed):
+        return 0
+
+    # Yangi kitoblar matritsa oxiriga qo‘shiladi — mavjud indekslar o‘zgarmaydi
+    known = {raw: index for index, raw in enumerate(book_ids.tolist())}
+    deltas = []
+    for order_keys, sign in ((added, 1), (removed, -1)):
+        if not len(order_keys):
+            continue
+        orders, books = _fetch_pairs(np, [_uuid(key) for key in order_keys.tolist()], paid_only=sign > 0)
+        if sign > 0:
+            for raw in dict.fromkeys(books.tolist()):
+                known.setdefault(raw, len(known))
+        else:
+            # Hisobga olinmagan (keyin qo‘shilgan) kitoblar ayirilmaydi
+            keep = np.array([raw in known for raw in books.tolist()], dtype=bool)
+            orders, books = orders[keep], books[keep]
+        deltas.append((orders, np.array([known[raw] for raw in books.tolist()], dtype=np.int64), sign))
+    if len(known) > len(book_ids):
+        book_ids = np.array(list(known), dtype='S32')
+    size = len(book_ids)
+
+    previous = counts.copy()
+    previous.resize((size, size))
+    counts = previous
+    for orders, book_idx, sign in deltas:
+        unique_orders, order_idx = np.unique(orders, return_inverse=True)
+        incidence = _incidence(np, sparse, order_idx, book_idx, (len(unique_orders), size))
+        counts = counts + sign * (incidence.T @ incidence)
+    counts = counts.tocsr()
+    counts.eliminate_zeros()
+
+    # Tegilgan kitoblarning soni (normasi) o‘zgardi — ular va ularning eski hamda
+    # yangi qo‘shnilari qatorlari qayta hisoblanadi (matritsa simmetrik)
+    touched = np.unique(np.concatenate([book_idx for _, book_idx, _ in deltas]))
+    affected = np.unique(np.concatenate([touched, previous.tocsr()[touched].indices, counts[touched].indices]))
+    neighbors = _top_neighbors(np, counts, affected.tolist(), top_k)
+    stored = _store_neighbors(book_ids, neighbors, replace_all=False)
+    order_ids = np.union1d(np.setdiff1d(order_ids, removed), added)
+    _save_state(np, counts, book_ids, order_ids, next_watermark)
+    return stored
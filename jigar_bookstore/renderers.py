@@ -0,0 +1,52 @@
+"""
+⚡ Tezkor JSON renderer (orjson)
+-------------------------------
+DRF `JSONRenderer` bilan bayt-bayt bir xil natija beradi, lekin UUID,
+datetime/date va oddiy tiplar C kodida kodlanadi. orjson bilmagan tiplar
+(lazy matnlar, QuerySet, Decimal — DRF kabi float) DRF encoder’iga beriladi.
+
+Mos kelmaydigan holatlarda oddiy `JSONRenderer` ishlatiladi:
+* `indent` so‘ralgan (brauzer API, `; indent=4`);
+* 64-bitdan katta butun son va h.k. — orjson xatosi.
+
+orjson o‘rnatilmagan bo‘lsa — doim oddiy `JSONRenderer`.
+
+Cheklovlar: float 1e-4 ≤ |x| < 1e16 oralig‘ida `json` bilan bir xil yoziladi
+(katalogdagi yagona float — 0..5 reyting); undan tashqarida eksponenta shakli
+farq qiladi (`1e16` / `1e+16`). NaN/Infinity: orjson `null` yozadi.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # ixtiyoriy bog‘liqlik
+    orjson = None
+
+_LINE_SEPARATORS = (b'\xe2\x80\xa8', b'\xe2\x80\xa9')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """orjson asosidagi JSONRenderer (chiqish formati o‘zgarmaydi)"""
+
+    _default = staticmethod(JSONEncoder().default)
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self._default, option=self.options)
+        except (orjson.JSONEncodeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer kabi: U+2028/U+2029 JavaScript uchun ekranlanadi
+        if _LINE_SEPARATORS[0] in ret or _LINE_SEPARATORS[1] in ret:
+            ret = ret.replace(_LINE_SEPARATORS[0], b'\\u2028').replace(_LINE_SEPARATORS[1], b'\\u2029')
+        return ret
@@ -0,0 +1,166 @@
+"""
+📜 Oldindan tayyorlangan OpenAPI sxemasi
+---------------------------------------
+`SpectacularAPIView` har so‘rovda barcha viewset va serializer’larni qayta
+ko‘rib chiqadi. Bu yerda sxema kod versiyasi uchun bir marta quriladi:
+
+* deploy paytida `python manage.py build_openapi_schema` uni
+  `OPENAPI_SCHEMA_DIR/<versiya>/` ga (YAML, JSON va ularning .gz nusxalari) yozadi;
+* `CachedSchemaView` uni xotiradan beradi — ETag (304) va gzip bilan;
+* kod versiyasi o‘zgarsa (`CODE_VERSION` yoki manba fayllari), sxema qayta quriladi.
+
+`?lang=` / `?version=` bilan so‘rovlar odatdagidek dinamik hisoblanadi.
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+FORMATS = ('yaml', 'json')
+_artifacts = {}
+_lock = threading.Lock()
+_code_version = None
+
+
+def code_version():
+    """`CODE_VERSION` sozlamasi (masalan, git SHA) yoki manba fayllari izi"""
+    global _code_version
+    if _code_version is None:
+        configured = getattr(settings, 'CODE_VERSION', '')
+        if configured:
+            _code_version = configured
+        else:
+            digest = hashlib.sha256()
+            for package in ('config', 'jigar_bookstore'):
+                for path in sorted(Path(settings.BASE_DIR, package).rglob('*.py')):
+                    stat = path.stat()
+                    digest.update(f'{path.relative_to(settings.BASE_DIR)}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+            _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+class SchemaArtifact:
+    """Bitta formatdagi tayyor sxema: baytlar, gzip nusxa va ETag"""
+
+    def __init__(self, content, compressed=None):
+        self.content = content
+        self.compressed = compressed if compressed is not None else gzip.compress(content, mtime=0)
+        self.etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+
+
+def _renderer_for(fmt):
+    return next(renderer() for renderer in SpectacularAPIView.renderer_classes if renderer.format == fmt)
+
+
+def generate_schema():
+    """drf-spectacular generatori bilan sxema (public, versiyasiz)"""
+    generator_class = spectacular_settings.DEFAULT_GENERATOR_CLASS
+    generator = generator_class(urlconf=spectacular_settings.SERVE_URLCONF)
+    return generator.get_schema(request=None, public=True)
+
+
+def schema_dir(version=None):
+    return Path(settings.OPENAPI_SCHEMA_DIR) / (version or code_version())
+
+
+def build_schema_files(version=None):
+    """Sxemani barcha formatlarda diskka yozadi; yozilgan fayllar ro‘yxatini qaytaradi"""
+    target = schema_dir(version)
+    target.mkdir(parents=True, exist_ok=True)
+    schema = generate_schema()
+    written = []
+    for fmt in FORMATS:
+        artifact = SchemaArtifact(_renderer_for(fmt).render(schema, renderer_context={}))
+        for name, data in ((f'openapi.{fmt}', artifact.content), (f'openapi.{fmt}.gz', artifact.compressed)):
+            path = target / name
+            # Har yozuvchiga alohida vaqtinchalik fayl — parallel workerlar bir-birining faylini buzmaydi
+            tmp = tempfile.NamedTemporaryFile(dir=target, prefix=f'.{name}.', suffix='.tmp', delete=False)
+            try:
+                with tmp:
+                    tmp.write(data)
+                os.replace(tmp.name, path)
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+            written.append(path)
+        with _lock:
+            _artifacts[(target.name, fmt)] = artifact
+    return written
+
+
+def _load_from_disk(version, fmt):
+    path = schema_dir(version) / f'openapi.{fmt}'
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        compressed = path.with_name(path.name + '.gz').read_bytes()
+    except OSError:
+        compressed = None
+    return SchemaArtifact(content, compressed)
+
+
+def get_schema_artifact(fmt):
+    """Xotira → disk → qurish tartibida joriy kod versiyasi sxemasini qaytaradi"""
+    version = code_version()
+    key = (version, fmt)
+    artifact = _artifacts.get(key)
+    if artifact is not None:
+        return artifact
+    with _lock:
+        artifact = _artifacts.get(key)
+        if artifact is None:
+            artifact = _load_from_disk(version, fmt)
+            if artifact is not None:
+                _artifacts[key] = artifact
+    if artifact is None:
+        # Deploy paytida qurilmagan — birinchi so‘rovda quriladi
+        try:
+            build_schema_files(version)
+        except OSError:
+            content = _renderer_for(fmt).render(generate_schema(), renderer_context={})
+            with _lock:
+                _artifacts[key] = SchemaArtifact(content)
+        artifact = _artifacts[key]
+    return artifact
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """`/api/schema/` — tayyor sxemani xotiradan, ETag va gzip bilan beradi"""
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        content_type = f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset else renderer.media_type
+        dynamic = (
+            request.GET.get('lang') or request.GET.get('version') or request.version
+            or 'indent' in (request.accepted_media_type or '')
+        )
+        if dynamic or renderer.format not in FORMATS:
+            return super().get(request, *args, **kwargs)
+
+        artifact = get_schema_artifact(renderer.format)
+        if artifact.etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            response = HttpResponseNotModified()
+        elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+            response = HttpResponse(artifact.compressed, content_type=content_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(artifact.content, content_type=content_type)
+        response['ETag'] = artifact.etag
+        response['Content-Disposition'] = (
+            f'inline; filename="{spectacular_settings.TITLE or "schema"}.{renderer.format}"'
+        )
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
@@ -1,5 +1,12 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from rest_framework import serializers
-from .models import User, Category, Author, Book, Review, Order, OrderItem, Payment
+from .models import (
+    User, Category, Author, Book, Review, Order, OrderItem, Payment, StockMovement, UserOrderSummary, Cart, CartItem
+)
+from .covers import cover_url_for
 
 
 # =======================
@@ -20,6 +27,15 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = '__all__'
 
+    def validate_parent(self, parent):
+        if parent is None:
+            return parent
+        if self.instance and parent.path.startswith(self.instance.path):
+            raise serializers.ValidationError("Kategoriyani o‘zining ichki kategoriyasiga ko‘chirib bo‘lmaydi")
+        if parent.depth + 1 >= Category.MAX_DEPTH:
+            raise serializers.ValidationError(f"Daraxt chuqurligi {Category.MAX_DEPTH} dan oshmasligi kerak")
+        return parent
+
 
 # =======================
 # 🔹 AUTHOR SERIALIZER
@@ -37,6 +53,8 @@ class BookSerializer(serializers.ModelSerializer):
     author = serializers.PrimaryKeyRelatedField(queryset=Author.objects.all())
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
     average_rating = serializers.FloatField(source='get_average_rating', read_only=True)
+    rating_histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    cover_url = serializers.SerializerMethodField()
 
     # nested o‘qishda
     author_detail = AuthorSerializer(source='author', read_only=True)
@@ -47,10 +65,53 @@ class BookSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'author', 'author_detail',
             'category', 'category_detail', 'description',
-            'price', 'stock', 'cover_image',
-            'published_date', 'isbn', 'average_rating'
+            'price', 'stock', 'cover_image', 'cover_url',
+            'published_date', 'isbn', 'average_rating', 'rating_histogram'
         ]
 
+    def update(self, instance, validated_data):
+        """Qoldiqni kamaytirish parallel sotuvdan keyin yetmasa — model xatosi 400 javobiga"""
+        try:
+            return super().update(instance, validated_data)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.message_dict)
+
+    def get_cover_url(self, obj):
+        """Kontekstdagi `cover_size` ga mos eskiz (ro‘yxatda kichik, tafsilotda katta)"""
+        return cover_url_for(obj, self.context.get('cover_size'), self.context.get('request'))
+
+
+class BookBulkUpdateItemSerializer(serializers.Serializer):
+    """Ommaviy yangilash elementi: `id` yoki `isbn` + `price` va/yoki `stock`"""
+    id = serializers.UUIDField(required=False)
+    isbn = serializers.CharField(required=False, max_length=13)
+    price = serializers.DecimalField(max_digits=8, decimal_places=2, min_value=0, required=False)
+    stock = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, attrs):
+        if not attrs.get('id') and not attrs.get('isbn'):
+            raise serializers.ValidationError("`id` yoki `isbn` ko‘rsatilishi kerak")
+        if 'price' not in attrs and 'stock' not in attrs:
+            raise serializers.ValidationError("`price` yoki `stock` ko‘rsatilishi kerak")
+        return attrs
+
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    """Qo‘lda kiritiladigan ombor harakati: kirim (musbat) yoki tuzatish (±)"""
+    kind = serializers.ChoiceField(choices=[StockMovement.RECEIPT, StockMovement.ADJUSTMENT])
+
+    class Meta:
+        model = StockMovement
+        fields = ['id', 'book', 'kind', 'quantity', 'order', 'note', 'created_at']
+        read_only_fields = ['id', 'book', 'order', 'created_at']
+
+    def validate(self, attrs):
+        if not attrs['quantity']:
+            raise serializers.ValidationError({'quantity': "Miqdor 0 bo‘lmasligi kerak"})
+        if attrs['kind'] == StockMovement.RECEIPT and attrs['quantity'] < 0:
+            raise serializers.ValidationError({'quantity': "Kirim musbat bo‘lishi kerak"})
+        return attrs
+
 
 # =======================
 # 🔹 REVIEW SERIALIZER
@@ -62,8 +123,6 @@ class ReviewSerializer(serializers.ModelSerializer):
     user_detail = UserSerializer(source='user', read_only=True)
     book_detail = BookSerializer(source='book', read_only=True)
 
-    likes_count = serializers.SerializerMethodField()
-    dislikes_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     is_disliked = serializers.SerializerMethodField()
 
@@ -72,21 +131,31 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ['id','user','user_detail','book','book_detail','rating','comment',
             'likes_count','dislikes_count','is_liked','is_disliked'
         ]
-        read_only_fields = ['created_at']
-
-    def get_likes_count(self, obj):
-        return obj.likes.count()
+        read_only_fields = ['created_at', 'likes_count', 'dislikes_count']
 
-    def get_dislikes_count(self, obj):
-        return obj.dislikes.count()
+    def _reaction(self, obj, field, name):
+        """`Review.with_user_reactions` izohi bo‘lsa — undan, aks holda bitta so‘rov"""
+        user = self.context['request'].user
+        if not user.is_authenticated:
+            return False
+        if hasattr(obj, f'user_{name}'):
+            return getattr(obj, f'user_{name}')
+        return getattr(obj, field).filter(id=user.id).exists()
 
     def get_is_liked(self, obj):
-        user = self.context['request'].user
-        return user.is_authenticated and obj.likes.filter(id=user.id).exists()
+        return self._reaction(obj, 'likes', 'liked')
 
     def get_is_disliked(self, obj):
-        user = self.context['request'].user
-        return user.is_authenticated and obj.dislikes.filter(id=user.id).exists()
+        return self._reaction(obj, 'dislikes', 'disliked')
+
+
+class BookReviewSerializer(ReviewSerializer):
+    """Kitob sahifasidagi sharhlar — kitobning o‘zi qayta joylashtirilmaydi"""
+    class Meta(ReviewSerializer.Meta):
+        fields = ['id', 'user', 'user_detail', 'book', 'rating', 'comment',
+            'likes_count', 'dislikes_count', 'is_liked', 'is_disliked', 'created_at'
+        ]
+
 
 # =======================
 # 🔹 ORDER ITEM SERIALIZER
@@ -114,17 +183,77 @@ class OrderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Order
-        fields = ['id', 'user', 'user_detail', 'is_paid', 'total_amount', 'status', 'items', 'created_at']
+        fields = [
+            'id', 'user', 'user_detail', 'is_paid', 'total_amount', 'status', 'stock_shortage', 'items', 'created_at',
+        ]
+        read_only_fields = ['stock_shortage']
 
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop('items')
+        # `paid` mahsulotlardan keyin qo‘yiladi — sotuv ombor jurnaliga yozilishi uchun
+        order_status = validated_data.pop('status', 'pending')
         order = Order.objects.create(**validated_data)
         for item_data in items_data:
             OrderItem.objects.create(order=order, **item_data)
         order.calculate_total()
+        if order_status != order.status:
+            order.status = order_status
+            order.save(update_fields=['status'])
         return order
 
 
+class OrderBriefSerializer(serializers.ModelSerializer):
+    """Xulosa sahifasi uchun yengil buyurtma (mahsulotlarsiz)"""
+
+    class Meta:
+        model = Order
+        fields = ['id', 'status', 'is_paid', 'total_amount', 'created_at']
+
+
+class UserOrderSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UserOrderSummary
+        fields = ['total_spent', 'orders_count', 'pending_count', 'paid_count', 'cancelled_count', 'updated_at']
+
+
+# =======================
+# 🔹 CART SERIALIZER
+# =======================
+class CartItemSerializer(serializers.ModelSerializer):
+    book = serializers.PrimaryKeyRelatedField(queryset=Book.objects.all())
+    title = serializers.CharField(source='book.title', read_only=True)
+    price = serializers.DecimalField(source='book.price', max_digits=8, decimal_places=2, read_only=True)
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+    class Meta:
+        model = CartItem
+        fields = ['book', 'title', 'price', 'quantity']
+
+
+class CartQuantitySerializer(serializers.Serializer):
+    """Qator miqdorini o‘rnatish; 0 — olib tashlash"""
+    quantity = serializers.IntegerField(min_value=0)
+
+
+class CartCheckoutSerializer(serializers.Serializer):
+    """Takroriy so‘rovda aynan shu savat (va uning buyurtmasi) uchun `cart` yuboriladi"""
+    cart = serializers.UUIDField(required=False)
+
+
+class CartSerializer(serializers.ModelSerializer):
+    items = CartItemSerializer(many=True, read_only=True)
+    total = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Cart
+        fields = ['id', 'items', 'total', 'updated_at']
+
+    def get_total(self, obj):
+        total = sum((item.book.price * item.quantity for item in obj.items.all()), Decimal('0'))
+        return f'{total:.2f}'
+
+
 # =======================
 # 🔹 PAYMENT SERIALIZER
 # =======================
@@ -135,3 +264,22 @@ class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payment
         fields = ['id', 'order', 'order_detail', 'payment_method', 'transaction_id', 'status', 'paid_at']
+
+    def validate_order(self, order):
+        # Yakuniy tekshiruv Payment.save da, buyurtma qulfi ostida — bu yerda faqat tushunarli 400 uchun
+        payments = Payment.objects.filter(order=order)
+        if self.instance is not None:
+            payments = payments.exclude(pk=self.instance.pk)
+        if payments.exists():
+            raise serializers.ValidationError("Bu buyurtma uchun to‘lov allaqachon mavjud")
+        return order
+
+    # Muvaffaqiyatli to‘lov buyurtmani `paid` qiladi va ombordan sotuvni yozadi — bitta
+    # tranzaksiyada; qoldiq yetmasa to‘lov saqlanadi, buyurtma `stock_shortage` bilan belgilanadi
+    @transaction.atomic
+    def create(self, validated_data):
+        return super().create(validated_data)
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        return super().update(instance, validated_data)
@@ -8,11 +8,16 @@ Muallif: Jigar Bookstore Team
 Sana: 2025-10-30
 """
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import Book, User
+from django.db import transaction
+from .models import Author, Book, Review, User
+from .autocomplete import AUTHOR_FIELDS, BOOK_FIELDS, invalidate_autocomplete
+from .caching import invalidate_book_caches
+from .covers import delete_cover_variants, schedule_cover_processing
+from .notifications import AUDIENCE_FIELDS, get_recipients, invalidate_recipients
 
 
 @receiver(post_save, sender=Book)
@@ -38,15 +43,8 @@ def send_new_book_notification(sender, instance, created, **kwargs):
         f"Bookstore saytida ushbu kitobni hoziroq ko‘ring!"
     )
 
-    # 🔹 Email yuboriladigan foydalanuvchilarni aniqlash (sellerlar va adminlar)
-    seller_emails = list(
-        User.objects.filter(is_seller=True).values_list("email", flat=True)
-    )
-    admin_emails = list(
-        User.objects.filter(is_staff=True).values_list("email", flat=True)
-    )
-
-    recipients = list(set(filter(None, seller_emails + admin_emails)))
+    # 🔹 Email yuboriladigan foydalanuvchilar (sellerlar va adminlar) — keshdan
+    recipients = get_recipients('catalog-staff')
 
     if not recipients:
         return
@@ -65,6 +63,81 @@ def send_new_book_notification(sender, instance, created, **kwargs):
 
 
 
+@receiver(post_save, sender=Book)
+def process_book_cover(sender, instance, **kwargs):
+    """
+    🖼 Muqova yangi yuklangan bo‘lsa — eskizlar yaratishni fon jarayoniga topshiradi.
+    Ish tranzaksiya yakunlangandan keyin navbatga qo‘yiladi.
+    """
+    previous = getattr(instance, '_cover_state', None)
+    instance._cover_state = instance.cover_image.name
+    if not instance.cover_image:
+        return
+    if previous is not None:
+        # Bazadan o‘qilgan kitob: faqat muqova almashtirilganda (eskizlar shu orada
+        # tayyor bo‘lib, xotiradagi `cover_variants` eskirgan bo‘lishi mumkin)
+        if previous == instance.cover_image.name:
+            return
+    elif (instance.cover_variants or {}).get('source') == instance.cover_image.name:
+        return
+    transaction.on_commit(lambda: schedule_cover_processing(instance))
+
+
+@receiver(post_delete, sender=Book)
+def delete_book_cover_variants(sender, instance, **kwargs):
+    """🖼 Kitob o‘chirildi — uning WebP eskizlari ham (commit’dan keyin, bekor qilinsa fayllar qoladi)"""
+    variants = instance.cover_variants
+    if variants:
+        transaction.on_commit(lambda: delete_cover_variants(variants))
+
+
+@receiver([post_save, post_delete], sender=Book)
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_book_facets(sender, **kwargs):
+    """
+    🗃 Kitob yoki sharh o‘zgarsa — kitobga bog‘liq keshlar (fasetlar va h.k.) eskiradi.
+    Commit’dan keyin: aks holda parallel so‘rov eski ma’lumotni yangi versiyaga keshlab qo‘yadi.
+    """
+    transaction.on_commit(invalidate_book_caches)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Author)
+def invalidate_autocomplete_on_save(sender, instance, update_fields=None, **kwargs):
+    """🔎 Nom, ISBN yoki muallif ismi o‘zgarishi mumkin bo‘lsa — avtoto‘ldirish indeksi eskiradi"""
+    fields = BOOK_FIELDS if sender is Book else AUTHOR_FIELDS
+    if update_fields is not None and not set(update_fields) & set(fields):
+        return
+    invalidate_autocomplete()
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+def invalidate_autocomplete_on_delete(sender, **kwargs):
+    invalidate_autocomplete()
+
+
+@receiver(post_save, sender=User)
+def invalidate_recipients_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    """👥 Auditoriyaga ta’sir qiluvchi maydon o‘zgarsa — qabul qiluvchilar keshi eskiradi"""
+    if update_fields is not None and not set(update_fields) & set(AUDIENCE_FIELDS):
+        return
+    previous = getattr(instance, '_audience_state', None)
+    current = {field: getattr(instance, field) for field in AUDIENCE_FIELDS}
+    if created:
+        changed = instance.is_seller or instance.is_staff
+    else:
+        changed = previous is None or any(previous.get(field, None) != value for field, value in current.items())
+    if changed:
+        # Commit’dan keyin — aks holda parallel so‘rov eski ro‘yxatni yangi versiyaga keshlaydi
+        transaction.on_commit(invalidate_recipients)
+    instance._audience_state = current
+
+
+@receiver(post_delete, sender=User)
+def invalidate_recipients_on_user_delete(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_recipients)
+
 
 # from django.core.mail import send_mail
 # from django.conf import settings
@@ -0,0 +1,320 @@
+"""
+📚 Mazmunga ko‘ra o‘xshash kitoblar
+----------------------------------
+Sotuv tarixi yo‘q kitoblar uchun o‘xshashlik matndan hisoblanadi:
+`title` (ikki barobar vazn), `description`, muallif va kategoriya.
+
+* Har bir so‘z TF-IDF (sublinear tf, silliqlangan idf) bilan baholanadi;
+* lug‘at o‘rniga "hashing trick": so‘z → `SIMILAR_BOOKS_DIMENSIONS` ta
+  ustundan biri (±1 ishora bilan) — tasodifiy proyeksiya, matritsa zich va ixcham;
+* qatorlar L2 bo‘yicha normallanadi, o‘xshashlik — skalyar ko‘paytma (kosinus).
+
+Indeks `RECOMMENDATIONS_DIR/similar/` da saqlanadi, har yozuv o‘z `<token>` i bilan:
+`vectors-<token>.f32` — float32 matritsa (`numpy.memmap` bilan o‘qiladi),
+`ids-<token>.npy` — qatorlar tartibidagi kitob UUID’lari (16 bayt),
+`idf-<token>.npz` — idf jadvali (faqat yangi kitobni vektorlashda o‘qiladi).
+`meta.json` da faqat fayl nomlari va skalyarlar (o‘lchamlar, qurilish vaqti) —
+kitoblar soniga bog‘liq emas. Fayllar yozilgach `meta.json` atomar
+almashtiriladi — o‘quvchilar hech qachon yarim yozilgan indeksni ko‘rmaydi.
+
+`build_similar_books` — to‘liq qurish; `--incremental` — faqat oxirgi
+qurilishdan keyin (`SIMILAR_BOOKS_OVERLAP` zaxirasi bilan) yaratilgan yoki
+tahrirlangan kitoblarni (`updated_at`) saqlangan idf bilan vektorlaydi:
+yangilari oxiriga qo‘shiladi, tahrirlanganlari o‘z qatorida almashtiriladi.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import uuid
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import cached_property
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+TOKEN_RE = re.compile(r"[\w‘’ʻʼ']+", re.UNICODE)
+APOSTROPHES = str.maketrans({'‘': "'", '’': "'", 'ʻ': "'", 'ʼ': "'"})
+CHUNK_SIZE = 2000
+INDEX_FORMAT = 2
+INDEX_FILES = ('vectors', 'ids', 'idf')
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise RuntimeError("O‘xshash kitoblar indeksi uchun numpy o‘rnatilishi kerak") from e
+    return np
+
+
+def _index_dir():
+    return Path(settings.RECOMMENDATIONS_DIR) / 'similar'
+
+
+def _words(text):
+    return [word.strip("'") for word in TOKEN_RE.findall((text or '').lower().translate(APOSTROPHES)) if len(word) > 1]
+
+
+def book_terms(title, description, author, category):
+    """Kitob hujjatining atamalari: sarlavha ikki marta, muallif va kategoriya alohida belgi bilan"""
+    terms = _words(title) * 2 + _words(description)
+    if author:
+        terms.append('author:' + ' '.join(_words(author)))
+    if category:
+        terms.append('category:' + ' '.join(_words(category)))
+    return terms
+
+
+def _bucket(term, dimensions):
+    """Atama → (ustun, ishora) — jarayonlar orasida barqaror xesh"""
+    value = zlib.crc32(term.encode())
+    return value % dimensions, 1.0 if (value >> 31) & 1 else -1.0
+
+
+def _books_terms(queryset):
+    rows = queryset.values_list('id', 'title', 'description', 'author__full_name', 'category__name')
+    for book_id, title, description, author, category in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield book_id, Counter(book_terms(title, description, author, category))
+
+
+def _vectorize(np, documents, idf, default_idf, dimensions):
+    """[Counter] → L2 normallangan (n, dimensions) float32 matritsa"""
+    rows, columns, values = [], [], []
+    for row, counts in enumerate(documents):
+        for term, tf in counts.items():
+            column, sign = _bucket(term, dimensions)
+            rows.append(row)
+            columns.append(column)
+            values.append(sign * (1 + math.log(tf)) * idf.get(term, default_idf))
+    matrix = np.zeros((len(documents), dimensions), dtype=np.float32)
+    if values:
+        np.add.at(matrix, (np.array(rows), np.array(columns)), np.array(values, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _build_started():
+    return timezone.now() - timedelta(seconds=settings.SIMILAR_BOOKS_OVERLAP)
+
+
+def _book_key(book_id):
+    """Indeksdagi kitob kaliti — UUID’ning 16 bayti"""
+    return uuid.UUID(str(book_id)).bytes
+
+
+def _write_index(np, meta, ids, idf, fill):
+    """
+    Yangi `vectors/ids/idf-<token>` fayllarini yozadi (`fill(memmap)` matritsani
+    to‘ldiradi), so‘ng `meta.json` ni atomar almashtiradi. Oldingi yozuv fayllari
+    hali ochiq o‘quvchilar uchun qoldiriladi, undan eskilari o‘chiriladi.
+    """
+    directory = _index_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    token = uuid.uuid4().hex
+    names = {'vectors': f'vectors-{token}.f32', 'ids': f'ids-{token}.npy', 'idf': f'idf-{token}.npz'}
+    rows = len(ids)
+    if rows:
+        vectors = np.memmap(
+            directory / names['vectors'], dtype=np.float32, mode='w+', shape=(rows, meta['dimensions'])
+        )
+        fill(vectors)
+        vectors.flush()
+        del vectors
+    else:
+        (directory / names['vectors']).touch()
+    np.save(directory / names['ids'], ids)
+    np.savez(
+        directory / names['idf'],
+        terms=np.array(list(idf), dtype=str), values=np.array(list(idf.values()), dtype=np.float64),
+    )
+
+    meta_path = directory / 'meta.json'
+    try:
+        previous = json.loads(meta_path.read_text())
+    except FileNotFoundError:
+        previous = {}
+    tmp = meta_path.with_suffix('.json.tmp')
+    tmp.write_text(json.dumps({**meta, **names, 'format': INDEX_FORMAT, 'rows': rows}))
+    os.replace(tmp, meta_path)
+    keep = {*names.values(), *(previous.get(kind) for kind in INDEX_FILES if isinstance(previous.get(kind), str))}
+    for pattern in ('vectors*.f32', 'ids-*.npy', 'idf-*.npz'):
+        for path in directory.glob(pattern):
+            if path.name not in keep:
+                path.unlink(missing_ok=True)
+
+
+def _ids_array(np, keys):
+    """16 baytli kalitlar -> (n, 16) uint8 massiv (`ids-<token>.npy`)"""
+    return np.frombuffer(b''.join(keys), dtype=np.uint8).reshape(len(keys), 16)
+
+
+def build_index():
+    """Barcha kitoblar uchun indeksni noldan quradi; kitoblar sonini qaytaradi"""
+    from .models import Book
+
+    np = _require_numpy()
+    dimensions = settings.SIMILAR_BOOKS_DIMENSIONS
+    built_at = _build_started()
+    ids, documents, df = [], [], Counter()
+    for book_id, counts in _books_terms(Book.objects.order_by('created_at', 'id')):
+        ids.append(_book_key(book_id))
+        documents.append(counts)
+        df.update(counts.keys())
+
+    total = len(documents)
+    # Kamida ikki kitobda uchragan atamalar saqlanadi — qolganlari standart (eng yuqori) idf oladi
+    idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in df.items() if count > 1}
+    default_idf = math.log(1 + total) + 1
+    matrix = _vectorize(np, documents, idf, default_idf, dimensions)
+
+    def fill(vectors):
+        vectors[:] = matrix
+
+    _write_index(np, {
+        'dimensions': dimensions, 'documents': total, 'default_idf': default_idf, 'built_at': built_at.timestamp(),
+    }, _ids_array(np, ids), idf, fill)
+    return total
+
+
+def update_index():
+    """
+    Oxirgi qurilishdan keyin yaratilgan yoki tahrirlangan kitoblarni saqlangan idf
+    bilan qayta vektorlaydi; vektori o‘zgargan yoki yangi kitoblar sonini qaytaradi.
+    """
+    from .models import Book
+
+    np = _require_numpy()
+    index = load_index()
+    if index is None:
+        return build_index()
+    built_at = _build_started()
+    changed = Book.objects.filter(updated_at__gte=index.built_at).order_by('created_at', 'id')
+    ids, documents = [], []
+    for book_id, counts in _books_terms(changed):
+        ids.append(_book_key(book_id))
+        documents.append(counts)
+    matrix = _vectorize(np, documents, index.idf, index.default_idf, index.dimensions)
+
+    # Zaxira oynasida qayta o‘qilgan, matni o‘zgarmagan kitoblar — vektori ham bir xil
+    replaced, new_ids, added = {}, [], []
+    for book_id, vector in zip(ids, matrix):
+        position = index.positions.get(book_id)
+        if position is None:
+            new_ids.append(book_id)
+            added.append(vector)
+        elif not np.array_equal(index.vectors[position], vector):
+            replaced[position] = vector
+    if not replaced and not added:
+        return 0
+
+    old_rows = len(index.ids)
+
+    def fill(vectors):
+        for start in range(0, old_rows, CHUNK_SIZE):
+            end = min(start + CHUNK_SIZE, old_rows)
+            vectors[start:end] = index.vectors[start:end]
+        for position, vector in replaced.items():
+            vectors[position] = vector
+        if added:
+            vectors[old_rows:] = np.stack(added)
+
+    _write_index(np, {
+        'dimensions': index.dimensions, 'documents': index.documents, 'default_idf': index.default_idf,
+        'built_at': built_at.timestamp(),
+    }, np.concatenate([index.ids, _ids_array(np, new_ids)]), index.idf, fill)
+    return len(replaced) + len(added)
+
+
+class SimilarityIndex:
+    """Diskdagi indeks: memmap matritsa, ID’lar massivi va ID xaritasi; idf kerak bo‘lganda o‘qiladi"""
+
+    def __init__(self, np, meta, mtime):
+        self.np = np
+        self.mtime = mtime
+        self.dimensions = meta['dimensions']
+        self.documents = meta['documents']
+        self.default_idf = meta['default_idf']
+        self.built_at = datetime.fromtimestamp(meta['built_at'], tz=dt_timezone.utc)
+        self._idf_path = _index_dir() / meta['idf']
+        self.ids = np.load(_index_dir() / meta['ids'])
+        self.positions = {key.tobytes(): position for position, key in enumerate(self.ids)}
+        if len(self.ids):
+            self.vectors = np.memmap(
+                _index_dir() / meta['vectors'], dtype=np.float32, mode='r', shape=(len(self.ids), self.dimensions)
+            )
+        else:
+            self.vectors = np.zeros((0, self.dimensions), dtype=np.float32)
+
+    @cached_property
+    def idf(self):
+        with self.np.load(self._idf_path) as data:
+            return dict(zip(data['terms'].tolist(), data['values'].tolist()))
+
+    def vector_for(self, book):
+        """Indeksda bo‘lmagan kitob uchun vektor (saqlangan idf bilan)"""
+        terms = Counter(book_terms(
+            book.title, book.description,
+            book.author.full_name if book.author_id else None,
+            book.category.name if book.category_id else None,
+        ))
+        return _vectorize(self.np, [terms], self.idf, self.default_idf, self.dimensions)[0]
+
+    def most_similar(self, vector, limit, exclude=None):
+        """Kosinus bo‘yicha eng o‘xshash `limit` ta kitob: [(UUID, ball)]"""
+        np = self.np
+        if not len(self.ids):
+            return []
+        scores = self.vectors @ vector
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        limit = min(limit, len(scores) - (exclude is not None))
+        if limit <= 0:
+            return []
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(uuid.UUID(bytes=self.ids[i].tobytes()), float(scores[i])) for i in best if scores[i] > 0]
+
+
+def load_index():
+    """Joriy indeks (meta.json o‘zgarsa — qayta ochiladi); indeks bo‘lmasa — None"""
+    global _index
+    np = _require_numpy()
+    meta_path = _index_dir() / 'meta.json'
+    try:
+        mtime = meta_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _index_lock:
+        if _index is None or _index.mtime != mtime or _index.np is not np:
+            meta = json.loads(meta_path.read_text())
+            if meta.get('format') != INDEX_FORMAT:
+                return None  # eski formatdagi indeks — to‘liq qayta qurish kerak
+            _index = SimilarityIndex(np, meta, mtime)
+        return _index
+
+
+def similar_books(book_id, limit, load_book=None):
+    """
+    Kitobga o‘xshash kitoblar: indeksdagi kitob — bazaga murojaatsiz,
+    yangi kitob — `load_book()` orqali o‘qib, joyida vektorlanadi.
+    """
+    index = load_index()
+    if index is None:
+        return []
+    position = index.positions.get(_book_key(book_id))
+    if position is not None:
+        return index.most_similar(index.np.array(index.vectors[position]), limit, exclude=position)
+    book = load_book() if load_book else None
+    if book is None:
+        return []
+    return index.most_similar(index.vector_for(book), limit)
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from jigar_bookstore.models import (
+    User, Category, Author, Book, Review, Order, OrderItem, Payment
+)
+
+
+class AdminChangelistQueryCountTestCase(TestCase):
+    """Admin ro‘yxat sahifalari so‘rovlar soni qatorlar soniga bog‘liq emasligini tekshiradi"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin12345@'
+        )
+        self.client.force_login(self.admin)
+        self.category = Category.objects.create(name="Fantastika")
+        self.author = Author.objects.create(full_name="Ali Akbar")
+        self.counter = 0
+
+    def _add_rows(self, n):
+        """Har bir admin uchun `n` tadan yangi qator qo‘shadi"""
+        for _ in range(n):
+            self.counter += 1
+            user = User.objects.create_user(
+                username=f'user{self.counter}', email=f'user{self.counter}@example.com', password='x'
+            )
+            book = Book.objects.create(
+                title=f"Kitob {self.counter}", author=self.author, category=self.category,
+                description="", price=1000, isbn=f"{self.counter:013d}"
+            )
+            Review.objects.create(user=user, book=book, rating=4)
+            order = Order.objects.create(user=user)
+            OrderItem.objects.create(order=order, book=book, quantity=1, price=1000)
+            Payment.objects.create(order=order, payment_method='card', transaction_id=f'tx{self.counter}')
+
+    def _changelist_queries(self, model):
+        url = reverse(f'admin:jigar_bookstore_{model._meta.model_name}_changelist')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        models = [Book, Review, Order, OrderItem, Payment]
+
+        self._add_rows(2)
+        small = {model: self._changelist_queries(model) for model in models}
+
+        self._add_rows(6)
+        large = {model: self._changelist_queries(model) for model in models}
+
+        for model in models:
+            self.assertEqual(small[model], large[model], model.__name__)
+        print("✅ Admin changelist so‘rovlari soni:", {m.__name__: c for m, c in large.items()})
+
+    def test_review_reactions_not_editable(self):
+        """Reaksiyalar admin’da tahrirlanmaydi — hisoblagichlar M2M bilan mos qoladi"""
+        self._add_rows(1)
+        review = Review.objects.get()
+        response = self.client.get(reverse('admin:jigar_bookstore_review_change', args=[review.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('name="likes"', response.content.decode())
+        self.assertNotIn('name="dislikes"', response.content.decode())
+        self.assertNotIn('name="likes_count"', response.content.decode())
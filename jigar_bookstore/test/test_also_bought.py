@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.models import User, Category, Author, Book, BookNeighbor, Order, OrderItem
+
+try:
+    import numpy  # noqa: F401
+    import scipy  # noqa: F401
+except ImportError:
+    numpy = None
+
+
+class AlsoBoughtTestCase(APITestCase):
+    """Birga sotib olish matritsasidan qo‘shnilar va /books/{id}/also-bought/"""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(RECOMMENDATIONS_DIR=directory.name, ALSO_BOUGHT_TOP_K=2)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='x')
+        author = Author.objects.create(full_name="Ali Akbar")
+        category = Category.objects.create(name="Fantastika")
+        self.books = [
+            Book.objects.create(title=f"Kitob {i}", author=author, category=category,
+                                description="", price=1000, stock=10, isbn=f"{i:013d}")
+            for i in range(4)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def _order(self, *indexes, status='paid'):
+        order = Order.objects.create(user=self.user, status=status)
+        for index in indexes:
+            OrderItem.objects.create(order=order, book=self.books[index], quantity=1, price=1000)
+        return order
+
+    def _neighbors(self, index):
+        return [
+            (self.books.index(item.neighbor), item.co_purchases)
+            for item in BookNeighbor.objects.filter(book=self.books[index]).order_by('-score', 'neighbor_id')
+        ]
+
+    def test_endpoint_single_query(self):
+        BookNeighbor.objects.create(book=self.books[0], neighbor=self.books[2], score=0.5, co_purchases=1)
+        BookNeighbor.objects.create(book=self.books[0], neighbor=self.books[1], score=0.9, co_purchases=3)
+        url = reverse('book-also-bought', args=[self.books[0].id])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['results']],
+                         [str(self.books[1].id), str(self.books[2].id)])
+        self.assertEqual(response.data['results'][0]['co_purchases'], 3)
+
+    @unittest.skipUnless(numpy, "numpy/scipy o‘rnatilmagan")
+    def test_full_and_incremental_build(self):
+        from jigar_bookstore import recommendations
+
+        self._order(0, 1)
+        self._order(0, 1, 2)
+        self._order(0, 3, status='pending')
+        recommendations.build_full()
+        self.assertEqual(self._neighbors(0), [(1, 2), (2, 1)])
+        self.assertEqual(self._neighbors(3), [])
+
+        # Yangi to‘langan buyurtma — faqat tegilgan kitoblar qayta hisoblanadi
+        self._order(0, 3)
+        self._order(0, 3)
+        self._order(0, 3)
+        self.assertGreater(recommendations.update_incremental(), 0)
+        self.assertEqual(self._neighbors(0), [(3, 3), (1, 2)])
+        self.assertEqual(self._neighbors(3), [(0, 3)])
+        self.assertEqual(recommendations.update_incremental(), 0)
+
+        # `paid` dan chiqqan buyurtma ayiriladi, `paid` ga o‘tgani qo‘shiladi
+        order = Order.objects.filter(items__book=self.books[2]).get()
+        order.status = 'cancelled'
+        order.save(update_fields=['status'])
+        pending = Order.objects.get(status='pending')
+        pending.status = 'paid'
+        pending.save(update_fields=['status'])
+        self.assertGreater(recommendations.update_incremental(), 0)
+        self.assertEqual(self._neighbors(0), [(3, 4), (1, 1)])
+        self.assertEqual(self._neighbors(2), [])
+
+        # To‘liq qayta qurish bilan bir xil natija
+        incremental = {index: self._neighbors(index) for index in range(4)}
+        recommendations.build_full()
+        self.assertEqual({index: self._neighbors(index) for index in range(4)}, incremental)
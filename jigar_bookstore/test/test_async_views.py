@@ -0,0 +1,103 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.async_views import async_catalog_view
+from jigar_bookstore.filters import BookFilterSet
+from jigar_bookstore.models import User, Category, Author, Book
+from jigar_bookstore.views import BookViewSet, CategoryViewSet
+
+
+class AsyncCatalogViewTestCase(APITestCase):
+    """Async o‘qish yo‘li sinxron DRF javobi bilan bir xil natija qaytaradi"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='ali12345@')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.factory = AsyncRequestFactory(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.category = Category.objects.create(name="Fantastika")
+        self.author = Author.objects.create(full_name="Ali Akbar")
+        for i in range(12):
+            Book.objects.create(
+                title=f"Sehrli Dunyo {i}", author=self.author, category=self.category,
+                description="Qiziqarli hikoya", price=1000 + i, isbn=f"{i:013d}"
+            )
+
+    async def _get(self, viewset, path, detail=False, **kwargs):
+        response = await async_catalog_view(viewset, detail=detail)(self.factory.get(path), **kwargs)
+        return response.status_code, json.loads(response.content)
+
+    async def async_client_get(self, path):
+        """Taqqoslash uchun mavjud sinxron DRF yo‘li"""
+        response = await sync_to_async(self.client.get)(path)
+        return json.loads(response.content)
+
+    async def test_list_matches_sync(self):
+        path = reverse('book-list') + f'?search=Sehrli&category={self.category.id}&ordering=-price&page=2'
+        status_code, data = await self._get(BookViewSet, path)
+        expected = await self.async_client_get(path)
+        self.assertEqual(status_code, 200)
+        self.assertEqual(data, expected)
+        self.assertEqual(data['count'], 12)
+        self.assertEqual(len(data['results']), 2)
+
+    async def test_retrieve_and_errors(self):
+        book = await Book.objects.afirst()
+        path = reverse('book-detail', args=[book.id])
+        status_code, data = await self._get(BookViewSet, path, detail=True, pk=book.id)
+        self.assertEqual(status_code, 200)
+        self.assertEqual(data, await self.async_client_get(path))
+
+        status_code, _ = await self._get(
+            CategoryViewSet, reverse('category-detail', args=[self.author.id]), detail=True, pk=self.author.id
+        )
+        self.assertEqual(status_code, 404)
+        status_code, _ = await self._get(BookViewSet, reverse('book-list') + '?page=99')
+        self.assertEqual(status_code, 404)
+        status_code, _ = await self._get(BookViewSet, reverse('book-list') + '?category=not-a-uuid')
+        self.assertEqual(status_code, 400)
+
+    async def test_category_tree_filter(self):
+        child = await Category.objects.acreate(name="Ilmiy fantastika", parent=self.category)
+        await Book.objects.acreate(
+            title="Yulduzlar", author=self.author, category=child,
+            description="Kosmos", price=500, isbn="9999999999999"
+        )
+        path = reverse('book-list') + f'?category_tree={self.category.id}'
+        status_code, data = await self._get(BookViewSet, path)
+        self.assertEqual(status_code, 200)
+        self.assertEqual(data, await self.async_client_get(path))
+        self.assertEqual(data['count'], 13)
+
+        status_code, data = await self._get(BookViewSet, reverse('book-list') + f'?category_tree={self.author.id}')
+        self.assertEqual(status_code, 200)
+        self.assertEqual(data['count'], 0)
+
+    async def test_every_book_filter_matches_sync(self):
+        """Har bir filtr async yo‘lda ishlaydi — filtr ichidagi so‘rov ham event loop’ni buzmaydi"""
+        samples = {
+            'category': self.category.id,
+            'category__in': f'{self.category.id},{self.author.id}',
+            'author': self.author.id,
+            'author__in': self.author.id,
+            'category_tree': self.category.id,
+            'price_min': 1005,
+            'price_max': 1003,
+            'in_stock': 'false',
+            'published_after': '2000-01-01',
+            'published_before': '2100-01-01',
+            'isbn': f'{3:013d}',
+        }
+        self.assertEqual(set(samples), set(BookFilterSet.base_filters))
+        for name, value in samples.items():
+            with self.subTest(filter=name):
+                path = reverse('book-list') + f'?{name}={value}'
+                status_code, data = await self._get(BookViewSet, path)
+                self.assertEqual(status_code, 200)
+                self.assertEqual(data, await self.async_client_get(path))
@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore import autocomplete
+from jigar_bookstore.models import Category, Author, Book
+
+
+@override_settings(AUTOCOMPLETE_VERSION_CHECK=0)
+class AutocompleteTestCase(APITestCase):
+    """Xotiradagi prefiks indeksi: nom, muallif, ISBN va versiya bilan yangilanish"""
+
+    def setUp(self):
+        cache.clear()
+        autocomplete._index = None
+        self.url = reverse('book-autocomplete')
+        self.tolkien = Author.objects.create(full_name="J. R. R. Tolkien")
+        self.qodiriy = Author.objects.create(full_name="Abdulla Qodiriy")
+        category = Category.objects.create(name="Fantastika")
+        self.rings = Book.objects.create(
+            title="Uzuklar hukmdori", author=self.tolkien, category=category,
+            description="", price=1000, isbn='9780000000001',
+        )
+        self.days = Book.objects.create(
+            title="O‘tkan kunlar", author=self.qodiriy, category=category,
+            description="", price=1000, isbn='9780000000002',
+        )
+
+    def _labels(self, query):
+        response = self.client.get(self.url, {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(row['type'], row['label']) for row in response.data['results']]
+
+    def test_prefixes(self):
+        self.assertEqual(self._labels('uzu'), [('book', "Uzuklar hukmdori")])
+        self.assertEqual(self._labels('HUKM'), [('book', "Uzuklar hukmdori")])
+        self.assertEqual(self._labels("o'tkan"), [('book', "O‘tkan kunlar")])
+        self.assertEqual(self._labels('qod'), [('author', "Abdulla Qodiriy")])
+        self.assertEqual(self._labels('978000000000'), [('book', "O‘tkan kunlar"), ('book', "Uzuklar hukmdori")])
+        self.assertEqual(self._labels(''), [])
+        self.assertEqual(set(self.client.get(self.url, {'q': 'uzu'}).data['results'][0]), {'id', 'label', 'type'})
+
+    def test_served_from_memory_and_rebuilt_on_change(self):
+        self._labels('uzu')
+        with self.assertNumQueries(0):
+            self._labels('abd')
+
+        # Indeksga aloqasi yo‘q maydon — versiya o‘zgarmaydi
+        self.rings.stock = 5
+        self.rings.save(update_fields=['stock'])
+        with self.assertNumQueries(0):
+            self._labels('uzu')
+
+        self.rings.title = "Hobbit"
+        self.rings.save()
+        self.assertEqual(self._labels('uzu'), [])
+        self.assertEqual(self._labels('hob'), [('book', "Hobbit")])
+
+        self.qodiriy.delete()
+        self.assertEqual(self._labels('qod'), [])
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.caching import get_version
+from jigar_bookstore.models import User, Category, Author, Book
+
+
+class BookBulkUpdateTestCase(APITestCase):
+    """Sotuvchi narx va qoldiqni bitta so‘rov bilan yangilaydi"""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='seller12345@', is_seller=True
+        )
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='ali12345@')
+        author = Author.objects.create(full_name="Ali Akbar")
+        category = Category.objects.create(name="Fantastika")
+        self.book1 = Book.objects.create(title="Sehrli Dunyo", author=author, category=category,
+                                         description="", price=55000, stock=1, isbn="1000000000001")
+        self.book2 = Book.objects.create(title="Tarix Sirlari", author=author, category=category,
+                                         description="", price=70000, stock=2, isbn="1000000000002")
+        self.url = reverse('book-bulk-update')
+
+    def test_bulk_update(self):
+        self.client.force_authenticate(user=self.seller)
+        version = get_version('book-facets')
+        payload = [
+            {'id': str(self.book1.id), 'price': '60000.00'},
+            {'isbn': '1000000000002', 'stock': 25},
+            {'isbn': '9999999999999', 'stock': 1},
+            {'price': '100'},
+        ]
+        # kitoblarni topish + SAVEPOINT, qoldiqlarni qulflash, jurnalga INSERT, bitta UPDATE, RELEASE
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['updated']), {self.book1.id, self.book2.id})
+        self.assertEqual([error['index'] for error in response.data['errors']], [2, 3])
+
+        self.book1.refresh_from_db()
+        self.book2.refresh_from_db()
+        self.assertEqual(self.book1.price, 60000)
+        self.assertEqual(self.book2.stock, 25)
+        # Qoldiq ustidan yozilmaydi — farq ombor jurnaliga tuzatish sifatida tushadi
+        self.assertEqual(
+            list(self.book2.stock_movements.order_by('id').values_list('kind', 'quantity')),
+            [('receipt', 2), ('adjustment', 23)],
+        )
+        self.assertFalse(self.book1.stock_movements.exclude(kind='receipt').exists())
+        self.assertGreater(get_version('book-facets'), version)
+        print("✅ Ommaviy yangilash:", response.data)
+
+    def test_requires_seller(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, [{'id': str(self.book1.id), 'stock': 3}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
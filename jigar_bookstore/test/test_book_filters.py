@@ -0,0 +1,102 @@
+import re
+from datetime import date, timedelta
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.filters import BookFilterSet
+from jigar_bookstore.models import User, Category, Author, Book
+
+
+class BookFilterSetTestCase(APITestCase):
+    """BookFilterSet: narx, ombor, sana, ko‘p qiymatli va ISBN filtrlari"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='ali12345@')
+        self.client.force_authenticate(user=self.user)
+        self.fantasy = Category.objects.create(name="Fantastika")
+        self.history = Category.objects.create(name="Tarixiy")
+        self.poetry = Category.objects.create(name="She'riyat")
+        self.author = Author.objects.create(full_name="Ali Akbar")
+        self._book("Sehrli Dunyo", self.fantasy, 45000, 0, date(2019, 5, 1), "1000000000001")
+        self._book("Tarix Sirlari", self.history, 70000, 4, date(2021, 3, 1), "1000000000002")
+        self._book("Gullar", self.poetry, 120000, 9, date(2023, 1, 1), "1000000000003")
+
+    def _book(self, title, category, price, stock, published, isbn):
+        Book.objects.create(title=title, author=self.author, category=category, description="",
+                            price=price, stock=stock, published_date=published, isbn=isbn)
+
+    def _titles(self, params):
+        response = self.client.get(reverse('book-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {book['title'] for book in response.data['results']}
+
+    def test_filters(self):
+        self.assertEqual(self._titles({'price_min': 50000, 'price_max': 100000}), {"Tarix Sirlari"})
+        self.assertEqual(self._titles({'in_stock': 'true'}), {"Tarix Sirlari", "Gullar"})
+        self.assertEqual(self._titles({'in_stock': 'false'}), {"Sehrli Dunyo"})
+        self.assertEqual(self._titles({'published_after': '2020-01-01', 'published_before': '2022-01-01'}),
+                         {"Tarix Sirlari"})
+        self.assertEqual(self._titles({'category__in': f'{self.fantasy.id},{self.poetry.id}'}),
+                         {"Sehrli Dunyo", "Gullar"})
+        self.assertEqual(self._titles({'author__in': str(self.author.id)}),
+                         {"Sehrli Dunyo", "Tarix Sirlari", "Gullar"})
+        self.assertEqual(self._titles({'isbn': '1000000000003'}), {"Gullar"})
+        print("✅ BookFilterSet filtrlari ishladi")
+
+
+class BookFilterQueryPlanTestCase(APITestCase):
+    """
+    Har bir filtr indeks orqali bajariladi — kitoblar jadvali to‘liq skan qilinmaydi.
+    Rejalashtiruvchi majburlanmaydi: jadval haqiqatga yaqin ma’lumot va statistika bilan.
+    """
+
+    BOOKS = 5000
+    # Filtr -> (indekslangan ustun, tanlovchan so‘rov parametrlari)
+    FILTERS = {
+        'price': ('price', {'price_min': '1000', 'price_max': '5000'}),
+        # `true` katalogning ko‘p qismiga mos — u yerda to‘liq skan to‘g‘ri tanlov
+        'in_stock': ('stock', {'in_stock': 'false'}),
+        'published_date': ('published_date', {'published_after': '2020-01-01', 'published_before': '2021-01-01'}),
+        'category__in': ('category_id', {'category__in': '6f1c1a52-5a4e-4d0e-9a53-6f1f3f6f5b11,'
+                                                         '0b3d7a4e-1c2d-4e5f-8a9b-0c1d2e3f4a5b'}),
+        'author__in': ('author_id', {'author__in': '6f1c1a52-5a4e-4d0e-9a53-6f1f3f6f5b11'}),
+        'isbn': ('isbn', {'isbn': '9780000000001'}),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        categories = [Category.objects.create(name=f"Kategoriya {i}") for i in range(20)]
+        authors = Author.objects.bulk_create([Author(full_name=f"Muallif {i}") for i in range(200)])
+        Book.objects.bulk_create([
+            Book(
+                title=f"Kitob {i}", description="", author=authors[i % len(authors)],
+                category=categories[i % len(categories)], price=10000 + (i * 7919) % 990000,
+                # Katalogning ~2% i omborda yo‘q
+                stock=0 if i % 50 == 0 else 1 + i % 30,
+                published_date=date(1950, 1, 1) + timedelta(days=(i * 37) % 27000), isbn=f"{i:013d}",
+            )
+            for i in range(cls.BOOKS)
+        ], batch_size=500)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Book._meta.db_table}')
+
+    def test_filter_columns_are_indexed(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Book._meta.db_table)
+        leading = {info['columns'][0] for info in constraints.values()
+                   if (info['index'] or info['unique']) and info['columns']}
+        for name, (column, _) in self.FILTERS.items():
+            self.assertIn(column, leading, name)
+
+    def test_no_sequential_scan(self):
+        table = Book._meta.db_table
+        if connection.vendor == 'postgresql':
+            full_scan = re.compile(rf'Seq Scan on {table}\b')
+        else:
+            full_scan = re.compile(rf'\bSCAN {table}\b(?! USING (COVERING )?INDEX)')
+        for name, (_, params) in self.FILTERS.items():
+            plan = BookFilterSet(params, queryset=Book.objects.all()).qs.explain()
+            self.assertIsNone(full_scan.search(plan), f"{name}: {plan}")
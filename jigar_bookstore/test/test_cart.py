@@ -0,0 +1,121 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.cart import add_item, checkout, open_cart, set_quantity
+from jigar_bookstore.models import User, Category, Author, Book, Cart, Order, OrderItem, UserOrderSummary
+
+
+class CartTestCase(APITestCase):
+    """Savat serverda saqlanadi, rasmiylashtirish bitta tranzaksiyada va takrorlanmaydi"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='ali12345@')
+        author = Author.objects.create(full_name="Ali Akbar")
+        category = Category.objects.create(name="Fantastika")
+        self.book1 = Book.objects.create(title="Sehrli Dunyo", author=author, category=category,
+                                         description="", price=50000, stock=5, isbn="1000000000001")
+        self.book2 = Book.objects.create(title="Tarix Sirlari", author=author, category=category,
+                                         description="", price=70000, stock=1, isbn="1000000000002")
+        self.client.force_authenticate(user=self.user)
+        self.cart_url = reverse('cart-list')
+        self.items_url = reverse('cart-items')
+        self.checkout_url = reverse('cart-checkout')
+
+    def _item_url(self, book):
+        return reverse('cart-item', kwargs={'book_id': str(book.pk)})
+
+    def test_add_update_remove(self):
+        self.assertIsNone(self.client.get(self.cart_url).data['id'])
+        self.client.post(self.items_url, {'book': str(self.book1.pk)}, format='json')
+        cart = Cart.objects.get(user=self.user)
+
+        # kitob + ochiq savat + savat qulfi + bitta UPDATE (+ test tranzaksiyasidagi SAVEPOINT/RELEASE)
+        with self.assertNumQueries(6):
+            response = self.client.post(self.items_url, {'book': str(self.book1.pk), 'quantity': 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.client.put(self._item_url(self.book2), {'quantity': 1}, format='json')
+
+        with self.assertNumQueries(2):  # savat + mahsulotlar kitoblari bilan
+            response = self.client.get(self.cart_url)
+        self.assertEqual(response.data['id'], str(cart.pk))
+        self.assertEqual([(item['title'], item['quantity']) for item in response.data['items']],
+                         [("Sehrli Dunyo", 3), ("Tarix Sirlari", 1)])
+        self.assertEqual(response.data['total'], '220000.00')
+
+        self.client.delete(self._item_url(self.book2))
+        self.client.put(self._item_url(self.book1), {'quantity': 1}, format='json')
+        response = self.client.get(self.cart_url)
+        self.assertEqual([(item['title'], item['quantity']) for item in response.data['items']],
+                         [("Sehrli Dunyo", 1)])
+        self.assertEqual(Cart.objects.count(), 1)
+
+        response = self.client.post(self.items_url, {'book': str(self.book1.pk), 'quantity': 0}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_checkout_is_idempotent(self):
+        self.client.post(self.items_url, {'book': str(self.book1.pk), 'quantity': 2}, format='json')
+        self.client.post(self.items_url, {'book': str(self.book2.pk)}, format='json')
+        cart_id = self.client.get(self.cart_url).data['id']
+
+        response = self.client.post(self.checkout_url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Decimal(response.data['total_amount']), Decimal('170000'))
+        self.assertEqual(len(response.data['items']), 2)
+        order_id = response.data['id']
+
+        # Javob yo‘qolgan — mijoz shu savat bilan qayta yuboradi
+        retry = self.client.post(self.checkout_url, {'cart': str(cart_id)}, format='json')
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.data['id'], order_id)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(OrderItem.objects.filter(order_id=order_id).count(), 2)
+        self.assertEqual(UserOrderSummary.objects.get(user=self.user).pending_count, 1)
+
+        # Savat ko‘rsatilmagan takroriy so‘rov — yaqinda yopilgan savat buyurtmasi
+        self.assertIsNone(self.client.get(self.cart_url).data['id'])
+        retry = self.client.post(self.checkout_url, {}, format='json')
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.data['id'], order_id)
+        self.assertEqual(Order.objects.count(), 1)
+
+        # Oyna o‘tgach — rasmiylashtiriladigan savat yo‘q
+        Cart.objects.filter(pk=cart_id).update(updated_at=timezone.now() - timedelta(hours=1))
+        response = self.client.post(self.checkout_url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_checkout_rejects_missing_stock(self):
+        self.client.post(self.items_url, {'book': str(self.book2.pk), 'quantity': 2}, format='json')
+        response = self.client.post(self.checkout_url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('stock', response.data)
+        self.assertFalse(Order.objects.exists())
+        self.assertIsNone(Cart.objects.get(user=self.user).order_id)
+
+    def test_other_users_cart_is_invisible(self):
+        self.client.post(self.items_url, {'book': str(self.book1.pk)}, format='json')
+        cart = Cart.objects.get(user=self.user)
+        other = User.objects.create_user(username='vali', email='vali@example.com', password='x')
+        self.client.force_authenticate(user=other)
+        response = self.client.post(self.checkout_url, {'cart': str(cart.pk)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(self.client.get(self.cart_url).data['id'])
+
+    def test_changes_after_checkout_go_to_new_cart(self):
+        cart = open_cart(self.user)
+        add_item(cart, self.book1.pk, 1)
+        # Rasmiylashtirish o‘zgartirish so‘rovi savatni o‘qigandan keyin, qulfdan oldin tugadi
+        order, _ = checkout(self.user)
+
+        fresh = add_item(cart, self.book2.pk, 1)
+        self.assertNotEqual(fresh.pk, cart.pk)
+        set_quantity(cart, self.book1.pk, 3)
+        self.assertEqual(list(order.items.values_list('book_id', 'quantity')), [(self.book1.pk, 1)])
+        self.assertEqual(sorted(fresh.items.values_list('quantity', flat=True)), [1, 3])
+        self.assertEqual(Cart.objects.filter(user=self.user, order__isnull=True).count(), 1)
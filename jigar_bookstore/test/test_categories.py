@@ -0,0 +1,78 @@
+import uuid
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.models import User, Category, Author, Book
+
+
+class CategoryTreeTestCase(APITestCase):
+    """Kategoriya daraxti: yo‘llar, daraxt osti filtri va kitoblar soni"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin12345@'
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.author = Author.objects.create(full_name="Ali Akbar")
+
+        self.fiction = Category.objects.create(name="Badiiy")
+        self.fantasy = Category.objects.create(name="Fantastika", parent=self.fiction)
+        self.epic = Category.objects.create(name="Epik fantastika", parent=self.fantasy)
+        self.history = Category.objects.create(name="Tarix")
+
+        self.books = [
+            self._book("Sehrli Dunyo", self.fantasy, "1000000000001"),
+            self._book("Uzuklar hukmdori", self.epic, "1000000000002"),
+            self._book("Jamila", self.fiction, "1000000000003"),
+            self._book("Temur tuzuklari", self.history, "1000000000004"),
+        ]
+
+    def _book(self, title, category, isbn):
+        return Book.objects.create(
+            title=title, author=self.author, category=category, description="", price=1000, isbn=isbn
+        )
+
+    def _counts(self):
+        return {
+            category.name: category.books_count
+            for category in Category.objects.all()
+        }
+
+    def test_paths_and_subtree_filter(self):
+        self.assertEqual(self.epic.path, self.fiction.path + self.fantasy.id.hex + '/' + self.epic.id.hex + '/')
+        self.assertEqual(self.epic.depth, 2)
+        self.assertEqual(set(self.fiction.get_descendants()), {self.fiction, self.fantasy, self.epic})
+
+        response = self.client.get(reverse('book-list'), {'category_tree': str(self.fantasy.id)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = {book['title'] for book in response.data['results']}
+        self.assertEqual(titles, {"Sehrli Dunyo", "Uzuklar hukmdori"})
+
+        response = self.client.get(reverse('book-list'), {'category_tree': str(uuid.uuid4())})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+        print("✅ Daraxt osti filtri ishladi:", titles)
+
+    def test_books_count_is_maintained(self):
+        self.assertEqual(self._counts(), {"Badiiy": 3, "Fantastika": 2, "Epik fantastika": 1, "Tarix": 1})
+
+        book = self.books[1]
+        book.category = self.history
+        book.save()
+        self.books[0].delete()
+        self.assertEqual(self._counts(), {"Badiiy": 1, "Fantastika": 0, "Epik fantastika": 0, "Tarix": 2})
+
+    def test_move_subtree(self):
+        url = reverse('category-detail', args=[self.fantasy.id])
+        response = self.client.patch(url, {'parent': str(self.history.id)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.epic.refresh_from_db()
+        self.assertTrue(self.epic.path.startswith(self.history.path))
+        self.assertEqual(self.epic.depth, 2)
+        self.assertEqual(self._counts(), {"Badiiy": 1, "Fantastika": 2, "Epik fantastika": 1, "Tarix": 3})
+
+        # O‘z ichki kategoriyasiga ko‘chirish taqiqlangan
+        response = self.client.patch(url, {'parent': str(self.epic.id)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,107 @@
+import io
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.caching import invalidate_book_caches
+from jigar_bookstore.covers import schedule_cover_processing
+from jigar_bookstore.models import User, Category, Author, Book
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, COVER_PROCESSING_ASYNC=False, COVER_THUMBNAIL_SIZES=(160, 320))
+class BookCoverTestCase(APITestCase):
+    """Muqova yuklanganda WebP eskizlar yaratilishi va serializer URL’lari"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='seller12345@', is_seller=True
+        )
+        self.author = Author.objects.create(full_name="Ali Akbar")
+        self.category = Category.objects.create(name="Fantastika")
+
+    def _image(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 1200), 'navy').save(buffer, 'JPEG')
+        return SimpleUploadedFile('cover.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def _create_book(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            book = Book.objects.create(title="Muqovali kitob", author=self.author, category=self.category,
+                                       description="", price=50000, stock=3, isbn="2222222222222",
+                                       cover_image=self._image())
+        return book
+
+    def test_stale_save_keeps_variants(self):
+        book = self._create_book()
+        # Kitob eskizlar tayyor bo‘lishidan oldin o‘qilgan: xotiradagi nusxada `{}`
+        Book.objects.filter(pk=book.pk).update(cover_variants={})
+        stale = Book.objects.get(pk=book.pk)
+        schedule_cover_processing(book)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            stale.title = "Muqovali kitob (2-nashr)"
+            stale.save()
+        # Faqat kesh yangilanadi — eskizlar qayta navbatga qo‘yilmaydi
+        self.assertEqual([callback for callback in callbacks if callback is not invalidate_book_caches], [])
+        self.assertEqual(sorted(Book.objects.get(pk=book.pk).cover_variants['sizes']), ['160', '320'])
+
+    def test_replaced_cover_removes_old_thumbnails(self):
+        book = Book.objects.get(pk=self._create_book().pk)
+        old = [item['name'] for item in book.cover_variants['sizes'].values()]
+        self.assertTrue(all(os.path.exists(os.path.join(MEDIA_ROOT, name)) for name in old))
+
+        book.cover_image = self._image()
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+        book.refresh_from_db()
+        self.assertEqual(book.cover_variants['source'], book.cover_image.name)
+        self.assertFalse(any(os.path.exists(os.path.join(MEDIA_ROOT, name)) for name in old))
+        self.assertTrue(all(
+            os.path.exists(os.path.join(MEDIA_ROOT, item['name'])) for item in book.cover_variants['sizes'].values()
+        ))
+
+    def test_deleted_book_removes_thumbnails(self):
+        book = Book.objects.get(pk=self._create_book().pk)
+        names = [item['name'] for item in book.cover_variants['sizes'].values()]
+        self.assertTrue(all(os.path.exists(os.path.join(MEDIA_ROOT, name)) for name in names))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+        self.assertFalse(any(os.path.exists(os.path.join(MEDIA_ROOT, name)) for name in names))
+
+    def test_upload_creates_thumbnails(self):
+        self.client.force_authenticate(user=self.seller)
+        data = {
+            "title": "Muqovali kitob", "author": str(self.author.id), "category": str(self.category.id),
+            "description": "Rasm bilan", "price": "50000", "stock": 3, "isbn": "1111111111111",
+            "cover_image": self._image(),
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('book-list'), data, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        book = Book.objects.get(isbn="1111111111111")
+        sizes = book.cover_variants['sizes']
+        self.assertEqual(sorted(sizes), ['160', '320'])
+        self.assertEqual(sizes['160']['width'], 160)
+        self.assertEqual(sizes['160']['height'], 240)
+
+        response = self.client.get(reverse('book-list'))
+        self.assertTrue(response.data['results'][0]['cover_url'].endswith('_160.webp'))
+        response = self.client.get(reverse('book-detail', args=[book.id]))
+        self.assertTrue(response.data['cover_url'].endswith('_320.webp'))
+        print("✅ Muqova eskizlari yaratildi:", sizes)
@@ -0,0 +1,103 @@
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from jigar_bookstore import db_routing
+from jigar_bookstore.db_routing import PrimaryReplicaRouter, ReplicaRoutingMiddleware
+from jigar_bookstore.models import Category, Author, Book
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_PIN_SECONDS=5, REPLICA_MAX_LAG=2)
+class ReplicaRoutingTestCase(TestCase):
+    """O‘qish replikasi tanlash, read-your-writes va lag bo‘yicha fallback"""
+
+    def setUp(self):
+        db_routing._lag_cache.clear()
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+        self.routed = []
+
+        def read_view(request):
+            self.routed.append(self.router.db_for_read(Book))
+            return HttpResponse()
+        read_view.replica_reads = True
+
+        def write_view(request):
+            return HttpResponse(status=201)
+
+        self.read_view, self.write_view = read_view, write_view
+
+    def _request(self, method, view, token='Token abc'):
+        middleware = ReplicaRoutingMiddleware(lambda request: (
+            middleware.process_view(request, view, (), {}) or view(request)
+        ))
+        request = getattr(self.factory, method)('/', HTTP_AUTHORIZATION=token)
+        return middleware(request)
+
+    @mock.patch.object(db_routing, 'replica_lag', return_value=0)
+    def test_safe_reads_go_to_replica(self, _):
+        self._request('get', self.read_view)
+        self.assertEqual(self.routed, ['replica1'])
+        # So‘rovdan tashqarida — asosiy baza
+        self.assertEqual(self.router.db_for_read(Book), 'default')
+        self.assertEqual(self.router.db_for_write(Book), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['replica1', 'replica2'])
+    @mock.patch.object(db_routing, 'replica_lag', return_value=0)
+    def test_replica_chosen_once_per_request(self, _):
+        def many_reads(request):
+            self.routed.extend(self.router.db_for_read(Book) for _ in range(20))
+            return HttpResponse()
+        many_reads.replica_reads = True
+
+        with mock.patch.object(db_routing.random, 'choice', wraps=db_routing.random.choice) as choice:
+            self._request('get', many_reads)
+        self.assertEqual(choice.call_count, 1)
+        self.assertEqual(len(set(self.routed)), 1)
+        self.assertIn(self.routed[0], ['replica1', 'replica2'])
+
+    @mock.patch.object(db_routing, 'replica_lag', return_value=0)
+    def test_reads_pinned_to_primary_after_write(self, _):
+        self._request('post', self.write_view)
+        self._request('get', self.read_view)
+        self._request('get', self.read_view, token='Token other')
+        self.assertEqual(self.routed, ['default', 'replica1'])
+
+    @mock.patch.object(db_routing, 'replica_lag', return_value=30)
+    def test_lagging_replica_falls_back_to_primary(self, _):
+        self._request('get', self.read_view)
+        self.assertEqual(self.routed, ['default'])
+
+    def test_migrations_skip_replicas(self):
+        self.assertFalse(self.router.allow_migrate('replica1', 'jigar_bookstore'))
+        self.assertTrue(self.router.allow_migrate('default', 'jigar_bookstore'))
+
+
+@skipUnless('replica1' in settings.DATABASES, "DB_PROFILE=sqlite DB_SQLITE_REPLICA=True bilan ishga tushiring")
+class SqliteReplicaAliasTestCase(TransactionTestCase):
+    """Ikki lokal SQLite alias bilan: katalog o‘qishi `replica1` ulanishidan o‘tadi"""
+    databases = '__all__'
+
+    def setUp(self):
+        db_routing._lag_cache.clear()
+        cache.clear()
+        author = Author.objects.create(full_name="Ali Akbar")
+        category = Category.objects.create(name="Fantastika")
+        Book.objects.create(title="Sehrli Dunyo", author=author, category=category,
+                            description="", price=1000, isbn="1234567890123")
+
+    def test_catalog_reads_use_replica_alias(self):
+        with CaptureQueriesContext(connections['replica1']) as replica, \
+                CaptureQueriesContext(connections['default']) as primary:
+            response = self.client.get(reverse('book-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertTrue(replica.captured_queries)
+        self.assertFalse(primary.captured_queries)
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.models import User, Category, Author, Book, Review
+
+
+class BookFacetsTestCase(APITestCase):
+    """Fasetlar endpointi: natijalar, guruhlangan sonlar va kesh invalidatsiyasi"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='ali12345@')
+        self.client.force_authenticate(user=self.user)
+        self.fantasy = Category.objects.create(name="Fantastika")
+        self.history = Category.objects.create(name="Tarixiy")
+        self.author1 = Author.objects.create(full_name="Ali Akbar")
+        self.author2 = Author.objects.create(full_name="Ortikboy Qahhor")
+        self.book1 = Book.objects.create(title="Sehrli Dunyo", author=self.author1, category=self.fantasy,
+                                         description="", price=45000, isbn="1000000000001")
+        Book.objects.create(title="Sehrli Qal'a", author=self.author2, category=self.fantasy,
+                            description="", price=120000, isbn="1000000000002")
+        Book.objects.create(title="Tarix Sirlari", author=self.author2, category=self.history,
+                            description="", price=70000, isbn="1000000000003")
+        Review.objects.create(user=self.user, book=self.book1, rating=4)
+        self.url = reverse('book-facets')
+
+    def _facet(self, data, name):
+        return {item['label']: item['count'] for item in data['facets'][name]}
+
+    def test_facets_follow_search(self):
+        response = self.client.get(self.url, {'search': 'Sehrli'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(self._facet(response.data, 'category'), {"Fantastika": 2})
+        self.assertEqual(self._facet(response.data, 'author'), {"Ali Akbar": 1, "Ortikboy Qahhor": 1})
+        self.assertEqual(self._facet(response.data, 'price'), {"0-50000": 1, "100000-200000": 1})
+        self.assertEqual(self._facet(response.data, 'rating'), {"4": 1, "0": 1})
+        print("✅ Fasetlar:", response.data['facets'])
+
+    def test_cache_invalidated_on_book_write(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.data['count'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            Book.objects.create(title="Yangi", author=self.author1, category=self.history,
+                                description="", price=10000, isbn="1000000000004")
+        second = self.client.get(self.url)
+        self.assertEqual(second.data['count'], 4)
+        self.assertEqual(self._facet(second.data, 'category'), {"Fantastika": 2, "Tarixiy": 2})
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.fuzzy import strict_word_similarity
+from jigar_bookstore.models import Category, Author, Book
+
+
+class FuzzySearchTestCase(APITestCase):
+    """Trigramma o‘xshashligi bo‘yicha qidiruv (SQLite’da Python varianti)"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('book-fuzzy')
+        self.category = Category.objects.create(name="Badiiy")
+        tolkien = Author.objects.create(full_name="J. R. R. Tolkien")
+        qodiriy = Author.objects.create(full_name="Abdulla Qodiriy")
+        tolstoy = Author.objects.create(full_name="Лев Толстой")
+        self.rings = self._book("Uzuklar hukmdori", tolkien, '9780000000001')
+        self.days = self._book("O‘tkan kunlar", qodiriy, '9780000000002')
+        self.war = self._book("Война и мир", tolstoy, '9780000000003')
+
+    def _book(self, title, author, isbn):
+        return Book.objects.create(
+            title=title, author=author, category=self.category, description="", price=1000, isbn=isbn
+        )
+
+    def _titles(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['title'] for row in response.data['results']]
+
+    def test_similarity_matches_pg_trgm(self):
+        # pg_trgm bilan bir xil: 4 ta umumiy trigramma / 12 ta birlashma
+        self.assertAlmostEqual(strict_word_similarity('tolkein', 'J. R. R. Tolkien'), 1 / 3)
+        self.assertEqual(strict_word_similarity('tolkien', 'J. R. R. Tolkien'), 1.0)
+        self.assertEqual(strict_word_similarity('', 'Tolkien'), 0.0)
+
+    def test_misspelled_title_and_author(self):
+        self.assertEqual(self._titles('hukmdor'), ["Uzuklar hukmdori"])
+        self.assertEqual(self._titles('Tolkein'), ["Uzuklar hukmdori"])
+        self.assertEqual(self._titles('Qodiri'), ["O‘tkan kunlar"])
+        self.assertEqual(self._titles('Толстои'), ["Война и мир"])
+        self.assertEqual(self._titles('voyna'), [])
+
+    def test_threshold_per_request(self):
+        self.assertEqual(self._titles('Tolkein', threshold='0.5'), [])
+        response = self.client.get(self.url, {'q': 'Tolkein', 'threshold': '5'})
+        self.assertEqual(response.data['threshold'], 1.0)
+        for threshold in ('abc', 'nan', 'inf', '-inf'):
+            self.assertEqual(
+                self.client.get(self.url, {'q': 'x', 'threshold': threshold}).status_code,
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+    def test_list_filters_apply(self):
+        other = Category.objects.create(name="Boshqa")
+        self.assertEqual(self._titles('Tolkein', category=other.id), [])
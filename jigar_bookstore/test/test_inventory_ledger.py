@@ -0,0 +1,178 @@
+import io
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.inventory import record_movement, stock_at, take_snapshots
+from jigar_bookstore.models import (
+    User, Category, Author, Book, Order, OrderItem, Payment, StockMovement, StockSnapshot
+)
+
+
+class InventoryLedgerTestCase(APITestCase):
+    """Qoldiq faqat jurnal orqali o‘zgaradi, vaqt bo‘yicha qoldiq nuqtalardan o‘qiladi"""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='seller12345@', is_seller=True
+        )
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='ali12345@')
+        author = Author.objects.create(full_name="Ali Akbar")
+        category = Category.objects.create(name="Fantastika")
+        self.book = Book.objects.create(title="Sehrli Dunyo", author=author, category=category,
+                                        description="", price=50000, stock=5, isbn="1000000000001")
+
+    def _order(self, quantity):
+        order = Order.objects.create(user=self.user)
+        OrderItem.objects.create(order=order, book=self.book, quantity=quantity, price=50000)
+        order.calculate_total()
+        return order
+
+    def _stock(self):
+        return Book.objects.filter(pk=self.book.pk).values_list('stock', flat=True).get()
+
+    def _ledger(self):
+        return list(self.book.stock_movements.order_by('id').values_list('kind', 'quantity'))
+
+    def test_order_sale_and_cancellation(self):
+        order = self._order(quantity=2)
+        Payment.objects.create(order=order, payment_method='card', transaction_id='tx1', status='success')
+        self.assertEqual(self._stock(), 3)
+
+        # Takroriy `paid` saqlash ikkinchi sotuv yozmaydi
+        order = Order.objects.get(pk=order.pk)
+        order.save()
+        order.status = 'cancelled'
+        order.save(update_fields=['status'])
+        self.assertEqual(self._stock(), 5)
+        self.assertEqual(self._ledger(), [('receipt', 5), ('sale', -2), ('cancellation', 2)])
+        call_command('reconcile_stock', stdout=io.StringIO())
+
+    def test_oversell_keeps_payment_and_flags_order(self):
+        order = self._order(quantity=6)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('payment-list'), {
+            'order': str(order.pk), 'payment_method': 'card', 'transaction_id': 'tx2', 'status': 'success',
+        }, format='json')
+        # Mijoz to‘lagan — to‘lov saqlanadi, omborda bor 5 tasi sotiladi, buyurtma belgilanadi
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(pk=order.pk)
+        self.assertEqual((order.status, order.stock_shortage), ('paid', True))
+        self.assertEqual(self._stock(), 0)
+
+        # Bekor qilinsa — jurnal bo‘yicha haqiqatda sotilgani qaytadi
+        order.status = 'cancelled'
+        order.save(update_fields=['status'])
+        self.assertEqual(self._stock(), 5)
+        self.assertEqual(self._ledger(), [('receipt', 5), ('sale', -5), ('cancellation', 5)])
+        call_command('reconcile_stock', stdout=io.StringIO())
+
+    def test_stale_instance_does_not_clobber_stock(self):
+        stale = Book.objects.get(pk=self.book.pk)
+        record_movement(self.book.pk, StockMovement.SALE, -3)
+        stale.title = "Sehrli Dunyo (2-nashr)"
+        stale.save()
+        self.assertEqual(self._stock(), 2)
+
+        # Qo‘lda o‘zgartirilgan qoldiq — o‘qilgan qiymatga nisbatan tuzatish
+        stale.stock = 10
+        stale.save()
+        self.assertEqual(self._stock(), 7)
+        self.assertEqual(self._ledger()[-1], ('adjustment', 5))
+
+    def test_failed_adjustment_raises_django_validation_error(self):
+        stale = Book.objects.get(pk=self.book.pk)
+        record_movement(self.book.pk, StockMovement.SALE, -4)
+        stale.stock = 0
+        # Admin formasi oldindan tekshiradi; save’ning o‘zi ham DRF’dan tashqarida Django xatosini beradi
+        with self.assertRaises(ValidationError) as form_error:
+            stale.full_clean()
+        self.assertIn('stock', form_error.exception.message_dict)
+        with self.assertRaises(ValidationError):
+            stale.save()
+        self.assertEqual(self._stock(), 1)
+
+    def test_order_created_as_paid_records_sale(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('order-list'), {
+            'status': 'paid', 'is_paid': True,
+            'items': [{'book': str(self.book.pk), 'quantity': 2, 'price': '50000.00'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['status'], 'paid')
+        self.assertEqual(self._stock(), 3)
+        self.assertEqual(self._ledger(), [('receipt', 5), ('sale', -2)])
+
+        # To‘g‘ridan-to‘g‘ri `paid` bilan yaratish ham jurnalni chetlab o‘tmaydi
+        order = Order.objects.create(user=self.user, status='paid')
+        order.status = 'cancelled'
+        order.save(update_fields=['status'])
+        self.assertEqual(self._stock(), 3)
+        call_command('reconcile_stock', stdout=io.StringIO())
+
+    def test_stock_endpoint(self):
+        url = reverse('book-stock', args=[self.book.pk])
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(url, {'kind': 'receipt', 'quantity': 4}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.seller)
+        response = self.client.post(url, {'kind': 'receipt', 'quantity': 4, 'note': "Yetkazib beruvchi"},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['stock'], 9)
+        response = self.client.post(url, {'kind': 'adjustment', 'quantity': -10}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(url, {'kind': 'sale', 'quantity': -1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # PATCH stock — ustidan yozish emas, jurnaldagi tuzatish
+        response = self.client.patch(reverse('book-detail', args=[self.book.pk]), {'stock': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._ledger(), [('receipt', 5), ('receipt', 4), ('adjustment', -8)])
+
+        response = self.client.get(url, {'at': '2000-01-01T00:00:00Z'})
+        self.assertEqual(response.data['stock'], 0)
+        response = self.client.get(url, {'at': 'kecha'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(STOCK_SNAPSHOT_LAG=0)
+    def test_point_in_time_with_snapshots(self):
+        start = timezone.now() - timedelta(days=10)
+        StockMovement.objects.filter(book=self.book).update(created_at=start)
+        timeline = [(start, 5)]
+        for day, quantity in enumerate([3, -2, -4, 6, -1, 2], start=1):
+            movement = record_movement(self.book.pk, StockMovement.ADJUSTMENT, quantity)
+            StockMovement.objects.filter(pk=movement.pk).update(created_at=start + timedelta(days=day))
+            timeline.append((start + timedelta(days=day), timeline[-1][1] + quantity))
+            if day % 2 == 0:
+                take_snapshots(now=start + timedelta(days=day, hours=12))
+        self.assertEqual(StockSnapshot.objects.filter(book=self.book).count(), 3)
+
+        for moment, expected in timeline:
+            for offset in (timedelta(0), timedelta(hours=13)):
+                with self.assertNumQueries(2):  # oxirgi nuqta + undan keyingi harakatlar
+                    self.assertEqual(stock_at(self.book.pk, moment + offset), expected)
+        self.assertEqual(stock_at(self.book.pk, start - timedelta(seconds=1)), 0)
+        self.assertEqual(take_snapshots(now=start + timedelta(days=6, hours=12)), 0)
+
+    def test_reconcile_detects_and_fixes_drift(self):
+        record_movement(self.book.pk, StockMovement.RECEIPT, 2)
+        take_snapshots(now=timezone.now() + timedelta(hours=1))
+        Book.objects.filter(pk=self.book.pk).update(stock=42)
+        StockSnapshot.objects.filter(book=self.book).update(stock=1)
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_stock', stdout=io.StringIO())
+        call_command('reconcile_stock', '--fix', stdout=io.StringIO())
+        self.assertEqual(self._stock(), 7)
+        self.assertEqual(StockSnapshot.objects.get(book=self.book).stock, 7)
+        call_command('reconcile_stock', stdout=io.StringIO())
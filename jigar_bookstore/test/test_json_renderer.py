@@ -0,0 +1,55 @@
+import datetime
+import decimal
+import io
+import uuid
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.models import User, Category, Author, Book
+from jigar_bookstore.parsers import FastJSONParser
+from jigar_bookstore.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTestCase(APITestCase):
+    """orjson renderer/parser DRF’ning oddiy JSON natijasi bilan bayt-bayt mos"""
+
+    PAYLOADS = [
+        {'id': uuid.uuid4(), 'price': decimal.Decimal('55000.50'), 'title': "O‘tgan kunlar\u2028✍️\u2029"},
+        {'at': timezone.now(), 'naive': datetime.datetime(2025, 1, 2, 3, 4, 5), 'day': datetime.date(2025, 1, 2)},
+        {'tashkent': timezone.now().astimezone(datetime.timezone(datetime.timedelta(hours=5)))},
+        {'floats': [4.5, 0.1, 0.0, 3.7, 123456789.125], 1: 'int key', 'big': 2 ** 70},
+        {'nested': [{'a': None, 'b': True}], 'delta': datetime.timedelta(hours=1), 'tuple': (1, 2)},
+        [], 'matn', 3,
+    ]
+
+    def test_payloads_match_stock_renderer(self):
+        stock, fast = JSONRenderer(), FastJSONRenderer()
+        for payload in self.PAYLOADS:
+            with self.subTest(payload=payload):
+                self.assertEqual(fast.render(payload), stock.render(payload))
+        self.assertEqual(fast.render(None), b'')
+
+    def test_api_response_matches(self):
+        author = Author.objects.create(full_name="Abdulla Qodiriy")
+        category = Category.objects.create(name="Roman")
+        Book.objects.create(title="O‘tgan kunlar", author=author, category=category,
+                            description="Tarixiy roman", price=55000, isbn="1000000000001")
+        user = User.objects.create_user(username='ali', email='ali@example.com', password='x')
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(reverse('book-list'))
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_parser(self):
+        stock, fast = JSONParser(), FastJSONParser()
+        body = '{"title": "O‘tgan kunlar", "price": "55000.00", "stock": 3, "big": 18446744073709551616}'.encode()
+        self.assertEqual(fast.parse(io.BytesIO(body)), stock.parse(io.BytesIO(body)))
+        for invalid in (b'{"a": NaN}', b'{"a": '):
+            with self.assertRaises(ParseError):
+                fast.parse(io.BytesIO(invalid))
@@ -0,0 +1,122 @@
+import socketserver
+import threading
+from types import SimpleNamespace
+
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase
+
+from jigar_bookstore import mail
+
+
+class _RecordingHandler:
+    """Kelgan xatlarni yozib boradi; `fail_first` ta xatga 451 qaytaradi"""
+
+    def __init__(self, fail_first=0):
+        self.envelopes = []
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+
+    def handle_DATA(self, envelope):
+        with self.lock:
+            if self.fail_first:
+                self.fail_first -= 1
+                return '451 Vaqtinchalik xatolik'
+            self.envelopes.append(envelope)
+            return '250 OK'
+
+
+class _SMTPSession(socketserver.StreamRequestHandler):
+    """Testlar uchun yetarli SMTP: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def _read_data(self):
+        lines = []
+        for line in iter(self.rfile.readline, b''):
+            if line == b'.\r\n':
+                break
+            lines.append(line)
+        return b''.join(lines)
+
+    def handle(self):
+        self._reply('220 127.0.0.1 test SMTP')
+        envelope = SimpleNamespace(mail_from=None, rcpt_tos=[], content=b'')
+        for raw in iter(self.rfile.readline, b''):
+            command, _, argument = raw.decode().strip().partition(' ')
+            command = command.upper()
+            if command in ('EHLO', 'HELO'):
+                self._reply('250 127.0.0.1')
+            elif command == 'MAIL':
+                envelope = SimpleNamespace(mail_from=argument[5:].strip('<>'), rcpt_tos=[], content=b'')
+                self._reply('250 OK')
+            elif command == 'RCPT':
+                envelope.rcpt_tos.append(argument[3:].strip('<>'))
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 Matnni yuboring')
+                envelope.content = self._read_data()
+                self._reply(self.server.handler.handle_DATA(envelope))
+                envelope = SimpleNamespace(mail_from=None, rcpt_tos=[], content=b'')
+            elif command == 'RSET':
+                envelope = SimpleNamespace(mail_from=None, rcpt_tos=[], content=b'')
+                self._reply('250 OK')
+            elif command == 'NOOP':
+                self._reply('250 OK')
+            elif command == 'QUIT':
+                self._reply('221 Xayr')
+                return
+            else:
+                self._reply('502 Buyruq qo‘llanmaydi')
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler):
+        super().__init__(('127.0.0.1', 0), _SMTPSession)
+        self.handler = handler
+
+
+class PooledSMTPBackendTestCase(SimpleTestCase):
+    """Hovuzli backend jarayon ichidagi mahalliy SMTP server bilan (tashqi paketsiz)"""
+
+    def _start(self, handler):
+        server = _SMTPServer(handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(mail.close_pools)
+        mail.metrics.reset()
+        return mail.PooledSMTPBackend(
+            host='127.0.0.1', port=server.server_address[1],
+            username='', password='', use_tls=False, retry_backoff=0, pool_size=2, batch_size=3,
+        )
+
+    def test_per_recipient_messages_reuse_connections(self):
+        handler = _RecordingHandler()
+        backend = self._start(handler)
+        recipients = [f'user{i}@example.com' for i in range(7)]
+
+        sent = backend.send_messages([EmailMessage('Salom', 'Matn', 'shop@example.com', recipients)])
+        sent += backend.send_messages([EmailMessage('Salom', 'Matn', 'shop@example.com', ['a@example.com'])])
+
+        self.assertEqual(sent, 8)
+        self.assertEqual(sorted(rcpt for env in handler.envelopes for rcpt in env.rcpt_tos),
+                         sorted(recipients + ['a@example.com']))
+        self.assertTrue(all(len(env.rcpt_tos) == 1 for env in handler.envelopes))
+        snapshot = mail.metrics.snapshot()
+        self.assertEqual(snapshot['sent'], 8)
+        self.assertLessEqual(snapshot['connections_opened'], 2)
+        self.assertIn('p95', snapshot['latency_ms'])
+
+    def test_transient_failure_is_retried(self):
+        handler = _RecordingHandler(fail_first=1)
+        backend = self._start(handler)
+
+        sent = backend.send_messages([EmailMessage('Salom', 'Matn', 'shop@example.com', ['a@example.com'])])
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(len(handler.envelopes), 1)
+        self.assertEqual(mail.metrics.snapshot()['retries'], 1)
@@ -0,0 +1,65 @@
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from jigar_bookstore.models import User, Category, Author, Book
+from jigar_bookstore.notifications import get_recipients
+
+
+class NotificationRecipientsTestCase(TestCase):
+    """Qabul qiluvchilar ro‘yxati keshlanadi va User o‘zgarganda yangilanadi"""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='x', is_seller=True
+        )
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', is_staff=True, is_seller=True
+        )
+        self.buyer = User.objects.create_user(username='ali', email='ali@example.com', password='x')
+        self.author = Author.objects.create(full_name="Ali Akbar")
+        self.category = Category.objects.create(name="Fantastika")
+
+    def test_cached_after_first_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(get_recipients('catalog-staff'), ['admin@example.com', 'seller@example.com'])
+        with self.assertNumQueries(0):
+            get_recipients('catalog-staff')
+
+    def test_invalidated_on_relevant_changes(self):
+        get_recipients('catalog-staff')
+
+        self.buyer.last_login = None
+        self.buyer.save(update_fields=['last_login'])
+        self.buyer.first_name = "Ali"
+        self.buyer.save()
+        with self.assertNumQueries(0):
+            get_recipients('catalog-staff')
+
+        self.buyer.is_seller = True
+        with self.captureOnCommitCallbacks(execute=True):
+            self.buyer.save()
+        self.assertIn('ali@example.com', get_recipients('catalog-staff'))
+
+        seller = User.objects.get(pk=self.seller.pk)
+        seller.email = 'shop@example.com'
+        with self.captureOnCommitCallbacks(execute=True):
+            seller.save()
+        self.assertIn('shop@example.com', get_recipients('catalog-staff'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.delete()
+        self.assertNotIn('admin@example.com', get_recipients('catalog-staff'))
+
+    def test_new_book_notification_uses_cache(self):
+        get_recipients('catalog-staff')
+        with CaptureQueriesContext(connection) as ctx:
+            Book.objects.create(title="Sehrli Dunyo", author=self.author, category=self.category,
+                                description="", price=1000, isbn="1000000000001")
+        user_table = User._meta.db_table
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if user_table in q['sql']])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(sorted(mail.outbox[0].to), ['admin@example.com', 'seller@example.com'])
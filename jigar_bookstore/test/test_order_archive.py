@@ -0,0 +1,107 @@
+import io
+import json
+import tempfile
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore import archive
+from jigar_bookstore.models import (
+    User, Category, Author, Book, Order, OrderItem, Payment, UserOrderSummary,
+)
+
+
+class OrderArchiveTestCase(APITestCase):
+    """Eski yakunlangan buyurtmalar siqilgan faylga ko‘chiriladi va u yerdan o‘qiladi"""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(ORDER_ARCHIVE_DIR=directory.name, ORDER_ARCHIVE_AFTER_DAYS=730)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='x')
+        self.other = User.objects.create_user(username='vali', email='vali@example.com', password='x')
+        author = Author.objects.create(full_name="Ali Akbar")
+        category = Category.objects.create(name="Fantastika")
+        self.book = Book.objects.create(
+            title="Kitob", author=author, category=category, description="", price=1000, stock=100, isbn='9780000000001'
+        )
+        self.old_paid = self._order('paid', days=800, payment=True)
+        self.old_pending = self._order('pending', days=800)
+        self.recent_paid = self._order('paid', days=10)
+
+    def _order(self, status_, days, payment=False):
+        order = Order.objects.create(user=self.user)
+        OrderItem.objects.create(order=order, book=self.book, quantity=2, price=1000)
+        order.calculate_total()
+        order.status = status_
+        order.save()
+        if payment:
+            Payment.objects.create(order=order, payment_method='card', transaction_id=f'tx-{order.pk}')
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(days=days))
+        return order
+
+    def test_archive_verify_delete_and_lookup(self):
+        summary = UserOrderSummary.objects.get(user=self.user)
+        call_command('archive_orders', stdout=io.StringIO())
+
+        self.assertFalse(Order.objects.filter(pk=self.old_paid.pk).exists())
+        self.assertFalse(OrderItem.objects.filter(order_id=self.old_paid.pk).exists())
+        self.assertFalse(Payment.objects.filter(order_id=self.old_paid.pk).exists())
+        self.assertTrue(Order.objects.filter(pk=self.old_pending.pk).exists())
+        self.assertTrue(Order.objects.filter(pk=self.recent_paid.pk).exists())
+        # Umrbod xulosa o‘zgarmaydi
+        self.assertEqual(UserOrderSummary.objects.get(user=self.user).total_spent, summary.total_spent)
+
+        (path,) = [path for path in archive.archive_dir().iterdir() if '.jsonl' in path.name]
+        self.assertEqual(archive.read_file(path)['orders'], 1)
+        record = archive.get_archived_order(self.old_paid.pk)
+        self.assertEqual(record['total_amount'], '2000.00')
+        self.assertEqual(record['items'][0]['quantity'], 2)
+        self.assertEqual(record['payment']['transaction_id'], f'tx-{self.old_paid.pk}')
+
+        # Qayta ishga tushirish — hech narsa o‘zgarmaydi
+        self.assertEqual(sum(result['orders'] for _, result in archive.archive_orders(
+            timezone.now() - timedelta(days=730)
+        )), 0)
+
+    def test_lookup_api(self):
+        list(archive.archive_orders(timezone.now() - timedelta(days=730)))
+        url = reverse('order-archived', args=[str(self.old_paid.pk)])
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], str(self.old_paid.pk))
+
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.user)
+        missing = reverse('order-archived', args=[str(self.recent_paid.pk)])
+        self.assertEqual(self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(ORDER_ARCHIVE_FRAME_RECORDS=2)
+    def test_lookup_reads_single_frame(self):
+        orders = [self._order('cancelled', days=800 + day) for day in range(5)]
+        list(archive.archive_orders(timezone.now() - timedelta(days=730)))
+        (path,) = [path for path in archive.archive_dir().iterdir() if '.jsonl' in path.name]
+        self.assertEqual(archive.read_file(path)['orders'], 6)
+        manifest = json.loads(archive._manifest_path(path).read_text())
+        self.assertEqual(len({offset for offset, _, _ in manifest['ids'].values()}), 3)
+
+        for order in orders + [self.old_paid]:
+            self.assertEqual(archive.get_archived_order(order.pk)['id'], str(order.pk))
+        self.assertIsNone(archive.get_archived_order(self.recent_paid.pk))
+
+        # Indeks yo‘qolsa — manifestlardan tiklanadi
+        (archive.archive_dir() / 'index.sqlite3').unlink()
+        self.assertEqual(archive.get_archived_order(orders[3].pk)['status'], 'cancelled')
@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.models import (
+    User, Category, Author, Book, Order, OrderItem, Payment, UserOrderSummary
+)
+
+
+class UserOrderSummaryTestCase(APITestCase):
+    """Buyurtmalar xulosasi signal orqali yangilanadi va bitta qatordan o‘qiladi"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='ali12345@')
+        author = Author.objects.create(full_name="Ali Akbar")
+        category = Category.objects.create(name="Fantastika")
+        self.book = Book.objects.create(title="Sehrli Dunyo", author=author, category=category,
+                                        description="", price=50000, stock=100, isbn="1000000000001")
+        self.url = reverse('order-summary')
+
+    def _order(self, quantity=1):
+        order = Order.objects.create(user=self.user)
+        OrderItem.objects.create(order=order, book=self.book, quantity=quantity, price=50000)
+        order.calculate_total()
+        return order
+
+    def test_summary_follows_order_lifecycle(self):
+        paid = self._order(quantity=2)
+        Payment.objects.create(order=paid, payment_method='card', transaction_id='tx1', status='success')
+        cancelled = self._order()
+        cancelled.status = 'cancelled'
+        cancelled.save()
+        self._order()
+
+        summary = UserOrderSummary.objects.get(user=self.user)
+        self.assertEqual(summary.orders_count, 3)
+        self.assertEqual((summary.pending_count, summary.paid_count, summary.cancelled_count), (1, 1, 1))
+        self.assertEqual(summary.total_spent, Decimal('100000'))
+
+        # Bazadan qayta yuklangan buyurtma ham to‘g‘ri delta beradi
+        order = Order.objects.get(pk=paid.pk)
+        order.status = 'cancelled'
+        order.save(update_fields=['status'])
+        Order.objects.get(pk=cancelled.pk).delete()
+
+        summary.refresh_from_db()
+        self.assertEqual(summary.orders_count, 2)
+        self.assertEqual((summary.pending_count, summary.paid_count, summary.cancelled_count), (1, 0, 1))
+        self.assertEqual(summary.total_spent, Decimal('0'))
+
+    def test_summary_endpoint(self):
+        for _ in range(3):
+            self._order()
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(2):  # xulosa qatori + so‘nggi buyurtmalar
+            response = self.client.get(self.url, {'last': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['orders_count'], 3)
+        self.assertEqual(response.data['pending_count'], 3)
+        self.assertEqual(len(response.data['recent_orders']), 2)
+        self.assertNotIn('items', response.data['recent_orders'][0])
+
+    def test_summary_for_user_without_orders(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['orders_count'], 0)
+        self.assertEqual(response.data['recent_orders'], [])
+
+    def test_deleting_user_with_orders(self):
+        self._order()
+        self.user.delete()
+        self.assertFalse(UserOrderSummary.objects.exists())
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.test import TestCase
+
+from jigar_bookstore.models import User, Category, Author, Book, Order, OrderItem, UserOrderSummary
+from jigar_bookstore.order_totals import recompute_order_totals
+
+
+class DeferredOrderTotalsTestCase(TestCase):
+    """OrderItem saqlanganda summa commit paytida, bitta guruhlangan UPDATE bilan hisoblanadi"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='ali12345@')
+        author = Author.objects.create(full_name="Ali Akbar")
+        category = Category.objects.create(name="Fantastika")
+        self.book = Book.objects.create(title="Sehrli Dunyo", author=author, category=category,
+                                        description="", price=10000, isbn="1000000000001")
+
+    def _fill(self, orders, items_per_order):
+        with transaction.atomic():
+            for order in orders:
+                for i in range(items_per_order):
+                    OrderItem.objects.create(order=order, book=self.book, quantity=i + 1, price=1000)
+
+    def test_recompute_is_constant_per_transaction(self):
+        orders = [Order.objects.create(user=self.user) for _ in range(5)]
+        with self.captureOnCommitCallbacks() as callbacks:
+            self._fill(orders, 20)
+        self.assertEqual(len(callbacks), 1)
+
+        # 5 buyurtma x 20 element uchun ham: SAVEPOINT, SELECT ... FOR UPDATE, UPDATE, RELEASE
+        with self.assertNumQueries(4):
+            callbacks[0]()
+
+        expected = Decimal(1000 * sum(range(1, 21)))
+        for order in orders:
+            order.refresh_from_db()
+            self.assertEqual(order.total_amount, expected)
+
+    def test_matches_eager_calculation(self):
+        order = Order.objects.create(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._fill([order], 3)
+            item = order.items.first()
+            item.quantity = 7
+            item.save()
+        order.refresh_from_db()
+        deferred = order.total_amount
+
+        order.calculate_total()
+        order.refresh_from_db()
+        self.assertEqual(order.total_amount, deferred)
+
+    def test_paid_order_updates_summary(self):
+        order = Order.objects.create(user=self.user, status='paid', is_paid=True)
+        OrderItem.objects.bulk_create([OrderItem(order=order, book=self.book, quantity=2, price=5000)])
+        recompute_order_totals([order.pk])
+
+        order.refresh_from_db()
+        self.assertEqual(order.total_amount, Decimal('10000'))
+        summary = UserOrderSummary.objects.get(user=self.user)
+        self.assertEqual(summary.total_spent, Decimal('10000'))
+
+    def test_rolled_back_transaction_does_not_block_next_one(self):
+        order = Order.objects.create(user=self.user)
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    OrderItem.objects.create(order=order, book=self.book, quantity=1, price=1000)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        # Bekor qilingan savepoint callback’i bilan navbat ham yo‘qoldi
+        self.assertEqual(callbacks, [])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self._fill([order], 2)
+        self.assertEqual(len(callbacks), 1)
+        order.refresh_from_db()
+        self.assertEqual(order.total_amount, Decimal('3000'))
@@ -0,0 +1,101 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone as dj_timezone
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.models import User, Order, Payment
+from jigar_bookstore.partitioning import (
+    add_months, create_partition, detach_partition, list_partitions, month_start, partition_month, partition_name,
+)
+
+
+class PartitionMonthsTestCase(SimpleTestCase):
+    """Oylik bo‘lak nomlari va chegaralari (UTC)"""
+
+    def _month(self, year, month):
+        return datetime(year, month, 1, tzinfo=timezone.utc)
+
+    def test_month_math(self):
+        tashkent = timezone(timedelta(hours=5))
+        # Toshkentda 1-noyabr 02:00 — UTC bo‘yicha hali oktyabr
+        self.assertEqual(month_start(datetime(2026, 11, 1, 2, tzinfo=tashkent)), self._month(2026, 10))
+        self.assertEqual(add_months(self._month(2026, 11), 2), self._month(2027, 1))
+        self.assertEqual(add_months(self._month(2026, 1), -1), self._month(2025, 12))
+
+    def test_names(self):
+        month = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        name = partition_name('jigar_bookstore_order', month)
+        self.assertEqual(name, 'jigar_bookstore_order_p2026_03')
+        self.assertEqual(partition_month(name), month)
+        self.assertIsNone(partition_month('jigar_bookstore_order_default'))
+
+
+class OrderDateFilterTestCase(APITestCase):
+    """`?created_after=` — bo‘laklarni kesish uchun sana filtri"""
+
+    def test_created_after(self):
+        user = User.objects.create_user(username='admin', email='admin@example.com', password='x', is_staff=True)
+        recent = Order.objects.create(user=user)
+        old = Order.objects.create(user=user)
+        Order.objects.filter(pk=old.pk).update(created_at=dj_timezone.now() - timedelta(days=400))
+        self.client.force_authenticate(user=user)
+
+        since = (dj_timezone.now() - timedelta(days=30)).isoformat()
+        response = self.client.get(reverse('order-list'), {'created_after': since})
+        self.assertEqual([row['id'] for row in response.data['results']], [str(recent.pk)])
+
+
+class PaymentPerOrderTestCase(APITestCase):
+    """Bo‘laklangan `Payment` da UNIQUE(order_id) yo‘q — bitta buyurtmaga bitta to‘lov save() da tekshiriladi"""
+
+    def test_second_payment_rejected(self):
+        user = User.objects.create_user(username='ali', email='ali@example.com', password='x')
+        order = Order.objects.create(user=user)
+        Payment.objects.create(order=order, payment_method='card', transaction_id='tx1')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Payment.objects.create(order=order, payment_method='card', transaction_id='tx2')
+
+        self.client.force_authenticate(user=user)
+        response = self.client.post(reverse('payment-list'), {
+            'order': str(order.pk), 'payment_method': 'card', 'transaction_id': 'tx3',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('order', response.data)
+        self.assertEqual(Payment.objects.filter(order=order).count(), 1)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Bo‘laklash faqat PostgreSQL’da")
+class PartitionPruningTestCase(TestCase):
+    """Yaqin sana oralig‘i bilan so‘rov faqat tegishli bo‘laklarni o‘qiydi"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='x')
+        self.quote = connection.ops.quote_name
+        self.current = month_start(dj_timezone.now())
+        self.old = add_months(self.current, -12)
+        with connection.cursor() as cursor:
+            for month in (self.old, add_months(self.current, -1), self.current):
+                create_partition(cursor, self.quote, 'jigar_bookstore_order', month)
+
+    def test_recent_range_prunes_old_partitions(self):
+        order = Order.objects.create(user=self.user)
+        plan = Order.objects.filter(created_at__gte=self.current).explain()
+        self.assertIn(partition_name('jigar_bookstore_order', self.current), plan)
+        self.assertNotIn(partition_name('jigar_bookstore_order', self.old), plan)
+        self.assertEqual(list(Order.objects.filter(created_at__gte=self.current)), [order])
+
+    def test_default_rows_move_to_new_partition(self):
+        future = add_months(self.current, 24)
+        order = Order.objects.create(user=self.user)
+        Order.objects.filter(pk=order.pk).update(created_at=future + timedelta(days=3))
+        table = 'jigar_bookstore_order'
+        with connection.cursor() as cursor:
+            self.assertTrue(create_partition(cursor, self.quote, table, future))
+            cursor.execute(f"SELECT count(*) FROM {self.quote(partition_name(table, future))}")
+            self.assertEqual(cursor.fetchone()[0], 1)
+            detach_partition(cursor, self.quote, table, partition_name(table, self.old))
+            self.assertNotIn(partition_name(table, self.old), list_partitions(cursor, table))
@@ -1,5 +1,7 @@
 from rest_framework.test import APITestCase, APIRequestFactory
 from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from jigar_bookstore.models import (
@@ -168,4 +170,80 @@ class ReviewAPITestCase(APITestCase):
         self.assertIn('rating', data)
         self.assertIn('comment', data)
         self.assertIn('is_liked', data)
-        print("✅ Serializer fieldlari to‘g‘ri chiqdi:", data.keys())
\ No newline at end of file
+        print("✅ Serializer fieldlari to‘g‘ri chiqdi:", data.keys())
+
+    # ====================================================
+    # 🔹 LIKE / DISLIKE / CLEAR
+    # ====================================================
+    def test_review_reactions(self):
+        """Reaksiyalar idempotent va bir-birini istisno qiladi"""
+        other = User.objects.create_user(username='vali', email='vali@example.com', password='vali12345@')
+        self.client.force_authenticate(user=other)
+        like_url = reverse('review-like', args=[self.review.id])
+        dislike_url = reverse('review-dislike', args=[self.review.id])
+        clear_url = reverse('review-clear', args=[self.review.id])
+
+        response = self.client.post(like_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(like_url)
+        self.assertEqual(response.data['likes_count'], 1)
+        self.assertTrue(response.data['is_liked'])
+
+        response = self.client.post(dislike_url)
+        self.assertEqual(response.data['likes_count'], 0)
+        self.assertEqual(response.data['dislikes_count'], 1)
+        self.assertFalse(self.review.likes.filter(id=other.id).exists())
+        self.assertTrue(self.review.dislikes.filter(id=other.id).exists())
+
+        response = self.client.post(clear_url)
+        response = self.client.post(clear_url)
+        self.assertEqual(response.data['likes_count'], 0)
+        self.assertEqual(response.data['dislikes_count'], 0)
+        self.assertFalse(self.review.dislikes.exists())
+        print("✅ Layk/dislayk/tozalash ishladi:", response.data)
+
+    # ====================================================
+    # 🔹 KITOB SHARHLARI + GISTOGRAMMA
+    # ====================================================
+    def test_book_reviews_with_histogram(self):
+        """Gistogramma sharh yaratish, tahrirlash va o‘chirishda yangilanadi"""
+        other = User.objects.create_user(username='vali', email='vali@example.com', password='vali12345@')
+        other_review = Review.objects.create(user=other, book=self.book, rating=2)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.rating_histogram, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+        self.assertEqual(self.book.get_average_rating(), 3.5)
+
+        other_review.rating = 4
+        other_review.save()
+        self.review.delete()
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.rating_histogram, {1: 0, 2: 0, 3: 0, 4: 1, 5: 0})
+
+        url = reverse('book-reviews', args=[self.book.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['reviews_count'], 1)
+        self.assertEqual(response.data['rating_histogram'][4], 1)
+        self.assertNotIn('book_detail', response.data['results'][0])
+        print("✅ Kitob sharhlari va gistogramma olindi:", response.data)
+
+    def test_book_reviews_query_count(self):
+        """Joriy foydalanuvchi reaksiyalari sharhlar so‘rovining o‘zida — sharhlar soniga bog‘liq emas"""
+        url = reverse('book-reviews', args=[self.book.id])
+        self.client.force_authenticate(user=self.user)
+
+        def queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(ctx.captured_queries), response
+
+        small, _ = queries()
+        for number in range(4):
+            reader = User.objects.create_user(username=f'u{number}', email=f'u{number}@example.com', password='x')
+            review = Review.objects.create(user=reader, book=self.book, rating=3)
+            review.set_reaction(self.user, 'like' if number % 2 else 'dislike')
+        large, response = queries()
+        self.assertEqual(small, large)
+        reactions = {(item['is_liked'], item['is_disliked']) for item in response.data['results'][:-1]}
+        self.assertEqual(reactions, {(True, False), (False, True)})
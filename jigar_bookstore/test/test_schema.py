@@ -0,0 +1,64 @@
+import gzip
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from jigar_bookstore import schema
+
+
+class CachedSchemaViewTestCase(TestCase):
+    """OpenAPI sxemasi bir marta quriladi va xotiradan ETag/gzip bilan beriladi"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings_override = override_settings(OPENAPI_SCHEMA_DIR=directory.name, CODE_VERSION='test-1')
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self._reset()
+        self.addCleanup(self._reset)
+        self.url = reverse('schema')
+
+    def _reset(self):
+        schema._artifacts.clear()
+        schema._code_version = None
+
+    def test_schema_served_from_memory(self):
+        with mock.patch.object(schema, 'generate_schema', wraps=schema.generate_schema) as generate:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url, HTTP_ACCEPT='application/vnd.oai.openapi+json')
+            third = self.client.get(self.url)
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn(b'openapi:', first.content)
+        self.assertEqual(second['Content-Type'], 'application/vnd.oai.openapi+json')
+        self.assertIn(b'"openapi"', second.content)
+        self.assertEqual(first.content, third.content)
+        self.assertEqual(first['ETag'], third['ETag'])
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        compressed = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), first.content)
+
+    def test_build_command_and_version_change(self):
+        call_command('build_openapi_schema', stdout=mock.MagicMock())
+        # Vaqtinchalik fayllar o‘rniga ko‘chirilgan — papkada faqat tayyor sxemalar
+        self.assertFalse([path for path in schema.schema_dir().iterdir() if path.name.endswith('.tmp')])
+        self._reset()
+        with mock.patch.object(schema, 'generate_schema') as generate:
+            response = self.client.get(self.url)
+        generate.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+
+        # Yangi kod versiyasi — sxema qayta quriladi
+        self._reset()
+        with override_settings(CODE_VERSION='test-2'), \
+                mock.patch.object(schema, 'generate_schema', wraps=schema.generate_schema) as generate:
+            self.client.get(self.url)
+        self.assertEqual(generate.call_count, 1)
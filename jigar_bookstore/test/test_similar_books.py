@@ -0,0 +1,83 @@
+import json
+import tempfile
+import unittest
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jigar_bookstore.models import User, Category, Author, Book
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipUnless(numpy, "numpy o‘rnatilmagan")
+class SimilarBooksTestCase(APITestCase):
+    """TF-IDF indeksidan o‘xshash kitoblar va /books/{id}/similar/"""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(RECOMMENDATIONS_DIR=directory.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user(username='ali', email='ali@example.com', password='x')
+        self.tolkien = Author.objects.create(full_name="J. R. R. Tolkien")
+        self.qodiriy = Author.objects.create(full_name="Abdulla Qodiriy")
+        self.fantasy = Category.objects.create(name="Fantastika")
+        self.novel = Category.objects.create(name="Roman")
+        self.hobbit = self._book("Hobbit", "Ajdarlar, sehrgar va uzuk haqida sarguzasht", self.tolkien, self.fantasy)
+        self.rings = self._book("Uzuklar hukmdori", "Sehrli uzuk, ajdarlar va sarguzasht", self.tolkien, self.fantasy)
+        self.days = self._book("O‘tkan kunlar", "Toshkent va Marg‘ilon, muhabbat va fojia", self.qodiriy, self.novel)
+        self.scorpion = self._book("Mehrobdan chayon", "Qo‘qon xonligi, muhabbat va fojia", self.qodiriy, self.novel)
+        self.client.force_authenticate(user=self.user)
+
+    def _book(self, title, description, author, category):
+        return Book.objects.create(
+            title=title, description=description, author=author, category=category,
+            price=1000, isbn=str(Book.objects.count()).zfill(13),
+        )
+
+    def _similar(self, book, limit=1):
+        response = self.client.get(reverse('book-similar', args=[book.id]), {'limit': limit})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['id'] for row in response.data['results']]
+
+    def test_full_build_and_query(self):
+        from jigar_bookstore import similarity
+
+        self.assertEqual(similarity.build_index(), 4)
+        # meta.json kitoblar soniga bog‘liq emas: ID’lar va idf alohida fayllarda
+        meta = json.loads((similarity._index_dir() / 'meta.json').read_text())
+        self.assertFalse([key for key, value in meta.items() if isinstance(value, (list, dict))])
+        with self.assertNumQueries(1):
+            self.assertEqual(self._similar(self.hobbit), [str(self.rings.id)])
+        self.assertEqual(self._similar(self.days), [str(self.scorpion.id)])
+        self.assertNotIn(str(self.days.id), self._similar(self.days, limit=10))
+
+    def test_new_book_before_and_after_incremental(self):
+        from jigar_bookstore import similarity
+
+        similarity.build_index()
+        silmarillion = self._book("Silmarillion", "Ajdarlar va sehrgar, qadimgi uzuk", self.tolkien, self.fantasy)
+        # Indeksda yo‘q — joyida vektorlanadi
+        self.assertIn(self._similar(silmarillion), ([str(self.hobbit.id)], [str(self.rings.id)]))
+
+        self.assertEqual(similarity.update_index(), 1)
+        self.assertEqual(similarity.update_index(), 0)
+        self.assertIn(str(silmarillion.id), self._similar(self.hobbit, limit=2))
+
+        # Tahrirlangan kitob o‘z qatorida yangilanadi, oldingi vektor fayli almashtiriladi
+        self.days.title, self.days.description = "Uzuk va ajdarlar", "Sehrgar, uzuk, ajdarlar va sarguzasht"
+        self.days.save()
+        self.assertEqual(similarity.update_index(), 1)
+        self.assertIn(str(self.days.id), self._similar(self.hobbit, limit=2))
+        for pattern in ('vectors*.f32', 'ids-*.npy', 'idf-*.npz'):
+            self.assertLessEqual(len(list(similarity._index_dir().glob(pattern))), 2)
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from jigar_bookstore.async_views import async_catalog_view
 from jigar_bookstore.views import (
     CategoryViewSet,
     AuthorViewSet,
@@ -7,6 +9,7 @@ from jigar_bookstore.views import (
     ReviewViewSet,
     OrderViewSet,
     PaymentViewSet,
+    CartViewSet,
 )
 
 router = DefaultRouter()
@@ -18,7 +21,18 @@ router.register(r'books', BookViewSet, basename='book')
 router.register(r'reviews', ReviewViewSet, basename='review')
 router.register(r'orders', OrderViewSet, basename='order')
 router.register(r'payments', PaymentViewSet, basename='payment')
+router.register(r'cart', CartViewSet, basename='cart')
 
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+# 🔹 ASGI rejimi: katalogni o‘qish async yo‘l orqali (router’dan oldin tekshiriladi)
+if settings.ASYNC_CATALOG_READS:
+    async_urlpatterns = []
+    for prefix, viewset in (('categories', CategoryViewSet), ('authors', AuthorViewSet), ('books', BookViewSet)):
+        async_urlpatterns += [
+            path(f'{prefix}/', async_catalog_view(viewset)),
+            path(f'{prefix}/<uuid:pk>/', async_catalog_view(viewset, detail=True)),
+        ]
+    urlpatterns = async_urlpatterns + urlpatterns
@@ -1,13 +1,33 @@
-from rest_framework import viewsets, permissions, filters
+import uuid
+
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import User, Category, Author, Book, Review, Order, OrderItem, Payment
+from .models import User, Category, Author, Book, BookNeighbor, Review, Order, OrderItem, Payment, UserOrderSummary
 from .serializers import (
     UserSerializer, CategorySerializer, AuthorSerializer,
-    BookSerializer, ReviewSerializer, OrderSerializer,
-    OrderItemSerializer, PaymentSerializer
+    BookSerializer, BookBulkUpdateItemSerializer, ReviewSerializer, BookReviewSerializer, OrderSerializer,
+    OrderBriefSerializer, UserOrderSummarySerializer, OrderItemSerializer, PaymentSerializer,
+    StockMovementSerializer, CartSerializer, CartItemSerializer, CartQuantitySerializer, CartCheckoutSerializer
 )
+from django.core.cache import cache
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, CharField, Count, F, IntegerField, Q, Value, When
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .archive import get_archived_order
+from .autocomplete import autocomplete
+from .caching import invalidate_book_caches, versioned_key
+from .cart import add_item, checkout as checkout_cart, current_cart, open_cart, set_quantity
+from .filters import BookFilterSet, CategoryFilterSet, OrderFilterSet, PaymentFilterSet
+from .fuzzy import clamp_threshold, fuzzy_books
+from .inventory import record_movement, set_stock_levels, stock_at
+from .notifications import get_recipients
+from .similarity import similar_books
 from .permissions import IsAdminOrReadOnly, IsSellerOrReadOnly, IsOwnerOrAdmin
 from django.contrib.auth import get_user_model
 
@@ -33,9 +53,11 @@ class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    replica_reads = True
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_class = CategoryFilterSet
     search_fields = ['name']
-    ordering_fields = ['name']
+    ordering_fields = ['name', 'path', 'books_count']
 
 
 # =======================
@@ -45,6 +67,7 @@ class AuthorViewSet(viewsets.ModelViewSet):
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAdminOrReadOnly]
+    replica_reads = True
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['full_name', 'biography']
     ordering_fields = ['full_name']
@@ -57,11 +80,22 @@ class BookViewSet(viewsets.ModelViewSet):
     queryset = Book.objects.all().select_related('author', 'category')
     serializer_class = BookSerializer
     permission_classes = [IsSellerOrReadOnly]
+    replica_reads = True
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['category', 'author']
+    filterset_class = BookFilterSet
     search_fields = ['title', 'description', 'isbn']
     ordering_fields = ['price', 'title', 'id']
 
+    def get_serializer_context(self):
+        """Ro‘yxat uchun eng kichik muqova eskizi, `?cover_size=` bilan o‘zgartirish mumkin"""
+        context = super().get_serializer_context()
+        size = self.request.query_params.get('cover_size') if self.request else None
+        if size and size.isdigit():
+            context['cover_size'] = int(size)
+        elif self.action == 'list':
+            context['cover_size'] = min(settings.COVER_THUMBNAIL_SIZES)
+        return context
+
     def perform_create(self, serializer):
         """
         Kitob yaratishda avtomatik email yuborish.
@@ -69,14 +103,8 @@ class BookViewSet(viewsets.ModelViewSet):
         """
         book = serializer.save()  # 1️⃣ Kitobni saqlaymiz
 
-        # 2️⃣ Email yuboriladigan foydalanuvchilar
-        recipients = list(
-            User.objects.filter(is_seller=True).values_list('email', flat=True)
-        )
-        admin_emails = list(
-            User.objects.filter(is_staff=True).values_list('email', flat=True)
-        )
-        recipients = list(set(filter(None, recipients + admin_emails)))
+        # 2️⃣ Email yuboriladigan foydalanuvchilar (keshdan)
+        recipients = get_recipients('catalog-staff')
 
         # 3️⃣ Agar kamida 1ta email bo‘lsa — yuboramiz
         if recipients:
@@ -98,6 +126,300 @@ class BookViewSet(viewsets.ModelViewSet):
                 fail_silently=False,
             )
 
+    # 🔹 Narx oraliqlari (so‘m): [dan, gacha)
+    FACET_PRICE_BANDS = [(0, 50000), (50000, 100000), (100000, 200000), (200000, None)]
+
+    def _facet_queries(self, queryset):
+        """Kategoriya, muallif, narx oralig‘i va reyting bo‘yicha guruhlangan sonlar (UNION ALL)"""
+        base = queryset.order_by()
+
+        def grouped(name, key, label):
+            return (
+                base.annotate(facet=Value(name, output_field=CharField()), key=key, label=label)
+                .values('facet', 'key', 'label')
+                .annotate(count=Count('id'))
+            )
+
+        price_band = Case(
+            *[
+                When(price__gte=low, **({'price__lt': high} if high else {}),
+                     then=Value(f"{low}-{high}" if high else f"{low}+"))
+                for low, high in self.FACET_PRICE_BANDS
+            ],
+            output_field=CharField(),
+        )
+        stars = [F(f'rating_count_{star}') for star in range(1, 6)]
+        rated = sum(stars[1:], stars[0])
+        weighted = sum((F(f'rating_count_{star}') * star for star in range(2, 6)), F('rating_count_1'))
+        # O‘rtacha bahoning butun qismi; baho bo‘lmasa — "0"
+        rating_floor = Coalesce(
+            Cast(Cast(weighted, IntegerField()) / NullIf(rated, 0), output_field=CharField()),
+            Value('0'),
+        )
+        return grouped('category', Cast('category_id', CharField()), F('category__name')).union(
+            grouped('author', Cast('author_id', CharField()), F('author__full_name')),
+            grouped('price', price_band, price_band),
+            grouped('rating', rating_floor, rating_floor),
+            all=True,
+        )
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Qidiruv natijalari va ularning fasetlari (kategoriya, muallif, narx, reyting) bitta javobda.
+        Filtr/qidiruv/tartib parametrlari ro‘yxat bilan bir xil. Natija keshlanadi va
+        Book/Review o‘zgarganda `book-facets` versiyasi oshirilib eskirtiriladi.
+        """
+        key = versioned_key('book-facets', request.get_host(), sorted(request.query_params.lists()))
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        facets = {'category': [], 'author': [], 'price': [], 'rating': []}
+        for row in self._facet_queries(queryset):
+            facets[row['facet']].append({'key': row['key'], 'label': row['label'], 'count': row['count']})
+        for values in facets.values():
+            values.sort(key=lambda item: (-item['count'], str(item['label'])))
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page if page is not None else queryset, many=True)
+        if page is not None:
+            data = self.get_paginated_response(serializer.data).data
+        else:
+            data = {'results': serializer.data}
+        data['facets'] = facets
+        cache.set(key, data, settings.FACETS_CACHE_TIMEOUT)
+        return Response(data)
+
+    AUTOCOMPLETE_LIMIT = 10
+    AUTOCOMPLETE_MAX_LIMIT = 20
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Qidiruv maydoni uchun tezkor takliflar: kitob nomi, muallif ismi yoki ISBN prefiksi.
+        Worker xotirasidagi indeksdan, bazaga murojaatsiz; faqat `id`, `label`, `type`.
+        """
+        query = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', self.AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            return Response({'detail': "Noto‘g‘ri so‘rov"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.AUTOCOMPLETE_MAX_LIMIT))
+        return Response({'results': autocomplete(query, limit)})
+
+    FUZZY_LIMIT = 20
+    FUZZY_MAX_LIMIT = 50
+
+    @action(detail=False, methods=['get'])
+    def fuzzy(self, request):
+        """
+        Xatolarga chidamli qidiruv: `?q=` kitob nomi yoki muallif ismiga trigramma
+        o‘xshashligi bo‘yicha (PostgreSQL’da pg_trgm GIN indekslari orqali).
+        `?threshold=` (0.1–1, standart `FUZZY_SEARCH_THRESHOLD`), `?limit=`;
+        ro‘yxat filtrlari (kategoriya, narx va h.k.) ham qo‘llanadi.
+        """
+        try:
+            threshold = clamp_threshold(request.query_params.get('threshold'))
+            limit = int(request.query_params.get('limit', self.FUZZY_LIMIT))
+        except ValueError:
+            return Response({'detail': "Noto‘g‘ri so‘rov"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.FUZZY_MAX_LIMIT))
+
+        queryset = self.filter_queryset(self.get_queryset())
+        context = self.get_serializer_context()
+        results = []
+        for book, score in fuzzy_books(queryset, request.query_params.get('q', ''), threshold, limit):
+            data = BookSerializer(book, context=context).data
+            data['score'] = round(score, 4)
+            results.append(data)
+        return Response({'threshold': threshold, 'results': results})
+
+    BULK_UPDATE_BATCH_SIZE = 500
+    BULK_UPDATE_MAX_ITEMS = 10000
+
+    @action(detail=False, methods=['post'], url_path='bulk-update')
+    def bulk_update(self, request):
+        """
+        Narx va qoldiqni ommaviy yangilash: `[{id|isbn, price?, stock?}, ...]`.
+        Kitoblar bitta so‘rov bilan topiladi, `bulk_update` bo‘laklarda bitta tranzaksiyada
+        bajariladi. `stock` — inventarizatsiya natijasi: qulf ostida farq ombor jurnaliga
+        `adjustment` sifatida yoziladi. Javobda faqat yangilangan id’lar va xatolar qaytadi.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'detail': "Ro‘yxat kutilgan"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.BULK_UPDATE_MAX_ITEMS:
+            return Response({'detail': f"Bir so‘rovda {self.BULK_UPDATE_MAX_ITEMS} tadan ko‘p emas"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        errors, valid = [], []
+        for index, item in enumerate(items):
+            serializer = BookBulkUpdateItemSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        ids = {data['id'] for _, data in valid if data.get('id')}
+        isbns = {data['isbn'] for _, data in valid if not data.get('id')}
+        books = Book.objects.filter(Q(id__in=ids) | Q(isbn__in=isbns)).only('id', 'isbn', 'price', 'stock')
+        by_id = {book.id: book for book in books}
+        by_isbn = {book.isbn: book for book in by_id.values()}
+
+        now = timezone.now()
+        touched, levels = {}, {}
+        for index, data in valid:
+            book = by_id.get(data['id']) if data.get('id') else by_isbn.get(data['isbn'])
+            if book is None:
+                errors.append({'index': index, 'errors': {'detail': "Kitob topilmadi"}})
+                continue
+            if 'price' in data:
+                book.price = data['price']
+            if 'stock' in data:
+                levels[book.id] = data['stock']
+            book.updated_at = now
+            touched[book.id] = book
+
+        if touched:
+            for book in touched.values():
+                # Qoldig‘i berilmagan kitoblarda ustun o‘zgarmaydi (o‘qilgan eski qiymat yozilmaydi)
+                book.stock = levels.get(book.id, F('stock'))
+            with transaction.atomic():
+                if levels:
+                    set_stock_levels(levels, note="Ommaviy yangilash")
+                Book.objects.bulk_update(
+                    touched.values(), ['price', 'stock', 'updated_at'], batch_size=self.BULK_UPDATE_BATCH_SIZE
+                )
+            # bulk_update signal yubormaydi — kitobga bog‘liq keshlarni qo‘lda eskirtiramiz
+            invalidate_book_caches()
+
+        errors.sort(key=lambda error: error['index'])
+        return Response({'updated': list(touched), 'errors': errors}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get', 'post'])
+    def stock(self, request, pk=None):
+        """
+        GET — joriy qoldiq yoki `?at=<ISO vaqt>` paytidagi qoldiq (oxirgi nuqta + harakatlar).
+        POST — ombor harakati: `{kind: receipt|adjustment, quantity, note?}`, sotuvchi uchun.
+        """
+        book = self.get_object()
+        if request.method == 'POST':
+            serializer = StockMovementSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            movement = record_movement(book.pk, **serializer.validated_data)
+            stock = Book.objects.filter(pk=book.pk).values_list('stock', flat=True).get()
+            return Response(
+                {'book': book.pk, 'stock': stock, 'movement': StockMovementSerializer(movement).data},
+                status=status.HTTP_201_CREATED,
+            )
+
+        at = request.query_params.get('at')
+        if not at:
+            return Response({'book': book.pk, 'at': None, 'stock': book.stock})
+        try:
+            when = parse_datetime(at)
+        except ValueError:
+            when = None
+        if when is None:
+            return Response({'at': "ISO 8601 vaqt kutilgan"}, status=status.HTTP_400_BAD_REQUEST)
+        if timezone.is_naive(when):
+            when = timezone.make_aware(when)
+        return Response({'book': book.pk, 'at': when, 'stock': stock_at(book.pk, when)})
+
+    REVIEW_ORDERING = ('created_at', '-created_at', 'rating', '-rating', 'likes_count', '-likes_count')
+
+    @action(detail=True, methods=['get'])
+    def reviews(self, request, pk=None):
+        """
+        Kitob sharhlari va saqlangan baholar gistogrammasi.
+        Sarlavha (gistogramma) bitta qatordan o‘qiladi, sharhlar sahifalab qaytariladi.
+        """
+        book = self.get_object()
+        ordering = request.query_params.get('ordering', '-created_at')
+        if ordering not in self.REVIEW_ORDERING:
+            ordering = '-created_at'
+        reviews = Review.with_user_reactions(
+            Review.objects.filter(book=book).select_related('user'), request.user
+        ).order_by(ordering, 'id')
+
+        summary = {
+            'average_rating': book.get_average_rating(),
+            'reviews_count': book.reviews_count,
+            'rating_histogram': book.rating_histogram,
+        }
+        page = self.paginate_queryset(reviews)
+        if page is not None:
+            serializer = BookReviewSerializer(page, many=True, context=self.get_serializer_context())
+            response = self.get_paginated_response(serializer.data)
+            response.data.update(summary)
+            return response
+        serializer = BookReviewSerializer(reviews, many=True, context=self.get_serializer_context())
+        return Response({**summary, 'results': serializer.data})
+
+    ALSO_BOUGHT_LIMIT = 10
+
+    @action(detail=True, methods=['get'], url_path='also-bought')
+    def also_bought(self, request, pk=None):
+        """
+        "Buni ham sotib olishdi": oflayn hisoblangan qo‘shnilar (`build_also_bought`).
+        Bitta indekslangan so‘rov — `(book, -score)`; `?limit=` (standart 10).
+        """
+        try:
+            book_id = uuid.UUID(str(pk))
+            limit = int(request.query_params.get('limit', self.ALSO_BOUGHT_LIMIT))
+        except ValueError:
+            return Response({'detail': "Noto‘g‘ri so‘rov"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.ALSO_BOUGHT_TOP_K))
+
+        neighbors = (
+            BookNeighbor.objects.filter(book_id=book_id)
+            .select_related('neighbor__author', 'neighbor__category')
+            .order_by('-score', 'neighbor_id')[:limit]
+        )
+        context = self.get_serializer_context()
+        results = []
+        for item in neighbors:
+            data = BookSerializer(item.neighbor, context=context).data
+            data['score'] = round(item.score, 4)
+            data['co_purchases'] = item.co_purchases
+            results.append(data)
+        return Response({'results': results})
+
+    SIMILAR_LIMIT = 10
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        Mazmunga ko‘ra o‘xshash kitoblar (`build_similar_books` indeksi, kosinus).
+        Indeksdagi kitob uchun qidiruv xotirada, keyin bitta so‘rov; `?limit=` (standart 10).
+        """
+        try:
+            book_id = uuid.UUID(str(pk))
+            limit = int(request.query_params.get('limit', self.SIMILAR_LIMIT))
+        except ValueError:
+            return Response({'detail': "Noto‘g‘ri so‘rov"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.SIMILAR_BOOKS_LIMIT))
+
+        def load_book():
+            # Oxirgi qurilishdan keyin qo‘shilgan kitob — joyida vektorlanadi
+            return Book.objects.select_related('author', 'category').filter(pk=book_id).first()
+
+        try:
+            ranked = similar_books(book_id, limit, load_book)
+        except RuntimeError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        books = Book.objects.select_related('author', 'category').in_bulk([pk for pk, _ in ranked])
+        context = self.get_serializer_context()
+        results = []
+        for pk_, score in ranked:
+            if pk_ in books:
+                data = BookSerializer(books[pk_], context=context).data
+                data['score'] = round(score, 4)
+                results.append(data)
+        return Response({'results': results})
+
 
 # =======================
 # 🔹 REVIEW
@@ -105,14 +427,18 @@ class BookViewSet(viewsets.ModelViewSet):
 class ReviewViewSet(viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrAdmin]
+    replica_reads = True
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['book', 'rating']
     search_fields = ['comment']
-    ordering_fields = ['created_at', 'rating']
+    ordering_fields = ['created_at', 'rating', 'likes_count']
 
     def get_queryset(self):
         user = self.request.user
-        qs = Review.objects.select_related('book', 'user')
+        qs = Review.with_user_reactions(Review.objects.select_related('book', 'user'), user)
+        if self.action in ('like', 'dislike', 'clear'):
+            # Reaksiya boshqa foydalanuvchilarning sharhlariga ham bildiriladi
+            return qs
         if user.is_authenticated and not user.is_staff:
             return qs.filter(user=user)
         return qs
@@ -120,6 +446,32 @@ class ReviewViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def _react(self, reaction):
+        review = self.get_object()
+        review.set_reaction(self.request.user, reaction)
+        return Response({
+            'id': review.id,
+            'likes_count': review.likes_count,
+            'dislikes_count': review.dislikes_count,
+            'is_liked': reaction == 'like',
+            'is_disliked': reaction == 'dislike',
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    def like(self, request, pk=None):
+        """Sharhga layk bosish (dislayk bo‘lsa — olib tashlanadi)"""
+        return self._react('like')
+
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    def dislike(self, request, pk=None):
+        """Sharhga dislayk bosish (layk bo‘lsa — olib tashlanadi)"""
+        return self._react('dislike')
+
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    def clear(self, request, pk=None):
+        """Foydalanuvchi reaksiyasini olib tashlash"""
+        return self._react(None)
+
 
 # =======================
 # 🔹 ORDER
@@ -128,7 +480,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['status', 'is_paid']
+    filterset_class = OrderFilterSet
     ordering_fields = ['created_at', 'total_amount']
 
     def get_queryset(self):
@@ -141,6 +493,110 @@ class OrderViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    SUMMARY_RECENT_DEFAULT = 5
+    SUMMARY_RECENT_MAX = 20
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        Joriy foydalanuvchi buyurtmalari xulosasi: oldindan hisoblangan jamlar
+        va so‘nggi `?last=` ta buyurtma (mahsulotlarsiz). Ikki so‘rov — tarix uzunligiga bog‘liq emas.
+        """
+        try:
+            last = int(request.query_params.get('last', self.SUMMARY_RECENT_DEFAULT))
+        except ValueError:
+            return Response({'last': "Butun son bo‘lishi kerak"}, status=status.HTTP_400_BAD_REQUEST)
+        last = max(0, min(last, self.SUMMARY_RECENT_MAX))
+
+        summary = UserOrderSummary.objects.filter(user=request.user).first() or UserOrderSummary(user=request.user)
+        recent = Order.objects.filter(user=request.user).only(
+            'id', 'status', 'is_paid', 'total_amount', 'created_at'
+        ).order_by('-created_at')[:last] if last else []
+
+        data = UserOrderSummarySerializer(summary).data
+        data['recent_orders'] = OrderBriefSerializer(recent, many=True).data
+        return Response(data)
+
+    @action(detail=False, methods=['get'], url_path=r'archived/(?P<order_id>[0-9a-fA-F-]{32,36})')
+    def archived(self, request, order_id=None):
+        """
+        Arxivlangan (bazadan chiqarilgan) buyurtma — mahsulotlari va to‘lovi bilan,
+        faqat o‘qish uchun. Egasi yoki admin/sotuvchi ko‘ra oladi.
+        """
+        try:
+            record = get_archived_order(uuid.UUID(order_id))
+        except ValueError:
+            return Response({'detail': "Noto‘g‘ri so‘rov"}, status=status.HTTP_400_BAD_REQUEST)
+        except RuntimeError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        user = request.user
+        if record is None or not (user.is_staff or user.is_seller or record['user_id'] == str(user.pk)):
+            return Response({'detail': "Topilmadi"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(record)
+
+
+# =======================
+# 🔹 CART
+# =======================
+class CartViewSet(viewsets.GenericViewSet):
+    """
+    Joriy foydalanuvchi savati: `GET /cart/`, `POST /cart/items/` (qo‘shish),
+    `PUT|DELETE /cart/items/{book}/` (miqdor / olib tashlash), `POST /cart/checkout/`.
+    """
+    serializer_class = CartSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def list(self, request):
+        cart = current_cart(request.user)
+        if cart is None:
+            return Response({'id': None, 'items': [], 'total': '0.00', 'updated_at': None})
+        return Response(CartSerializer(cart).data)
+
+    @action(detail=False, methods=['post'], serializer_class=CartItemSerializer)
+    def items(self, request):
+        """`{book, quantity?}` — kitob miqdori oshiriladi (bitta UPDATE yoki INSERT)"""
+        serializer = CartItemSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        add_item(open_cart(request.user), data['book'].pk, data['quantity'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(
+        detail=False, methods=['put', 'delete'], serializer_class=CartQuantitySerializer,
+        url_path=r'items/(?P<book_id>[0-9a-fA-F-]{32,36})',
+    )
+    def item(self, request, book_id=None):
+        try:
+            book_id = uuid.UUID(book_id)
+        except ValueError:
+            return Response({'detail': "Noto‘g‘ri so‘rov"}, status=status.HTTP_400_BAD_REQUEST)
+        quantity = 0
+        if request.method == 'PUT':
+            serializer = CartQuantitySerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            quantity = serializer.validated_data['quantity']
+            if quantity and not Book.objects.filter(pk=book_id).exists():
+                return Response({'detail': "Kitob topilmadi"}, status=status.HTTP_404_NOT_FOUND)
+        set_quantity(open_cart(request.user), book_id, quantity)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['post'], serializer_class=CartCheckoutSerializer)
+    def checkout(self, request):
+        """
+        Savat → buyurtma (bitta tranzaksiya). Yangi buyurtma — 201; shu savat uchun
+        takroriy so‘rov (`{cart: <id>}` yoki savatsiz, `CART_CHECKOUT_RETRY_SECONDS` ichida) —
+        o‘sha buyurtma, 200.
+        """
+        serializer = CartCheckoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order, created = checkout_cart(request.user, serializer.validated_data.get('cart'))
+        order = Order.objects.select_related('user').prefetch_related(
+            'items__book__author', 'items__book__category'
+        ).get(pk=order.pk)
+        data = OrderSerializer(order, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
 
 # =======================
 # 🔹 ORDER ITEM
@@ -167,7 +623,7 @@ class PaymentViewSet(viewsets.ModelViewSet):
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['status', 'payment_method']
+    filterset_class = PaymentFilterSet
     ordering_fields = ['paid_at']
 
     def get_queryset(self):